@@ -0,0 +1,59 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service: offline benchmarks.
+
+These run against the fake DMCC SOAP responses in ``edrn/rdf/tests/testdata`` so no network is needed.
+Run one with, for example::
+
+    python -m edrn.rdf.benchmarks.tokenizer
+
+``edrn.rdf.benchmarks.suite`` runs the lot of what an update does and compares it with a saved baseline.
+'''
+
+from xml.etree import ElementTree
+import pkg_resources, time
+
+
+# Fixtures that hold DMCC SOAP responses whose results are tokenized rows
+DMCC_FIXTURES = (
+    'Body_System.xml',
+    'Committee_Membership.xml',
+    'Committees.xml',
+    'Disease.xml',
+    'EDRN_Protocol.xml',
+    'Protocol_Protocol_Relationship.xml',
+    'Protocol_Registered_Person_Specifics.xml',
+    'Protocol_Site_Specifics.xml',
+    'Protocol_or_Study.xml',
+    'Publication.xml',
+    'Registered_Person.xml',
+    'Site.xml',
+)
+
+
+def fixturePath(name):
+    '''Give the filesystem path to the test data file ``name``.'''
+    return pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/' + name)
+
+
+def soapResult(name):
+    '''Give the "horrible string" the DMCC would return for the SOAP response fixture ``name``; this is
+    what suds would hand our generators after un-escaping the ``…Result`` element.
+    '''
+    for element in ElementTree.parse(fixturePath(name)).iter():
+        if element.tag.endswith('Result'):
+            return element.text or ''
+    raise ValueError('No SOAP result in %s' % name)
+
+
+def timeit(func, repeat=3):
+    '''Call ``func`` ``repeat`` times and return the best wall time in seconds along with its last result.'''
+    best, result = None, None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
@@ -0,0 +1,69 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark serving pre-compressed variants of our RDF, made from the statements the simple DMCC
+generator makes for people and publications.
+
+For each content coding we report the bytes served, what it costs to compress once when the file's made,
+what compressing on every request would cost instead, and the time to send the bytes over a link of
+``--mbps`` megabits a second (default 20).
+'''
+
+from . import soapResult, timeit
+from .formats import _write
+from .predicateplan import _asserters, _createContentInContainer, _generators
+from edrn.rdf import setuphandlers
+from edrn.rdf.compression import ENCODINGS, _GzipCompressor, _brotliCompressor
+from edrn.rdf.simpledmccrdfgenerator import describeRows
+from edrn.rdf.sink import RDFXMLWriter
+from edrn.rdf.triplebuffer import TripleBuffer
+from rdflib.term import URIRef
+import argparse, logging, sys
+
+
+# What per-request compression would use: settings fast enough for a response to wait on
+_fast = dict(gzip=lambda: _GzipCompressor(6), br=lambda: _brotliCompressor(4))
+
+
+def _compress(data, factory):
+    compressor = factory()
+    return compressor.process(data) + compressor.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pre-compressed RDF variants')
+    parser.add_argument('--mbps', type=float, default=20.0, help='Link speed in megabits per second')
+    options = parser.parse_args()
+    logging.disable(logging.WARNING)  # Invalid URIs and email addresses in the fixtures get logged
+    setuphandlers.createContentInContainer = _createContentInContainer
+    print('%-24s %-9s %10s %8s %13s %14s %11s' % (
+        'Fixture', 'Coding', 'KiB', 'Ratio', 'Once-off ms', 'Per-request ms', 'Transfer ms'
+    ))
+    for name, create in _generators:
+        generator, buffer = create(None), TripleBuffer()
+        items = [item for objID, item in generator.contentItems()]
+        plan = dict((i.title, _asserters[i.portalType](i).compile()) for i in items)
+        describeRows(
+            soapResult(name), plan, generator.identifyingKey, generator.uriPrefix, URIRef(generator.typeURI), buffer
+        )
+        data = _write(buffer, RDFXMLWriter)
+        _report(name, 'identity', len(data), len(data), 0.0, 0.0, options.mbps)
+        for encoding, (extension, factory) in ENCODINGS:
+            seconds, compressed = timeit(lambda: _compress(data, factory), repeat=1)
+            # Doing it per request means doing it at a speed a response can wait for
+            perRequest, ignored = timeit(lambda: _compress(data, _fast[encoding]))
+            _report(name, encoding, len(compressed), len(data), seconds, perRequest, options.mbps)
+    return 0
+
+
+def _report(name, encoding, size, original, onceOff, perRequest, mbps):
+    transfer = size * 8 / (mbps * 1000000.0)
+    print('%-24s %-9s %10.1f %7.1fx %13.1f %14.1f %11.1f' % (
+        name, encoding, size / 1024.0, original / float(size), onceOff * 1000.0, perRequest * 1000.0,
+        transfer * 1000.0
+    ))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark how big each RDF format we serve is and how long a client takes to parse it with rdflib,
+using the statements the simple DMCC generator makes for people and publications.
+'''
+
+from . import soapResult, timeit
+from .predicateplan import _asserters, _createContentInContainer, _generators
+from edrn.rdf import setuphandlers
+from edrn.rdf.formats import ALTERNATIVES, RDF_XML_MIMETYPE
+from edrn.rdf.simpledmccrdfgenerator import describeRows
+from edrn.rdf.sink import RDFXMLWriter
+from edrn.rdf.triplebuffer import TripleBuffer
+from rdflib.term import URIRef
+import io, logging, rdflib, sys
+
+
+_parsers = {
+    RDF_XML_MIMETYPE: 'xml',
+    'application/n-triples': 'nt',
+    'text/turtle': 'turtle',
+    'application/ld+json': 'json-ld',
+}
+
+
+def main():
+    logging.disable(logging.WARNING)  # Invalid URIs and email addresses in the fixtures get logged
+    setuphandlers.createContentInContainer = _createContentInContainer
+    print('%-28s %-24s %10s %10s %10s' % ('Fixture', 'Format', 'KiB', 'Write ms', 'Parse ms'))
+    for name, create in _generators:
+        generator, buffer = create(None), TripleBuffer()
+        items = [item for objID, item in generator.contentItems()]
+        plan = dict((i.title, _asserters[i.portalType](i).compile()) for i in items)
+        describeRows(
+            soapResult(name), plan, generator.identifyingKey, generator.uriPrefix, URIRef(generator.typeURI), buffer
+        )
+        writers = dict((mimeType, writer) for mimeType, (extension, writer) in ALTERNATIVES.items())
+        writers[RDF_XML_MIMETYPE] = RDFXMLWriter
+        for mimeType in sorted(writers):
+            writeTime, data = timeit(lambda: _write(buffer, writers[mimeType]))
+            parseTime, graph = timeit(lambda: rdflib.Graph().parse(data=data, format=_parsers[mimeType]))
+            if len(graph) != len(buffer):
+                print('Statement count mismatch in %s as %s' % (name, mimeType), file=sys.stderr)
+                return 1
+            print('%-28s %-24s %10.1f %10.2f %10.2f' % (
+                name, mimeType, len(data) / 1024.0, writeTime * 1000.0, parseTime * 1000.0
+            ))
+    return 0
+
+
+def _write(buffer, writerClass):
+    stream = io.BytesIO()
+    writer = writerClass(stream)
+    buffer.writeTo(writer)
+    writer.close()
+    return stream.getvalue()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark the simple DMCC generator's compiled predicate plan against calling each handler's asserter
+for every value, as it used to.
+
+The predicate handlers are the ones ``setuphandlers`` makes for the people and publications generators,
+but as plain objects rather than content, so this measures the asserters themselves and not the ZODB.
+'''
+
+from . import soapResult, timeit
+from edrn.rdf import setuphandlers
+from edrn.rdf.emailpredicatehandler import EmailAsserter
+from edrn.rdf.literalpredicatehandler import LiteralAsserter
+from edrn.rdf.multiliteralpredicatehandler import MultiLiteralAsserter
+from edrn.rdf.multipipepredicatehandler import MultiPipeAsserter
+from edrn.rdf.referencepredicatehandler import ReferenceAsserter
+from edrn.rdf.simpledmccrdfgenerator import describeRows
+from edrn.rdf.uripredicatehandler import URIAsserter
+from edrn.rdf.validation import validationStats
+from rdflib.term import URIRef
+import logging, sys
+
+
+_asserters = {
+    'edrn.rdf.emailpredicatehandler': EmailAsserter,
+    'edrn.rdf.literalpredicatehandler': LiteralAsserter,
+    'edrn.rdf.multiliteralpredicatehandler': MultiLiteralAsserter,
+    'edrn.rdf.multipipepredicatehandler': MultiPipeAsserter,
+    'edrn.rdf.referencepredicatehandler': ReferenceAsserter,
+    'edrn.rdf.uripredicatehandler': URIAsserter,
+}
+
+_generators = (
+    ('Registered_Person.xml', setuphandlers.createPersonGenerator),
+    ('Publication.xml', setuphandlers.createPublicationGenerator),
+)
+
+
+class _Item(object):
+    '''Stands in for a generator or predicate handler: just its fields and any items inside it.'''
+    def __init__(self, portalType, **fields):
+        self.portalType, self.items = portalType, []
+        self.__dict__.update(fields)
+    def contentItems(self):
+        return [(str(index), item) for index, item in enumerate(self.items)]
+
+
+def _createContentInContainer(container, portalType, **fields):
+    item = _Item(portalType, **fields)
+    if isinstance(container, _Item):
+        container.items.append(item)
+    return item
+
+
+class _CountingSink(object):
+    count = 0
+    def add(self, triple):
+        self.count += 1
+
+
+def main():
+    logging.disable(logging.WARNING)  # Invalid URIs and email addresses in the fixtures get logged
+    setuphandlers.createContentInContainer = _createContentInContainer
+    print('%-28s %10s %12s %12s %8s' % ('Fixture', 'Triples', 'Per-call ms', 'Compiled ms', 'Speedup'))
+    for name, create in _generators:
+        generator, horribleString = create(None), soapResult(name)
+        items = [item for objID, item in generator.contentItems()]
+        perCall = dict((i.title, _asserters[i.portalType](i).characterize) for i in items)
+        compiled = dict((i.title, _asserters[i.portalType](i).compile()) for i in items)
+        args = (generator.identifyingKey, generator.uriPrefix, URIRef(generator.typeURI))
+        perCallTime, perCallSink = timeit(lambda: _describe(horribleString, perCall, args))
+        compiledTime, compiledSink = timeit(lambda: _describe(horribleString, compiled, args))
+        if perCallSink.count != compiledSink.count:
+            print('Statement count mismatch in %s' % name, file=sys.stderr)
+            return 1
+        print('%-28s %10d %12.2f %12.2f %7.2fx' % (
+            name, compiledSink.count, perCallTime * 1000.0, compiledTime * 1000.0, perCallTime / compiledTime
+        ))
+    for name, stats in sorted(validationStats().items()):
+        print('Validation cache for %s: %d hits, %d misses, %.2f ms spent, about %.2f ms saved' % (
+            name, stats['hits'], stats['misses'], stats['seconds'] * 1000.0, stats['secondsSaved'] * 1000.0
+        ))
+    return 0
+
+
+def _describe(horribleString, plan, args):
+    sink = _CountingSink()
+    describeRows(horribleString, plan, *args, sink)
+    return sink
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark the protocol generator's concurrent fetch and single-pass emission against the sequential
+fetch and double emission it replaced.
+
+The DMCC isn't involved: each SOAP operation comes from its fixture after a simulated round-trip delay,
+which you can change with ``--latency`` (in seconds).
+'''
+
+from . import soapResult, timeit
+from edrn.rdf import dmccprotocolrdfgenerator
+from edrn.rdf.dmccprotocolrdfgenerator import DMCCProtocolGraphGenerator
+from rdflib.term import URIRef
+import argparse, logging, rdflib, sys, time
+
+
+_fixtures = {
+    'Protocol_or_Study': 'Protocol_or_Study.xml',
+    'Protocol_Site_Specifics': 'Protocol_Site_Specifics.xml',
+    'Protocol_Protocol_Relationship': 'Protocol_Protocol_Relationship.xml',
+    'EDRN_Protocol': 'EDRN_Protocol.xml',
+}
+
+
+class _Context(object):
+    '''Stands in for an RDF generator: operations are named after their fixtures and everything else is a URI.'''
+    protocolOrStudyOperation = 'Protocol_or_Study'
+    protoSiteSpecificsOperation = 'Protocol_Site_Specifics'
+    protoProtoRelationshipOperation = 'Protocol_Protocol_Relationship'
+    edrnProtocolOperation = 'EDRN_Protocol'
+    webServiceURL, verificationNum, rawSOAP = 'testscheme://localhost/ws_newcompass.asmx?WSDL', None, False
+    def __getattr__(self, name):
+        if name.endswith('Prefix'):
+            return 'urn:edrn:benchmark:' + name + ':'
+        return 'http://edrn.nci.nih.gov/rdf/benchmark#' + name
+
+
+class _CountingGraph(rdflib.Graph):
+    '''A graph that counts calls to ``add``, whether or not they add anything new.'''
+    adds = 0
+    def add(self, triple):
+        self.adds += 1
+        return super(_CountingGraph, self).add(triple)
+
+
+def legacyFetchAll(generator):
+    '''Fetch the four operations one after another, as the generator used to.'''
+    return [generator.upstream.record(op, dmccprotocolrdfgenerator.callDMCC(None, op, None)) for op in generator.operations]
+
+
+def legacyMakeGraph(generator, horribleStudies, horribleSpecifics, horribleRelationships, horribleProtocols):
+    '''Build the graph as the generator used to, describing protocols that are also studies twice.'''
+    context, graph = generator.context, _CountingGraph()
+    studies = generator.getStudies(horribleStudies)
+    specifics = generator.getSpecifics(horribleSpecifics)
+    relationships = generator.getRelationships(horribleRelationships)
+    protocols = generator.getProtocols(horribleProtocols)
+    for study in studies.values():
+        subjectURI = URIRef(context.uriPrefix + study.identifier)
+        graph.add((subjectURI, rdflib.RDF.type, URIRef(context.typeURI)))
+        study.addToGraph(graph, context)
+        if study.identifier in protocols:
+            protocols[study.identifier].addToGraph(graph, specifics, context)
+    for relation in relationships:
+        relation.addToGraph(graph, context)
+    for protocol in protocols.values():
+        protocol.addToGraph(graph, specifics, context)
+    return graph
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--latency', type=float, default=0.25, help='Simulated SOAP round trip in seconds')
+    options = parser.parse_args(argv)
+    logging.disable(logging.WARNING)  # The generator's chatty about slots
+    payloads = dict((op, soapResult(fixture)) for op, fixture in _fixtures.items())
+
+    def fakeCallDMCC(url, operation, verificationNum, raw=False, client=None):
+        time.sleep(options.latency)
+        return payloads[operation]
+    dmccprotocolrdfgenerator.callDMCC = fakeCallDMCC
+    dmccprotocolrdfgenerator.get_suds_client = lambda url: None
+
+    generator = DMCCProtocolGraphGenerator(_Context())
+    legacyFetchTime, horribleStrings = timeit(lambda: legacyFetchAll(generator), repeat=1)
+    fetchTime, fetched = timeit(generator.fetchAll, repeat=1)
+    if fetched != horribleStrings:
+        print('Concurrent fetch returned different payloads', file=sys.stderr)
+        return 1
+    legacyTime, legacyGraph = timeit(lambda: legacyMakeGraph(generator, *horribleStrings))
+    singleTime, graph = timeit(lambda: generator.makeGraph(*horribleStrings, graph=_CountingGraph()))
+    if set(legacyGraph) != set(graph):
+        print('Single-pass emission made a different graph', file=sys.stderr)
+        return 1
+
+    print('%-24s %12s %12s %8s' % ('', 'Legacy', 'Now', 'Ratio'))
+    print('%-24s %12.2f %12.2f %7.2fx' % (
+        'Fetch ms', legacyFetchTime * 1000.0, fetchTime * 1000.0, legacyFetchTime / fetchTime
+    ))
+    print('%-24s %12.2f %12.2f %7.2fx' % (
+        'Graph ms', legacyTime * 1000.0, singleTime * 1000.0, legacyTime / singleTime
+    ))
+    print('%-24s %12d %12d %7.2fx' % ('graph.add calls', legacyGraph.adds, graph.adds, legacyGraph.adds / graph.adds))
+    print('%-24s %12d %12d' % ('Statements', len(legacyGraph), len(graph)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
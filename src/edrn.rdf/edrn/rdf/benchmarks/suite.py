@@ -0,0 +1,305 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark suite. Where the other benchmarks compare one technique with the one it replaced, this one
+times what an update does today, case by case, so changes can be compared across commits:
+
+• ``wsdl/…``: getting a suds client for the DMCC's WSDL by parsing it, from a pickle on disk as after a
+  restart, and from the process-wide cache
+• ``fetch/…``: calling the biggest DMCC operations with suds and with the lightweight client in
+  ``edrn.rdf.utils``
+• ``split/…`` and ``tokenize/…``: ``splitDMCCRows`` and ``parseTokens`` over each DMCC fixture
+• ``generate/…``: each graph generator, fetching its fixtures through the ``testscheme`` handler that
+  ``edrn.rdf.testing`` installs into suds and urllib (and a fixture-backed Solr for LabCAS)
+• ``serialize/…``: writing each generator's statements in every format we serve
+• ``detect/…``: change detection—an update whose upstream data hasn't changed (its throughput is in
+  bytes fetched), fingerprinting the statements, and, for the smaller generators, the isomorphism test
+  used for files without fingerprints
+
+For each case we report the best of ``--repeat`` wall times, throughput, bytes allocated and still held
+when the case returns, and peak traced memory during it. ``--save`` writes the results to a baseline
+(``baseline.json`` beside this file unless you name another) and every run compares itself to the
+baseline; with ``--strict``, it exits non-zero if any case got slower or bigger by more than
+``--threshold``. Baselines only mean something on the machine that made them, so record one before
+making a change and compare after::
+
+    python -m edrn.rdf.benchmarks.suite --save
+    python -m edrn.rdf.benchmarks.suite --strict
+    python -m edrn.rdf.benchmarks.suite --only tokenize
+'''
+
+from . import DMCC_FIXTURES, fixturePath, soapResult, timeit
+from .formats import _write
+from edrn.rdf import setuphandlers, labcascollectionrdfgenerator
+from edrn.rdf.biomutardfgenerator import BiomutaGraphGenerator
+from edrn.rdf.dmcccommitteerdfgenerator import DMCCCommitteeGraphGenerator
+from edrn.rdf.dmccprotocolrdfgenerator import DMCCProtocolGraphGenerator
+from edrn.rdf.exceptions import UpstreamUnchanged
+from edrn.rdf.fingerprint import FingerprintAccumulator
+from edrn.rdf.formats import ALTERNATIVES, RDF_XML_MIMETYPE
+from edrn.rdf.instrumentation import RunRecord, recording
+from edrn.rdf.interfaces import IAsserter
+from edrn.rdf.labcascollectionrdfgenerator import LabCASCollectionGraphGenerator
+from edrn.rdf.simpledmccrdfgenerator import SimpleDMCCGraphGenerator
+from edrn.rdf.sink import RDFXMLWriter
+from edrn.rdf.testing import TestSchemeHandler, monkeyedU2handlers
+from edrn.rdf.tokenizer import parseTokens
+from edrn.rdf.triplebuffer import TripleBuffer
+from edrn.rdf.utils import get_suds_client, splitDMCCRows, streamDMCC
+from edrn.rdf.wsdlcache import WSDL_CACHE, WSDLCache
+from rdflib.compare import isomorphic
+from suds.transport.http import HttpTransport
+from zope.component import provideAdapter
+from zope.interface import alsoProvides
+from zope.interface.interface import InterfaceClass
+from zope.schema import getFields
+import argparse, atexit, datetime, gc, importlib, json, logging, os.path, platform, rdflib, shutil, sys, tempfile, tracemalloc, urllib
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+_testURL = 'testscheme://localhost/ws_newcompass.asmx?WSDL'
+_isomorphicLimit = 20000  # Statements; the isomorphism test on bigger graphs takes too long to repeat
+_noise = 0.001            # Seconds; slowdowns smaller than this are just timer jitter
+_fetchOperations = ('Registered_Person', 'EDRN_Protocol', 'Publication')
+
+# Predicate handler content type → asserter
+_asserters = {
+    'edrn.rdf.emailpredicatehandler': 'EmailAsserter',
+    'edrn.rdf.literalpredicatehandler': 'LiteralAsserter',
+    'edrn.rdf.multiliteralpredicatehandler': 'MultiLiteralAsserter',
+    'edrn.rdf.multipipepredicatehandler': 'MultiPipeAsserter',
+    'edrn.rdf.referencepredicatehandler': 'ReferenceAsserter',
+    'edrn.rdf.uripredicatehandler': 'URIAsserter',
+}
+
+# Name → function that makes the generator content in ``setuphandlers``, and the graph generator for it
+_generators = (
+    ('body-systems', setuphandlers.createBodySystemsGenerator, SimpleDMCCGraphGenerator),
+    ('diseases', setuphandlers.createDiseaseGenerator, SimpleDMCCGraphGenerator),
+    ('publications', setuphandlers.createPublicationGenerator, SimpleDMCCGraphGenerator),
+    ('registered-person', setuphandlers.createPersonGenerator, SimpleDMCCGraphGenerator),
+    ('sites', setuphandlers.createSiteGenerator, SimpleDMCCGraphGenerator),
+    ('committees', setuphandlers.createCommitteeGenerator, DMCCCommitteeGraphGenerator),
+    ('protocols', setuphandlers.createProtocolGenerator, DMCCProtocolGraphGenerator),
+    ('biomuta', setuphandlers.createBiomutaGenerator, BiomutaGraphGenerator),
+    ('labcas', setuphandlers.createLabCASGenerator, LabCASCollectionGraphGenerator),
+)
+
+
+class _Content(object):
+    '''Stands in for generator and predicate handler content: provides the content type's interfaces,
+    has their fields' defaults, and holds any items made inside it.'''
+    def __init__(self, portalType, **fields):
+        self.items = []
+        module = importlib.import_module(portalType)
+        ifaces = [i for i in vars(module).values() if isinstance(i, InterfaceClass) and i.__module__ == portalType]
+        for iface in ifaces:
+            alsoProvides(self, iface)
+            for name, field in getFields(iface).items():
+                setattr(self, name, field.default)
+        self.__dict__.update(fields)
+        if portalType in _asserters:
+            provideAdapter(getattr(module, _asserters[portalType]), (ifaces[0],), IAsserter)
+    def contentItems(self):
+        return [(str(index), item) for index, item in enumerate(self.items)]
+    def getPhysicalPath(self):
+        return ('', 'benchmark', getattr(self, 'title', ''))
+
+
+def _createContentInContainer(container, portalType, **fields):
+    item = _Content(portalType, **fields)
+    if isinstance(container, _Content):
+        container.items.append(item)
+    return item
+
+
+class _Results(object):
+    def __init__(self, hits, docs):
+        self.hits, self.docs = hits, docs
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class _Solr(object):
+    '''Answers every LabCAS query from the Solr response fixture.'''
+    def __init__(self, url, **kw):
+        with open(fixturePath('labcas-solr.json'), 'rb') as f:
+            self.response = json.load(f)['response']
+    def search(self, q, rows=10):
+        return _Results(self.response['numFound'], self.response['docs'][:rows])
+
+
+def _installFixtures():
+    # Send suds and urllib to the fixtures, just as the test layer does
+    HttpTransport.u2handlers = monkeyedU2handlers
+    WSDL_CACHE.location = None
+    urllib.request.install_opener(urllib.request.build_opener(TestSchemeHandler))
+    labcascollectionrdfgenerator.Solr = _Solr
+    setuphandlers.createContentInContainer = _createContentInContainer
+
+
+class Case(object):
+    '''A benchmark called ``name`` that calls ``func``, which handles ``size`` ``unit``s of work.'''
+    def __init__(self, name, func, size, unit):
+        self.name, self.func, self.size, self.unit = name, func, size, unit
+
+
+def measure(case, repeat):
+    '''Run ``case`` and give its results as a mapping.'''
+    seconds, result = timeit(case.func, repeat)
+    del result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = case.func()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    scale = 1024.0 * 1024.0 if case.unit == 'MB' else 1.0
+    return dict(
+        seconds=seconds, throughput=case.size / scale / seconds if seconds else 0.0, unit=case.unit,
+        allocated=held - before, peak=peak - before
+    )
+
+
+def _generate(content, graphGenerator, previous=None):
+    generator = graphGenerator(content)
+    if previous is not None:
+        generator.upstream.previous = previous
+    buffer = TripleBuffer()
+    try:
+        generator.generateTriples(buffer)
+    except UpstreamUnchanged:
+        pass
+    return generator, buffer
+
+
+def _tokenizeAll(rows):
+    return [pair for row in rows for pair in parseTokens(row)]
+
+
+def _fingerprint(buffer):
+    accumulator = FingerprintAccumulator()
+    for triple in buffer:
+        accumulator.add(triple)
+    return accumulator.fingerprint()
+
+
+def _wsdlCases():
+    size = os.path.getsize(fixturePath('wsdl.xml'))
+    location = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, location, True)
+    WSDLCache(location).client(_testURL)
+    yield Case('wsdl/parse', lambda: WSDLCache(None).client(_testURL), size, 'MB')
+    yield Case('wsdl/disk', lambda: WSDLCache(location).client(_testURL), size, 'MB')
+    yield Case('wsdl/client', lambda: get_suds_client(_testURL), size, 'MB')
+
+
+def _fetchCases():
+    for operation in _fetchOperations:
+        size = len(soapResult(operation + '.xml').encode('utf-8'))
+        yield Case(
+            'fetch/suds/' + operation, lambda o=operation: getattr(get_suds_client(_testURL).service, o)('0'), size, 'MB'
+        )
+        yield Case('fetch/raw/' + operation, lambda o=operation: ''.join(streamDMCC(_testURL, o, '0')), size, 'MB')
+
+
+def cases():
+    '''Make every case, in the order they run.'''
+    for case in _wsdlCases():
+        yield case
+    for case in _fetchCases():
+        yield case
+    for name in DMCC_FIXTURES:
+        horribleString = soapResult(name)
+        size, stem = len(horribleString.encode('utf-8')), name[:-4]
+        rows = splitDMCCRows(horribleString)
+        yield Case('split/' + stem, lambda h=horribleString: splitDMCCRows(h), size, 'MB')
+        yield Case('tokenize/' + stem, lambda r=rows: _tokenizeAll(r), size, 'MB')
+    writers = dict((mimeType, writer) for mimeType, (extension, writer) in ALTERNATIVES.items())
+    writers[RDF_XML_MIMETYPE] = RDFXMLWriter
+    for name, create, graphGenerator in _generators:
+        content = create(None)
+        if hasattr(content, 'webServiceURL'):
+            content.webServiceURL = 'testscheme://localhost/biomuta.tsv' if name == 'biomuta' else _testURL
+        record = RunRecord()
+        with recording(record):
+            generator, buffer = _generate(content, graphGenerator)
+        statements, fetched = len(buffer), record.counts.get('fetchBytes', 0)
+        yield Case('generate/' + name, lambda c=content, g=graphGenerator: _generate(c, g), statements, 'statements')
+        for mimeType in sorted(writers):
+            yield Case(
+                'serialize/%s/%s' % (name, ALTERNATIVES.get(mimeType, ('rdf',))[0]),
+                lambda b=buffer, w=writers[mimeType]: _write(b, w), statements, 'statements'
+            )
+        yield Case(
+            'detect/upstream/' + name, lambda c=content, g=graphGenerator, d=generator.upstream.digests: _generate(c, g, d),
+            fetched, 'MB'
+        )
+        yield Case('detect/fingerprint/' + name, lambda b=buffer: _fingerprint(b), statements, 'statements')
+        if statements <= _isomorphicLimit:
+            data = _write(buffer, RDFXMLWriter)
+            yield Case(
+                'detect/isomorphic/' + name,
+                lambda d=data: isomorphic(rdflib.Graph().parse(data=d, format='xml'), rdflib.Graph().parse(data=d, format='xml')),
+                statements, 'statements'
+            )
+
+
+def compare(results, baseline, threshold):
+    '''Give the names of cases in ``results`` that took longer or peaked higher than in ``baseline`` by
+    more than the fraction ``threshold``, ignoring jitter in the quickest.'''
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None: continue
+        slower = result['seconds'] > before['seconds'] * (1.0 + threshold) and result['seconds'] - before['seconds'] > _noise
+        if slower or result['peak'] > before['peak'] * (1.0 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the offline benchmark suite')
+    parser.add_argument('--repeat', type=int, default=3, help='Times to run each case for its best time')
+    parser.add_argument('--only', help='Run only cases whose names contain this')
+    parser.add_argument('--baseline', default=BASELINE, help='Baseline to compare with or save to')
+    parser.add_argument('--save', action='store_true', help='Save the results as the baseline')
+    parser.add_argument('--strict', action='store_true', help='Exit non-zero if anything regressed')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Slowdown or growth that counts as a regression')
+    options = parser.parse_args(argv)
+    logging.disable(logging.WARNING)  # Invalid URIs and email addresses in the fixtures get logged
+    _installFixtures()
+    baseline = {}
+    if os.path.isfile(options.baseline):
+        with open(options.baseline) as f:
+            baseline = json.load(f)['cases']
+
+    print('%-44s %10s %16s %11s %11s %8s' % ('Case', 'ms', 'Throughput', 'Held KiB', 'Peak KiB', 'vs base'))
+    results = {}
+    for case in cases():
+        if options.only and options.only not in case.name: continue
+        result = results[case.name] = measure(case, options.repeat)
+        before = baseline.get(case.name)
+        print('%-44s %10.2f %10.1f %-5s %11.1f %11.1f %8s' % (
+            case.name, result['seconds'] * 1000.0, result['throughput'], '%s/s' % case.unit if case.unit == 'MB' else 'st/s',
+            result['allocated'] / 1024.0, result['peak'] / 1024.0,
+            '%.2fx' % (result['seconds'] / before['seconds']) if before else ''
+        ))
+    regressions = compare(results, baseline, options.threshold)
+    for name in regressions:
+        print('Regression: %s' % name, file=sys.stderr)
+    if options.save:
+        with open(options.baseline, 'w') as f:
+            json.dump(dict(
+                recorded=datetime.datetime.utcnow().isoformat(), python=platform.python_version(),
+                machine=platform.platform(), cases=dict(baseline, **results)
+            ), f, indent=1, sort_keys=True)
+    return 1 if regressions and options.strict else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
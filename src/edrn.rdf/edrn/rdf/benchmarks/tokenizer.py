@@ -0,0 +1,58 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark the single-pass DMCC tokenizer against the regex-per-key parser it replaced.'''
+
+from . import DMCC_FIXTURES, soapResult, timeit
+from edrn.rdf.tokenizer import parseTokens
+from edrn.rdf.utils import iterDMCCRows
+import re, sys
+
+
+_legacyStartTag = re.compile(r'^<([-_A-Za-z0-9]+)>')
+
+
+def legacyParseTokens(s):
+    '''The parser as it was: a fresh regex for every key and a fresh copy of the rest of the row after each.'''
+    if not isinstance(s, str): raise TypeError('Token parsing works on strings only')
+    s = s.strip()
+    while len(s) > 0:
+        match = _legacyStartTag.match(s)
+        if not match: raise ValueError('Missing start element')
+        key = match.group(1)
+        s = s[match.end():]
+        match = re.match(r'^(.*)</' + key + '>', s, re.DOTALL)
+        if not match: raise ValueError('Unterminated <%s> element' % key)
+        value = match.group(1)
+        s = s[match.end():].lstrip()
+        yield key, value
+
+
+def _tokenizeAll(parser, rows):
+    return [pair for row in rows for pair in parser(row)]
+
+
+def main():
+    print('%-42s %8s %10s %10s %8s' % ('Fixture', 'Tokens', 'Legacy ms', 'Cursor ms', 'Speedup'))
+    totalLegacy = totalCursor = 0.0
+    for name in DMCC_FIXTURES:
+        rows = list(iterDMCCRows(soapResult(name)))
+        legacyTime, legacyTokens = timeit(lambda: _tokenizeAll(legacyParseTokens, rows))
+        cursorTime, cursorTokens = timeit(lambda: _tokenizeAll(parseTokens, rows))
+        if legacyTokens != cursorTokens:
+            print('Token mismatch in %s' % name, file=sys.stderr)
+            return 1
+        totalLegacy += legacyTime
+        totalCursor += cursorTime
+        print('%-42s %8d %10.2f %10.2f %7.2fx' % (
+            name, len(cursorTokens), legacyTime * 1000.0, cursorTime * 1000.0, legacyTime / cursorTime
+        ))
+    print('%-42s %8s %10.2f %10.2f %7.2fx' % (
+        'Total', '', totalLegacy * 1000.0, totalCursor * 1000.0, totalLegacy / totalCursor
+    ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
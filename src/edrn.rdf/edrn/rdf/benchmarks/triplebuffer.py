@@ -0,0 +1,80 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Benchmark collecting DMCC statements in a ``TripleBuffer`` against collecting them in an ``rdflib.Graph``
+and against not collecting them at all, but writing them straight to a streaming ``RDFXMLWriter`` as most
+generators do now.
+
+Statements are made the way the simple DMCC generator makes them: a type for every row and a literal for
+every slot, about a subject named by the row's ``Identifier``.
+'''
+
+from . import soapResult
+from edrn.rdf.sink import RDFXMLWriter
+from edrn.rdf.tokenizer import parseTokens
+from edrn.rdf.triplebuffer import TripleBuffer
+from edrn.rdf.utils import iterDMCCRows
+from rdflib.term import URIRef, Literal
+import io, rdflib, sys, time, tracemalloc
+
+
+_fixtures = ('Registered_Person.xml', 'Publication.xml', 'Site.xml', 'Protocol_Site_Specifics.xml')
+_prefix = 'http://edrn.nci.nih.gov/data/benchmark/'
+
+
+def _fill(container, horribleString):
+    for row in iterDMCCRows(horribleString):
+        subjectURI = None
+        for key, value in parseTokens(row):
+            if key == 'Identifier' and subjectURI is None:
+                subjectURI = URIRef(_prefix + value)
+                container.add((subjectURI, rdflib.RDF.type, URIRef(_prefix + 'type')))
+            elif subjectURI is not None and value:
+                container.add((subjectURI, URIRef(_prefix + 'predicates#' + key), Literal(value)))
+    return container
+
+
+def _measure(factory, horribleString):
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = _fill(factory(), horribleString)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, container
+
+
+class _NullStream(io.RawIOBase):
+    '''Swallows whatever's written, so only the writer's own memory counts.'''
+    def writable(self):
+        return True
+    def write(self, data):
+        return len(data)
+
+
+def _streamingWriter():
+    return RDFXMLWriter(_NullStream())
+
+
+def main():
+    print('%-36s %8s %10s %10s %10s %10s %10s %10s' % (
+        'Fixture', 'Triples', 'Graph ms', 'Buffer ms', 'Stream ms', 'Graph KiB', 'Buffer KiB', 'Stream KiB'
+    ))
+    for name in _fixtures:
+        horribleString = soapResult(name)
+        graphTime, graphPeak, graph = _measure(rdflib.Graph, horribleString)
+        bufferTime, bufferPeak, buffer = _measure(TripleBuffer, horribleString)
+        streamTime, streamPeak, writer = _measure(_streamingWriter, horribleString)
+        writer.close()
+        if set(graph) != set(buffer) or len(graph) != len(writer):
+            print('Statement mismatch in %s' % name, file=sys.stderr)
+            return 1
+        print('%-36s %8d %10.2f %10.2f %10.2f %10d %10d %10d' % (
+            name, len(buffer), graphTime * 1000.0, bufferTime * 1000.0, streamTime * 1000.0, graphPeak // 1024,
+            bufferPeak // 1024, streamPeak // 1024
+        ))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
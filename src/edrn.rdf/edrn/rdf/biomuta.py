@@ -0,0 +1,46 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''BioMuta rows. BioMuta's CSV names a column of every row in its header, and each column's predicate
+comes from a field on the generator. The generators used to look up that field and make a new predicate
+``URIRef`` for every cell of every row. Now ``compileColumns`` turns the header into a vector of
+predicates once, and ``describeRows`` walks the rows as they come—from a response or anything else that
+yields them—handing statements straight to a sink. Cells repeat a lot (most columns are small counts),
+so each distinct value becomes a ``Literal`` just once.
+
+This is shared with ``edrn.summarizer``'s BioMuta generator.
+'''
+
+from rdflib.namespace import RDF
+from rdflib.term import URIRef, Literal
+
+
+def predicatesFor(context, fields):
+    '''Map each column to the predicate URI in the field of ``context`` that ``fields`` names for it.'''
+    return dict((column, getattr(context, name)) for column, name in fields.items())
+
+
+def compileColumns(header, predicates):
+    '''Compile the ``header`` row into a vector with the predicate ``URIRef`` for each column, given
+    ``predicates``, a mapping from column name to predicate URI. Unknown columns raise ``KeyError``.'''
+    return [URIRef(predicates[column]) for column in header]
+
+
+def describeRows(rows, predicates, uriPrefix, typeURI, sink):
+    '''Describe to ``sink`` each of the CSV ``rows``, the first of which is the header, with the gene in
+    the first column naming the subject under ``uriPrefix``. Returns the number of rows described.'''
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None: return 0
+    columns, literals, add, described = compileColumns(header, predicates), {}, sink.add, 0
+    for row in rows:
+        subjectURI = URIRef(uriPrefix + row[0].strip())
+        add((subjectURI, RDF.type, typeURI))
+        for predicateURI, value in zip(columns, row):
+            literal = literals.get(value)
+            if literal is None:
+                literal = literals[value] = Literal(value.strip())
+            add((subjectURI, predicateURI, literal))
+        described += 1
+    return described
@@ -5,14 +5,17 @@
 '''Biomuta RDF Generator. An RDF generator that describes EDRN biomarker mutation statistics using Biomuta webservices.
 '''
 
+from .biomuta import describeRows, predicatesFor
 from .rdfgenerator import IRDFGenerator
+from .sink import TripleGenerator
+from .upstream import UpstreamCheck
 from .utils import validateAccessibleURL
 from Acquisition import aq_inner
 from edrn.rdf import _
-from rdflib.term import URIRef, Literal
+from rdflib.term import URIRef
 from urllib.request import urlopen
 from zope import schema
-import rdflib, csv, codecs
+import codecs, csv
 
 _biomutaPredicates = {
     'GeneName': 'geneNamePredicateURI',
@@ -74,34 +77,18 @@ class IBiomutaRDFGenerator(IRDFGenerator):
     )
 
 
-class BiomutaGraphGenerator(object):
+class BiomutaGraphGenerator(TripleGenerator):
     # @yuliujpl: this doesn't talk to the DMCC's web service, though; so why is this doc-comment here?
     '''A graph generator that produces statements about EDRN's committees using the DMCC's fatuous web service.'''
     def __init__(self, context):
         self.context = context
-    def generateGraph(self):
-        graph = rdflib.Graph()
+        self.upstream = UpstreamCheck(context)
+    def generateTriples(self, sink):
         context = aq_inner(self.context)
-        with urlopen(context.webServiceURL) as f:
-            reader = csv.reader(codecs.iterdecode(f, 'utf-8'))
-            inputPredicates = None
-            for row in reader:
-                if inputPredicates is None:
-                    inputPredicates = row
-                else:
-                    geneName = row[0].strip()
-                    subjectURI = URIRef(context.uriPrefix + geneName)
-                    graph.add((subjectURI, rdflib.RDF.type, URIRef(context.typeURI)))
-                    for idx in range(0, len(inputPredicates)):
-                        key = inputPredicates[idx]
-                        predicateURI = URIRef(getattr(context, _biomutaPredicates[key]))
-                        graph.add((subjectURI, predicateURI, Literal(row[idx].strip())))
-                        # Seriously @yuliujpl? This *hides* errors. Exceptions should be thrown, not printed 🤢
-                        # Also the indentation is incorrect.
-                        # try:
-                        #   graph.add((subjectURI, predicateURI, Literal(row[idx].strip())))
-                        # except Exception as e:
-                        #   print str(e)
-
-        # C'est tout.
-        return graph
+        predicates = predicatesFor(context, _biomutaPredicates)
+        # Rows go from the response to the sink as they arrive, so the upstream check can only happen once
+        # they're all described; if nothing changed, what we wrote is thrown away rather than stored
+        with urlopen(context.webServiceURL) as f, self.upstream.reading(context.webServiceURL, f) as reader:
+            rows = csv.reader(codecs.iterdecode(reader, 'utf-8'))
+            describeRows(rows, predicates, context.uriPrefix, URIRef(context.typeURI), sink)
+        self.upstream.verify()
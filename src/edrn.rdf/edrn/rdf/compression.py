@@ -0,0 +1,81 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Pre-compressed variants. Our RDF and summaries are megabytes of very repetitive text that's read far
+more often than it's written, so the updaters compress each file once, when they make it, and the views
+pick a variant by ``Accept-Encoding``. Nothing gets compressed per request.
+
+Variants live in an annotation on the file's content object: a mapping from MIME type to a mapping from
+content coding to compressed file. Brotli's optional—install the ``brotli`` extra—and gzip's always
+available.
+'''
+
+from plone.namedfile.file import NamedBlobFile
+from zope.annotation.interfaces import IAnnotations
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENCODINGS_KEY = 'edrn.rdf.encodings'
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+CHUNK_SIZE = 1 << 20
+
+
+class _GzipCompressor(object):
+    def __init__(self, level=GZIP_LEVEL):
+        # Raw deflate in a gzip wrapper with no timestamp, so the same input always compresses the same
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    def process(self, data):
+        return self.compressor.compress(data)
+    def finish(self):
+        return self.compressor.flush()
+
+
+def _brotliCompressor(quality=BROTLI_QUALITY):
+    return brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+
+# Content coding → (file extension, compressor factory), most preferred first
+ENCODINGS = [('br', ('br', _brotliCompressor))] if brotli is not None else []
+ENCODINGS.append(('gzip', ('gz', _GzipCompressor)))
+
+
+def compressFile(namedFile, encoding):
+    '''Make a new blob file with the content of ``namedFile`` compressed with the given content coding.'''
+    extension, factory = dict(ENCODINGS)[encoding]
+    compressor = factory()
+    compressed = NamedBlobFile(contentType=namedFile.contentType)
+    if namedFile.filename:
+        compressed.filename = namedFile.filename + '.' + extension
+    with namedFile.open() as source, compressed.open('w') as destination:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            destination.write(compressor.process(chunk))
+        destination.write(compressor.finish())
+    return compressed
+
+
+def compressFiles(files):
+    '''Compress each of ``files``, a mapping from MIME type to file, every way we know, giving a mapping
+    from MIME type to a mapping from content coding to compressed file.
+    '''
+    return dict(
+        (mimeType, dict((encoding, compressFile(namedFile, encoding)) for encoding, info in ENCODINGS))
+        for mimeType, namedFile in files.items()
+    )
+
+
+def getEncodings(content):
+    '''Get the compressed variants kept with ``content``.'''
+    annotations = IAnnotations(content, None)
+    return annotations.get(ENCODINGS_KEY, {}) if annotations is not None else {}
+
+
+def setEncodings(content, encodings):
+    '''Keep ``encodings``, as made by ``compressFiles``, with ``content``.'''
+    IAnnotations(content)[ENCODINGS_KEY] = dict(encodings)
+
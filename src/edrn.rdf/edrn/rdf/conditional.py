@@ -0,0 +1,120 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Conditional and partial HTTP requests. Harvesters poll our RDF and summaries far more often than they
+change, so the views that send them answer ``If-None-Match`` and ``If-Modified-Since`` with 304s,
+honor ``Range`` so an interrupted download of a big file can pick up where it left off, and send a
+pre-compressed variant when ``Accept-Encoding`` allows. These functions just interpret the headers;
+``edrn.rdf.delivery`` does the sending.
+'''
+
+from email.utils import formatdate, parsedate_to_datetime
+import hashlib
+
+
+class HashingStream(object):
+    '''Wraps a binary ``stream``, keeping a SHA-256 digest of everything written to it.'''
+    def __init__(self, stream):
+        self.stream, self.hash = stream, hashlib.sha256()
+    def write(self, data):
+        self.hash.update(data)
+        return self.stream.write(data)
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
+def httpDate(seconds):
+    '''Format ``seconds`` since the epoch as an HTTP date.'''
+    return formatdate(seconds, usegmt=True)
+
+
+def _parseDate(value):
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _matches(header, etag):
+    if header.strip() == '*': return True
+    # Weak comparison, as RFC 7232 says for If-None-Match
+    tags = [tag.strip() for tag in header.split(',')]
+    return etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+
+def isNotModified(ifNoneMatch, ifModifiedSince, etag, lastModified):
+    '''Tell if a client sending the given ``If-None-Match`` and ``If-Modified-Since`` header values
+    already has the representation with ``etag`` last modified at ``lastModified`` (seconds since the
+    epoch). If-None-Match wins when both are given.
+    '''
+    if ifNoneMatch:
+        return _matches(ifNoneMatch, etag)
+    if ifModifiedSince:
+        since = _parseDate(ifModifiedSince)
+        return since is not None and int(lastModified) <= since
+    return False
+
+
+def byteRange(rangeHeader, ifRange, size, etag, lastModified):
+    '''Work out the single byte range a request wants from a representation of ``size`` bytes with
+    ``etag`` last modified at ``lastModified``. Gives None to send the whole thing—no ``Range``, one we
+    don't understand, several ranges, or an ``If-Range`` that no longer holds—and otherwise ``(start,
+    end)`` with ``end`` exclusive. Raises ``ValueError`` if the range can't be satisfied.
+    '''
+    if not rangeHeader: return None
+    if ifRange:
+        ifRange = ifRange.strip()
+        if ifRange.startswith('"') or ifRange.startswith('W/'):
+            if ifRange != etag: return None
+        else:
+            date = _parseDate(ifRange)
+            if date is None or int(lastModified) > date: return None
+    unit, _, spec = rangeHeader.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec: return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash: return None
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start is None:
+        # A suffix range: the last ``end`` bytes
+        if end is None: return None
+        if end == 0 or size == 0:
+            raise ValueError('Range %s not satisfiable for %d bytes' % (rangeHeader, size))
+        return max(size - end, 0), size
+    if end is not None and end < start: return None
+    if start >= size:
+        raise ValueError('Range %s not satisfiable for %d bytes' % (rangeHeader, size))
+    return start, size if end is None else min(end + 1, size)
+
+
+def chooseEncoding(acceptEncoding, available):
+    '''Choose which of the ``available`` content codings, most preferred first, to send given the
+    ``Accept-Encoding`` header value ``acceptEncoding``. Gives None to send the representation as is.
+    '''
+    if not acceptEncoding: return None
+    qualities = {}
+    for item in acceptEncoding.split(','):
+        parts = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for parameter in parts[1:]:
+            if parameter.startswith('q='):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        if parts[0]:
+            qualities[parts[0].lower()] = quality
+    if 'x-gzip' in qualities:
+        qualities.setdefault('gzip', qualities['x-gzip'])
+    best, bestQuality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > bestQuality:  # Ties go to the more preferred coding
+            best, bestQuality = encoding, quality
+    # Identity's always acceptable unless said otherwise; on a tie, we'd rather compress
+    if best is not None and qualities.get('identity', 0.0) > bestQuality: return None
+    return best
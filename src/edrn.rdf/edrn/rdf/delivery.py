@@ -0,0 +1,127 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Blob delivery. The RDF and summary views used to redirect to the approved file, costing every poll two
+requests and a full download. Now they send the blob themselves with a strong ``ETag`` (the SHA-256 of
+its content) and a ``Last-Modified`` (when the file was made), so clients can make conditional and
+partial requests; see ``edrn.rdf.conditional``. When the client accepts one, we send a pre-compressed
+variant made by ``edrn.rdf.compression`` instead, tagged with the original's hash and its content coding.
+
+The content hashes are worked out as the files are written and kept in an annotation on the file's
+content object, keyed by MIME type since an RDF file carries its alternative formats too. Files made
+before then get theirs computed on first request and remembered for the life of the process.
+'''
+
+from .compression import ENCODINGS, getEncodings
+from .conditional import byteRange, chooseEncoding, httpDate, isNotModified
+from .metrics import counter
+from ZPublisher.Iterators import IStreamIterator
+from zope.annotation.interfaces import IAnnotations
+from zope.interface import implementer
+import hashlib, threading
+
+ETAGS_KEY = 'edrn.rdf.etags'
+STREAM_SIZE = 1 << 16
+_computed, _computedLock, _maxComputed = {}, threading.Lock(), 256
+
+_responses = counter('edrn_responses_total', 'Responses sent by the RDF and summary views', ('view', 'status'))
+_servedBytes = counter('edrn_served_bytes_total', 'Bytes of RDF and summaries sent', ('view', 'encoding'))
+
+
+def getContentHashes(content):
+    '''Get the mapping from MIME type to content hash stored on ``content``.'''
+    annotations = IAnnotations(content, None)
+    return annotations.get(ETAGS_KEY, {}) if annotations is not None else {}
+
+
+def setContentHashes(content, hashes):
+    '''Store ``hashes``, a mapping from MIME type to the SHA-256 hex digest of that file, on ``content``.'''
+    IAnnotations(content)[ETAGS_KEY] = dict(hashes)
+
+
+def _computeHash(namedFile):
+    key = (getattr(namedFile, '_p_oid', None), getattr(namedFile, '_p_serial', None))
+    with _computedLock:
+        digest = _computed.get(key)
+    if digest is not None: return digest
+    sha = hashlib.sha256()
+    with namedFile.open() as stream:
+        for chunk in iter(lambda: stream.read(STREAM_SIZE), b''):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    if key[0] is not None:
+        with _computedLock:
+            if len(_computed) >= _maxComputed:
+                _computed.clear()
+            _computed[key] = digest
+    return digest
+
+
+def entityTag(content, namedFile):
+    '''Give the strong entity tag for ``namedFile``, one of the files kept with ``content``.'''
+    digest = getContentHashes(content).get(namedFile.contentType)
+    return '"%s"' % (digest if digest is not None else _computeHash(namedFile))
+
+
+@implementer(IStreamIterator)
+class BlobRangeIterator(object):
+    '''Streams bytes ``start`` up to ``end`` of ``namedFile``'s blob without reading it all into memory.'''
+    def __init__(self, namedFile, start, end, streamsize=STREAM_SIZE):
+        self.stream = namedFile.open()
+        self.stream.seek(start)
+        self.remaining, self.length, self.streamsize = end - start, end - start, streamsize
+    def __iter__(self):
+        return self
+    def __next__(self):
+        data = self.stream.read(min(self.streamsize, self.remaining)) if self.remaining > 0 else b''
+        if not data:
+            self.stream.close()
+            raise StopIteration
+        self.remaining -= len(data)
+        return data
+    next = __next__
+    def __len__(self):
+        return self.length
+
+
+def serveFile(request, content, namedFile, contentType=None, view='rdf'):
+    '''Send ``namedFile``, one of the files kept with the ``content`` object, in answer to ``request``,
+    honoring conditional and range requests and sending a compressed variant if the client accepts one.
+    The response is counted in the metrics for ``view``.
+    '''
+    response = request.response
+    etag, lastModified = entityTag(content, namedFile), content.created().timeTime()
+    contentType, filename = contentType or namedFile.contentType, namedFile.filename
+    variants = getEncodings(content).get(namedFile.contentType, {})
+    encoding = chooseEncoding(request.getHeader('Accept-Encoding'), [e for e, info in ENCODINGS if e in variants])
+    response.setHeader('Vary', ', '.join(filter(None, (response.getHeader('Vary'), 'Accept-Encoding'))))
+    if encoding is not None:
+        namedFile, etag = variants[encoding], etag[:-1] + '-' + encoding + '"'
+        response.setHeader('Content-Encoding', encoding)
+    size = namedFile.getSize()
+    response.setHeader('ETag', etag)
+    response.setHeader('Last-Modified', httpDate(lastModified))
+    response.setHeader('Accept-Ranges', 'bytes')
+    if isNotModified(request.getHeader('If-None-Match'), request.getHeader('If-Modified-Since'), etag, lastModified):
+        response.setStatus(304)
+        _responses.inc(view=view, status='304')
+        return b''
+    response.setHeader('Content-Type', contentType)
+    if filename:
+        response.setHeader('Content-Disposition', 'inline; filename="%s"' % filename)
+    try:
+        span = byteRange(request.getHeader('Range'), request.getHeader('If-Range'), size, etag, lastModified)
+    except ValueError:
+        response.setStatus(416)
+        response.setHeader('Content-Range', 'bytes */%d' % size)
+        _responses.inc(view=view, status='416')
+        return b''
+    start, end = span if span is not None else (0, size)
+    if span is not None:
+        response.setStatus(206)
+        response.setHeader('Content-Range', 'bytes %d-%d/%d' % (start, end - 1, size))
+    response.setHeader('Content-Length', str(end - start))
+    _responses.inc(view=view, status='206' if span is not None else '200')
+    _servedBytes.inc(end - start, view=view, encoding=encoding or 'identity')
+    return BlobRangeIterator(namedFile, start, end)
@@ -0,0 +1,100 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''RDF deltas. Consumers like the portal used to re-ingest a whole RDF file whenever an RDF source's
+approved file changed, even if only a few statements moved. Now each time the ``RDFUpdater`` makes a new
+file, it notes which statements were added and removed since the one before it, and the ``@@rdf-delta``
+view chains those notes together into an RDF Patch that takes a consumer from the file it has to the
+current one.
+
+Statements are compared as N-Triples lines, which we write the same way every time. Graphs with blank
+nodes get no delta, since their node labels change from one generation to the next; neither do files
+whose predecessors we've already pruned. For those, ``composeDeltas`` raises ``DeltaUnavailable``
+and consumers have to reload the whole file.
+'''
+
+from .exceptions import DeltaUnavailable
+from .sink import ntriplesLine
+from rdflib.term import BNode
+from zope.annotation.interfaces import IAnnotations
+import rdflib
+
+DELTA_KEY = 'edrn.rdf.delta'
+PATCH_MIMETYPE = 'application/rdf-patch'
+
+
+def getDelta(content):
+    '''Get the delta stored on the RDF file ``content``: a mapping with the ``previous`` file's ID and
+    files of the ``added`` and ``removed`` N-Triples lines, or None if it has no delta.
+    '''
+    annotations = IAnnotations(content, None)
+    return annotations.get(DELTA_KEY) if annotations is not None else None
+
+
+def setDelta(content, previous, added, removed):
+    '''Store on ``content`` the ID of the ``previous`` file and the ``added`` and ``removed`` files.'''
+    IAnnotations(content)[DELTA_KEY] = dict(previous=previous, added=added, removed=removed)
+
+
+def statementLines(nTriples):
+    '''Give the set of statements, as lines, in the N-Triples bytes ``nTriples``.'''
+    return set(line for line in nTriples.decode('utf-8').splitlines() if line)
+
+
+def rdfXMLStatementLines(rdfXML):
+    '''Give the set of statements, as N-Triples lines, in the RDF/XML bytes ``rdfXML``, or None if any of
+    them have blank nodes.
+    '''
+    lines = set()
+    for triple in rdflib.Graph().parse(data=rdfXML, format='xml'):
+        if any(isinstance(term, BNode) for term in triple): return None
+        lines.add(ntriplesLine(triple))
+    return lines
+
+
+def diffStatements(old, new):
+    '''Give the sorted lines ``added`` and ``removed`` to go from the set of statement lines ``old`` to
+    ``new``.
+    '''
+    return sorted(new - old), sorted(old - new)
+
+
+def composeDeltas(newest, lookup, since):
+    '''Compose deltas into one that goes from the file ``since`` to the file ``newest``. ``lookup`` takes a
+    file ID and gives its previous file's ID and its ``added`` and ``removed`` lines, or None if it has no
+    delta. Statements added then removed, or removed then added, cancel out. Raises ``DeltaUnavailable``
+    if there's no chain of deltas back to ``since``.
+    '''
+    steps, current = [], newest
+    while current != since:
+        delta = lookup(current)
+        if delta is None:
+            raise DeltaUnavailable(since)
+        current, added, removed = delta
+        steps.append((added, removed))
+    added, removed = set(), set()
+    for stepAdded, stepRemoved in reversed(steps):
+        for line in stepRemoved:
+            if line in added:
+                added.remove(line)
+            else:
+                removed.add(line)
+        for line in stepAdded:
+            if line in removed:
+                removed.remove(line)
+            else:
+                added.add(line)
+    return sorted(added), sorted(removed)
+
+
+def writePatch(stream, fileID, since, added, removed):
+    '''Write an RDF Patch to the binary ``stream`` that goes from the file ``since`` to the file
+    ``fileID`` by deleting the ``removed`` lines and adding the ``added`` ones.
+    '''
+    stream.write(('H id <urn:uuid:%s> .\nH prev <urn:uuid:%s> .\nTX .\n' % (fileID, since)).encode('utf-8'))
+    for line in removed:
+        stream.write(('D ' + line + '\n').encode('utf-8'))
+    for line in added:
+        stream.write(('A ' + line + '\n').encode('utf-8'))
+    stream.write(b'TC .\n')
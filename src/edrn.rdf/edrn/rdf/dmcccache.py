@@ -0,0 +1,127 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''DMCC response cache. Lots of our generators talk to the same DMCC web service, and some of them call
+the same operations. During a single update run there's no reason to ask the DMCC for the same thing
+twice, so ``callDMCC`` remembers each result by ``(webServiceURL, operation, verificationNum)`` for as
+long as a ``dmccRun`` is in progress. Once the run's over, the entries go away with it.
+
+Each run has its own cache, kept in a context variable, so runs that overlap—jobs in different
+workers, or a request thread calling ``callDMCC`` on its own—never see each other's results. Pool
+threads don't inherit context variables, so wrap work handed to them with ``inRun``.
+
+Generators may run in several threads at once, so if one thread's already fetching an operation, others
+wanting the same thing wait for it rather than fetching it again themselves.
+'''
+
+from .instrumentation import phase
+from .metrics import histogram
+from .utils import DMCC_OPERATIONS, get_suds_client, streamDMCC
+from concurrent.futures import Future
+import contextlib, contextvars, functools, threading, time
+
+_fetchSeconds = histogram('edrn_dmcc_fetch_seconds', 'Time taken by calls to DMCC operations', ('operation',))
+
+
+class DMCCResponseCache(object):
+    '''Results of DMCC operations, plus counts of cache ``hits`` and ``misses`` and the number of
+    ``bytesSaved`` by not fetching results again.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = self.misses = self.bytesSaved = 0
+    def get(self, key, fetch):
+        '''Get the result for ``key``, calling ``fetch`` to make it if we don't already have it.'''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = Future()
+                self.misses += 1
+                owner = True
+            else:
+                self.hits += 1
+                owner = False
+        if not owner:
+            result, size = entry.result()
+            with self._lock:
+                self.bytesSaved += size
+            return result
+        try:
+            result = fetch()
+        except BaseException as ex:
+            # Don't hang onto failures; whoever asks next can try again
+            with self._lock:
+                del self._entries[key]
+            entry.set_exception(ex)
+            raise
+        entry.set_result((result, len(result.encode('utf-8')) if isinstance(result, str) else len(result or b'')))
+        return result
+    def stats(self):
+        with self._lock:
+            return dict(entries=len(self._entries), hits=self.hits, misses=self.misses, bytesSaved=self.bytesSaved)
+
+
+_current = contextvars.ContextVar('edrn.rdf.dmccRun', default=None)
+
+
+@contextlib.contextmanager
+def dmccRun():
+    '''Cache DMCC results for the duration of the ``with`` block, yielding the ``DMCCResponseCache``.
+    A run started within another one is part of it and shares its cache.
+    '''
+    cache = _current.get()
+    if cache is not None:
+        yield cache
+        return
+    cache = DMCCResponseCache()
+    token = _current.set(cache)
+    try:
+        yield cache
+    finally:
+        _current.reset(token)
+
+
+def inRun(func):
+    '''Wrap ``func`` so that, wherever it's called—in a pool thread, say—it's part of the run that's in
+    progress here, if any.'''
+    cache = _current.get()
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current.set(cache)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return wrapper
+
+
+def streams(operation, raw):
+    '''Tell if ``callDMCC`` with ``raw`` calls ``operation`` without suds.'''
+    return raw and operation in DMCC_OPERATIONS
+
+
+def callDMCC(webServiceURL, operation, verificationNum, raw=False, client=None):
+    '''Call the DMCC web service at ``webServiceURL`` for ``operation`` using ``verificationNum``, reusing
+    the result from earlier in the current run, if any. With ``raw``, operations we know how to call
+    without suds are called with ``streamDMCC`` instead, which spares us suds's model of the response;
+    we still join its chunks into the whole result, since that's what's shared through the run and
+    what the upstream check digests before anything's parsed. Otherwise, the call's made with the suds
+    ``client``, which must be the caller's alone, or with a new one.
+    '''
+    def fetch():
+        start = time.perf_counter()
+        try:
+            if streams(operation, raw):
+                return ''.join(streamDMCC(webServiceURL, operation, verificationNum))
+            # Clients hold per-call state, so each call gets its own; they share the parsed WSDL
+            suds = client if client is not None else get_suds_client(webServiceURL)
+            return getattr(suds.service, operation)(verificationNum)
+        finally:
+            _fetchSeconds.observe(time.perf_counter() - start, operation=operation)
+    cache = _current.get()
+    with phase('fetch'):
+        if cache is None:
+            return fetch()
+        return cache.get((webServiceURL, operation, verificationNum), fetch)
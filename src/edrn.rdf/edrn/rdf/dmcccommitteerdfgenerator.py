@@ -6,9 +6,12 @@
 '''
 
 from .rdfgenerator import IRDFGenerator
-from .utils import get_suds_client
-from .utils import parseTokens, DEFAULT_VERIFICATION_NUM
-from .utils import splitDMCCRows
+from .sink import TripleGenerator
+from .dmcccache import callDMCC
+from .instrumentation import tokenized
+from .upstream import UpstreamCheck
+from .utils import DEFAULT_VERIFICATION_NUM
+from .utils import iterDMCCRows
 from .utils import validateAccessibleURL
 from Acquisition import aq_inner
 from edrn.rdf import _
@@ -61,6 +64,15 @@ class IDMCCCommitteeRDFGenerator(IRDFGenerator):
         description=_('Vapid parameter to pass to the operation. A default will be used if unset.'),
         required=False,
     )
+    rawSOAP = schema.Bool(
+        title=_('Lightweight SOAP Client'),
+        description=_(
+            'Call the DMCC by posting SOAP envelopes directly and streaming the responses, which uses far less'
+            ' memory than the full SOAP library. Operations the lightweight client does not know use the full one.'
+        ),
+        required=False,
+        default=False,
+    )
     typeURI = schema.TextLine(
         title=_('Type URI'),
         description=_('Uniform Resource Identifier naming the type of committee objects described by this generator.'),
@@ -125,43 +137,48 @@ class IDMCCCommitteeRDFGenerator(IRDFGenerator):
     )
 
 
-class DMCCCommitteeGraphGenerator(object):
+class DMCCCommitteeGraphGenerator(TripleGenerator):
     '''A graph generator that produces statements about EDRN's committees using the DMCC's web service.'''
     def __init__(self, context):
         self.context = context
+        self.upstream = UpstreamCheck(context)
 
-    def generateGraph(self):
-        graph = rdflib.Graph()
+    def generateTriples(self, sink):
         context = aq_inner(self.context)
         verificationNum = context.verificationNum if context.verificationNum else DEFAULT_VERIFICATION_NUM
-        client = get_suds_client(context.webServiceURL, context)
-        committees = getattr(client.service, context.committeeOperation)
-        members = getattr(client.service, context.membershipOperation)
+        raw = getattr(context, 'rawSOAP', False)
         unusedSlots = set()
+        horribleCommittees = self.upstream.record(
+            context.committeeOperation,
+            callDMCC(context.webServiceURL, context.committeeOperation, verificationNum, raw)
+        )
+        horribleMembers = self.upstream.record(
+            context.membershipOperation,
+            callDMCC(context.webServiceURL, context.membershipOperation, verificationNum, raw)
+        )
+        self.upstream.verify()
 
         # Get the committees
-        horribleCommittees = committees(verificationNum)
-        for row in splitDMCCRows(horribleCommittees):
+        for row in iterDMCCRows(horribleCommittees):
             subjectURI = None
             statements = {}
-            for key, value in parseTokens(row):
+            for key, value in tokenized(row):
                 if key == 'Identifier' and not subjectURI:
                     subjectURI = URIRef(context.uriPrefix + value)
-                    graph.add((subjectURI, rdflib.RDF.type, URIRef(context.typeURI)))
+                    sink.add((subjectURI, rdflib.RDF.type, URIRef(context.typeURI)))
                 elif key in _committeePredicates and len(value) > 0:
                     predicateURI = URIRef(getattr(context, _committeePredicates[key]))
                     statements[predicateURI] = Literal(value)
                 else:
                     unusedSlots.add(key)
             for predicateURI, obj in statements.items():
-                graph.add((subjectURI, predicateURI, obj))
+                sink.add((subjectURI, predicateURI, obj))
 
         # Get the members of the committees
-        horribleMembers = members(verificationNum)
-        for row in splitDMCCRows(horribleMembers):
+        for row in iterDMCCRows(horribleMembers):
             subjectURI = predicateURI = obj = None
             gotChristos = False
-            for key, value in parseTokens(row):
+            for key, value in tokenized(row):
                 if not value: continue
                 if key == 'committee_identifier':
                     subjectURI = URIRef(context.uriPrefix + value)
@@ -182,18 +199,10 @@ class DMCCCommitteeGraphGenerator(object):
             if subjectURI and predicateURI and obj:
                 if obj == URIRef('http://edrn.nci.nih.gov/data/registered-person/2313'):
                     _logger.warning('🎅 Christos! %s, %s, %s', subjectURI, predicateURI, obj)
-                graph.add((subjectURI, predicateURI, obj))
+                sink.add((subjectURI, predicateURI, obj))
 
         if unusedSlots:
             _logger.warning(
                 'For %s the following slots were unused: %s', '/'.join(context.getPhysicalPath()),
                 ', '.join(unusedSlots)
             )
-
-        try:
-            graph.serialize(destination='/tmp/committees.rdf', format='pretty-xml')
-        except:
-            pass
-
-        # C'est tout.
-        return graph
@@ -7,9 +7,13 @@
 
 from edrn.rdf import _
 
+from .dmcccache import callDMCC, inRun, streams
+from .instrumentation import phase, tokenized
 from .rdfgenerator import IRDFGenerator
-from .utils import get_suds_client
-from .utils import parseTokens, validateAccessibleURL, DEFAULT_VERIFICATION_NUM, splitDMCCRows
+from .sink import TripleGenerator
+from .upstream import UpstreamCheck
+from .utils import validateAccessibleURL, DEFAULT_VERIFICATION_NUM, get_suds_client, iterDMCCRows
+from concurrent.futures import ThreadPoolExecutor
 from rdflib.term import URIRef, Literal
 from zope import schema
 import rdflib, logging
@@ -91,6 +95,15 @@ class IDMCCProtocolRDFGenerator(IRDFGenerator):
         description=_('Feeble and jejune parameter to pass to the operation. A default will be used if unset.'),
         required=False,
     )
+    rawSOAP = schema.Bool(
+        title=_('Lightweight SOAP Client'),
+        description=_(
+            'Call the DMCC by posting SOAP envelopes directly and streaming the responses, which uses far less'
+            ' memory than the full SOAP library. Operations the lightweight client does not know use the full one.'
+        ),
+        required=False,
+        default=False,
+    )
     typeURI = schema.TextLine(
         title=_('Type URI'),
         description=_('Uniform Resource Identifier naming the type of protocol objects described by this generator.'),
@@ -534,7 +547,7 @@ _specificsMap = {
 class Specifics(_Identified):
     def __init__(self, row):
         self.identifier, self.attributes = None, {}
-        for key, value in parseTokens(row):
+        for key, value in tokenized(row):
             if key == 'Identifier':
                 self.identifier = value
             else:
@@ -556,7 +569,7 @@ _relationshipsMap = {
 class Relationship(_Identified):
     def __init__(self, row):
         self.identifier = None
-        for key, value in parseTokens(row):
+        for key, value in tokenized(row):
             if key == 'Identifier':
                 self.identifier = value
             elif key == 'Protocol_1_Identifier':
@@ -572,28 +585,43 @@ class Relationship(_Identified):
         graph.add((subjectURI, predicateURI, objURI))
 
 
-class DMCCProtocolGraphGenerator(object):
+class DMCCProtocolGraphGenerator(TripleGenerator):
     '''A graph generator that produces statements about EDRN's protocols using the DMCC's web service.'''
     def __init__(self, context):
         self.context = context
+        self.upstream = UpstreamCheck(context)
     @property
     def verificationNum(self):
         return self.context.verificationNum if self.context.verificationNum else DEFAULT_VERIFICATION_NUM
     @property
-    def client(self):
-        return get_suds_client(self.context.webServiceURL, self.context)
-    def getSlottedItems(self, operation, kind):
-        function = getattr(self.client.service, operation)
-        # try:
-        #     horribleString = function(self.verificationNum)
-        # except:
-        #     breakpoint()
-        horribleString = function(self.verificationNum)
+    def operations(self):
+        return (
+            self.context.protocolOrStudyOperation,
+            self.context.protoSiteSpecificsOperation,
+            self.context.protoProtoRelationshipOperation,
+            self.context.edrnProtocolOperation
+        )
+    def fetchAll(self):
+        '''Fetch the studies, site specifics, relationships, and protocols from the DMCC all at once, since
+        they're independent of each other. Returns their horrible strings in that order.
+        '''
+        # Only read the context here, and make each worker its own suds client: worker threads mustn't
+        # touch persistent objects, nor share a client
+        url, verificationNum, operations = self.context.webServiceURL, self.verificationNum, self.operations
+        raw = getattr(self.context, 'rawSOAP', False)
+        clients = [None if streams(operation, raw) else get_suds_client(url) for operation in operations]
+        def fetch(operation, client):
+            return callDMCC(url, operation, verificationNum, raw, client)
+        # The workers have no record of their own, so the whole parallel fetch counts as fetching here
+        with phase('fetch'), ThreadPoolExecutor(max_workers=len(operations)) as executor:
+            payloads = list(executor.map(inRun(fetch), operations, clients))
+        return [self.upstream.record(operation, payload) for operation, payload in zip(operations, payloads)]
+    def getSlottedItems(self, horribleString, kind):
         objects = {}
         obj = None
-        for row in splitDMCCRows(horribleString):
+        for row in iterDMCCRows(horribleString):
             lastSlot = None
-            for key, value in parseTokens(row):
+            for key, value in tokenized(row):
                 if key == 'Identifier':
                     if obj is None or obj.identifier != value:
                         obj = kind(value)
@@ -607,40 +635,40 @@ class DMCCProtocolGraphGenerator(object):
                     obj.slots[lastSlot] = value
                     lastSlot = None
         return objects
-    def getStudies(self):
-        return self.getSlottedItems(self.context.protocolOrStudyOperation, Study)
-    def getProtocols(self):
-        return self.getSlottedItems(self.context.edrnProtocolOperation, Protocol)
-    def getSpecifics(self):
-        function = getattr(self.client.service, self.context.protoSiteSpecificsOperation)
-        horribleString = function(self.verificationNum)
+    def getStudies(self, horribleString):
+        return self.getSlottedItems(horribleString, Study)
+    def getProtocols(self, horribleString):
+        return self.getSlottedItems(horribleString, Protocol)
+    def getSpecifics(self, horribleString):
         specifics = {}
-        for row in splitDMCCRows(horribleString):
+        for row in iterDMCCRows(horribleString):
             specific = Specifics(row)
             specifics[(specific.protocolID, specific.siteID)] = specific
         return specifics
-    def getRelationships(self):
-        function = getattr(self.client.service, self.context.protoProtoRelationshipOperation)
-        horribleString = function(self.verificationNum)
+    def getRelationships(self, horribleString):
         relationships = []
-        for row in splitDMCCRows(horribleString):
+        for row in iterDMCCRows(horribleString):
             relationships.append(Relationship(row))
         return relationships
-    def generateGraph(self):
-        graph = rdflib.Graph()
-        studies = self.getStudies()
-        specifics = self.getSpecifics()
-        relationships = self.getRelationships()
-        protocols = self.getProtocols()
+    def generateTriples(self, sink):
+        # Fetch everything first so we can skip all the parsing if none of it changed
+        horribleStudies, horribleSpecifics, horribleRelationships, horribleProtocols = self.fetchAll()
+        self.upstream.verify()
+        self.makeGraph(horribleStudies, horribleSpecifics, horribleRelationships, horribleProtocols, sink)
+    def makeGraph(self, horribleStudies, horribleSpecifics, horribleRelationships, horribleProtocols, graph=None):
+        '''Parse the horrible strings and describe it all in ``graph``, or a new graph if not given.'''
+        graph = rdflib.Graph() if graph is None else graph
+        studies = self.getStudies(horribleStudies)
+        specifics = self.getSpecifics(horribleSpecifics)
+        relationships = self.getRelationships(horribleRelationships)
+        protocols = self.getProtocols(horribleProtocols)
         for study in studies.values():
             subjectURI = URIRef(self.context.uriPrefix + study.identifier)
             graph.add((subjectURI, rdflib.RDF.type, URIRef(self.context.typeURI)))
             study.addToGraph(graph, self.context)
-            if study.identifier in protocols:
-                protocol = protocols[study.identifier]
-                protocol.addToGraph(graph, specifics, self.context)
         for relation in relationships:
             relation.addToGraph(graph, self.context)
+        # Every protocol, whether it's also a study or not, gets described just once, here
         for protocol in protocols.values():
             protocol.addToGraph(graph, specifics, self.context)
         # C'est tout.
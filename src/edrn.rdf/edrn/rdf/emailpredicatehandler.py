@@ -3,9 +3,9 @@
 # RESERVED. U.S. Government Sponsorship acknowledged.
 
 from .predicatehandler import ISimplePredicateHandler
+from .validation import emailAddresses
 from Acquisition import aq_inner
-from email_validator import validate_email, EmailNotValidError
-import rdflib, logging
+import functools, rdflib, logging
 
 _logger = logging.getLogger(__name__)
 
@@ -14,23 +14,32 @@ class IEmailPredicateHandler(ISimplePredicateHandler):
     '''A handler for DMCC web services that maps tokenized keys to mailto: URLs.'''
 
 
+def characterizeEmail(predicateURI, obj):
+    '''Characterize ``obj`` with ``predicateURI`` and a mailto: URL for each comma-separated email address.'''
+    characterizations = []
+    for i in obj.split(', '):
+        i = i.strip()
+        if not i: continue
+        address, error, first = emailAddresses.check(i)
+        if address is None:
+            if first:
+                _logger.warning('Encountered an invalid email address «%s» which will not be put into RDF: %s', i, error)
+            continue
+        target = 'mailto:' + address
+        characterizations.append((predicateURI, rdflib.URIRef(target)))
+    return characterizations
+
+
 class EmailAsserter(object):
     '''Describes subjects using predicates with email references.'''
 
     def __init__(self, context):
         self.context = context
 
+    def compile(self):
+        context = aq_inner(self.context)
+        return functools.partial(characterizeEmail, rdflib.URIRef(context.predicateURI))
+
     def characterize(self, obj):
         context = aq_inner(self.context)
-        characterizations = []
-        for i in obj.split(', '):
-            i = i.strip()
-            if not i: continue
-            try:
-                validation = validate_email(i)
-            except EmailNotValidError as ex:
-                _logger.warning('Encountered an invalid email address «%s» which will not be put into RDF: %s', i, ex)
-                continue
-            target = 'mailto:' + validation.email
-            characterizations.append((rdflib.URIRef(context.predicateURI), rdflib.URIRef(target)))
-        return characterizations
+        return characterizeEmail(rdflib.URIRef(context.predicateURI), obj)
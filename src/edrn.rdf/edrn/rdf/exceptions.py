@@ -33,3 +33,23 @@ class SourceNotActive(RDFUpdateError):
     '''Error that tells that we cannot update a source that is not marked as active'''
     def __init__(self, rdfSource):
         super(SourceNotActive, self).__init__(rdfSource, 'Source is not active')
+
+
+class UpstreamUnchanged(Exception):
+    '''A quasi-exceptional condition raised by an RDF generator when none of its upstream data has changed.'''
+    def __init__(self, generator):
+        super(UpstreamUnchanged, self).__init__(
+            'No change to upstream data (RDF Generator at "%s")' % '/'.join(generator.getPhysicalPath())
+        )
+
+
+class DeltaUnavailable(Exception):
+    '''Raised when there's no chain of RDF deltas from a requested file to the current one.'''
+    def __init__(self, since):
+        super(DeltaUnavailable, self).__init__('No RDF delta available since "%s"' % since)
+
+
+class DMCCFault(Exception):
+    '''Raised when the DMCC answers a call to one of its operations with a SOAP fault.'''
+    def __init__(self, operation, message):
+        super(DMCCFault, self).__init__('DMCC operation %s failed: %s' % (operation, message))
@@ -0,0 +1,77 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Graph fingerprints. Rather than re-parse the approved RDF file and run ``isomorphic`` on every update,
+we remember a fingerprint of the statements in each file we make and compare that instead.
+
+The fingerprint is the sum (modulo 2²⁵⁶) of the SHA-256 digests of each statement, so it doesn't care
+what order the statements come in. It's only meaningful for graphs without blank nodes, since those
+can be labeled differently each time; for such graphs ``graphFingerprint`` gives ``None`` and callers
+should fall back to ``isomorphic``.
+'''
+
+from rdflib.term import BNode
+from zope.annotation.interfaces import IAnnotations
+import hashlib
+
+FINGERPRINT_KEY = 'edrn.rdf.fingerprint'
+_modulus = 2 ** 256
+
+
+def _digest(triple):
+    return hashlib.sha256(' '.join([term.n3() for term in triple]).encode('utf-8')).digest()
+
+
+def graphFingerprint(graph):
+    '''Compute an order-independent fingerprint of the statements in ``graph``, or None if it has any
+    blank nodes.
+    '''
+    total = 0
+    for triple in graph:
+        for term in triple:
+            if isinstance(term, BNode): return None
+        total = (total + int.from_bytes(_digest(triple), 'big')) % _modulus
+    return '%064x' % total
+
+
+class FingerprintAccumulator(object):
+    '''Work out the same fingerprint as ``graphFingerprint``, one statement at a time, for statements that
+    never make it into a graph. Generators may say the same thing more than once, and not always while
+    describing the same subject—the protocol generator comes back to protocols that are also studies, and
+    the committee generator adds members after every committee's been described—so this keeps the digests
+    of what's been said about each subject for the whole run and ignores any repeat. That's a digest per
+    distinct statement, but far less than a graph would hold, and it makes the fingerprint the graph's no
+    matter what order the statements come in.
+    '''
+    def __init__(self):
+        self._seen, self._total, self._count, self._blank = {}, 0, 0, False
+    def add(self, triple):
+        '''Account for ``triple``, returning False if it's been said before.'''
+        digest = _digest(triple)
+        said = self._seen.setdefault(triple[0], set())
+        if digest in said: return False
+        said.add(digest)
+        self._count += 1
+        if not self._blank:
+            if any(isinstance(term, BNode) for term in triple):
+                self._blank = True
+            else:
+                self._total = (self._total + int.from_bytes(digest, 'big')) % _modulus
+        return True
+    def __len__(self):
+        return self._count
+    def fingerprint(self):
+        '''Give the fingerprint so far, or None if there were any blank nodes.'''
+        return None if self._blank else '%064x' % self._total
+
+
+def getFingerprint(obj):
+    '''Get the fingerprint we stored on ``obj``, or None if there isn't one.'''
+    annotations = IAnnotations(obj, None)
+    return annotations.get(FINGERPRINT_KEY) if annotations is not None else None
+
+
+def setFingerprint(obj, fingerprint):
+    '''Store ``fingerprint`` on ``obj``.'''
+    IAnnotations(obj)[FINGERPRINT_KEY] = fingerprint
@@ -0,0 +1,89 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''RDF formats. Every RDF file we make is RDF/XML, but alongside it we keep the same statements as
+N-Triples, Turtle, and JSON-LD, all written in the same pass. They live in an annotation on the RDF/XML
+file, so they come and go with it. The ``@@rdf`` view picks one with ``chooseFormat``.
+'''
+
+from .sink import NTriplesWriter, TurtleWriter, JSONLDWriter
+from zope.annotation.interfaces import IAnnotations
+
+RDF_XML_MIMETYPE = 'application/rdf+xml'
+NTRIPLES_MIMETYPE = 'application/n-triples'
+FORMATS_KEY = 'edrn.rdf.formats'
+
+# MIME type → (file extension, writer) for each alternative to RDF/XML
+ALTERNATIVES = {
+    NTRIPLES_MIMETYPE: ('nt', NTriplesWriter),
+    'text/turtle': ('ttl', TurtleWriter),
+    'application/ld+json': ('jsonld', JSONLDWriter),
+}
+
+# Names clients may use with ``?format=``
+FORMAT_NAMES = {
+    'xml': RDF_XML_MIMETYPE,
+    'rdf': RDF_XML_MIMETYPE,
+    'rdfxml': RDF_XML_MIMETYPE,
+    'nt': NTRIPLES_MIMETYPE,
+    'ntriples': NTRIPLES_MIMETYPE,
+    'ttl': 'text/turtle',
+    'turtle': 'text/turtle',
+    'json': 'application/ld+json',
+    'jsonld': 'application/ld+json',
+    'json-ld': 'application/ld+json',
+}
+
+
+def getAlternatives(rdfFile):
+    '''Get the mapping from MIME type to alternative serialization kept with ``rdfFile``.'''
+    annotations = IAnnotations(rdfFile, None)
+    return annotations.get(FORMATS_KEY, {}) if annotations is not None else {}
+
+
+def setAlternatives(rdfFile, alternatives):
+    '''Keep ``alternatives``, a mapping from MIME type to file, with ``rdfFile``.'''
+    IAnnotations(rdfFile)[FORMATS_KEY] = dict(alternatives)
+
+
+def _parseAccept(accept):
+    '''Give the media ranges in the ``Accept`` header value ``accept``, most preferred first: by quality,
+    then concrete types before ``type/*`` before ``*/*``, then in the order given.
+    '''
+    ranges = []
+    for position, item in enumerate(accept.split(',')):
+        parts = [part.strip() for part in item.split(';')]
+        if not parts[0]: continue
+        quality = 1.0
+        for parameter in parts[1:]:
+            if parameter.startswith('q='):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0.0:
+            mediaRange = parts[0].lower()
+            specificity = 2 if mediaRange == '*/*' else 1 if mediaRange.endswith('/*') else 0
+            ranges.append((-quality, specificity, position, mediaRange))
+    return [mediaRange for quality, specificity, position, mediaRange in sorted(ranges)]
+
+
+def chooseFormat(formatName, accept, available):
+    '''Choose the MIME type to send from those ``available``, by the ``?format=`` name ``formatName`` if
+    given, otherwise by the ``accept`` header. RDF/XML is always available, and it's what we send when
+    nothing else fits. Raises ``ValueError`` for a ``formatName`` we don't know.
+    '''
+    available = [RDF_XML_MIMETYPE] + [mimeType for mimeType in available if mimeType != RDF_XML_MIMETYPE]
+    if formatName:
+        mimeType = FORMAT_NAMES.get(formatName.lower())
+        if mimeType is None:
+            raise ValueError('Unknown RDF format "%s"' % formatName)
+        return mimeType if mimeType in available else RDF_XML_MIMETYPE
+    for mediaRange in _parseAccept(accept or ''):
+        if mediaRange == '*/*':
+            return RDF_XML_MIMETYPE
+        for mimeType in available:  # RDF/XML's first, so it's what ``application/*`` gets
+            if mediaRange == mimeType or (mediaRange.endswith('/*') and mimeType.startswith(mediaRange[:-1])):
+                return mimeType
+    return RDF_XML_MIMETYPE
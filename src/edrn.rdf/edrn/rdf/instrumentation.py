@@ -0,0 +1,187 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Update instrumentation. To tell whether a slow update is down to the DMCC, tokenizing, building
+statements, serializing them, comparing with the last file, or storing the new one, each source update
+keeps a ``RunRecord``: seconds per phase and counts (statements, bytes fetched and stored). Memory isn't
+kept per update: the only peak there is belongs to the whole process, which runs updates side by side
+and never lets its peak fall, so ``processPeakMemory`` gives it for a whole job instead.
+
+Phases nest—fetching and tokenizing happen while building, serializing as statements arrive—so a record
+keeps a stack of them and charges time to whichever is innermost. Code deep in an update finds the
+record with ``currentRecord``; it's per thread, and None when nobody's recording, so the hooks cost
+next to nothing then.
+
+The last ``MAX_RECORDS`` records of updates that failed or made new RDF are kept in an annotation on each
+source. Records of updates that found nothing to do are kept only in memory, by this process, so that
+an update that changes nothing writes nothing to the database either.
+'''
+
+from .metrics import counter, histogram
+from .tokenizer import parseTokens
+from zope.annotation.interfaces import IAnnotations
+import collections, contextlib, resource, threading, time
+
+RECORDS_KEY = 'edrn.rdf.runs'
+MAX_RECORDS = 20
+PHASES = ('fetch', 'tokenize', 'build', 'serialize', 'compare', 'store', 'prune')
+
+_local = threading.local()
+_unchanged, _unchangedLock = {}, threading.Lock()  # Records of unchanged updates by source path
+
+_updateSeconds = histogram('edrn_source_update_seconds', 'Time taken to update a source', ('source', 'outcome'))
+_phaseSeconds = counter(
+    'edrn_source_update_phase_seconds_total', 'Time spent updating a source, by phase', ('source', 'phase')
+)
+
+
+class RunRecord(object):
+    '''Timings and counts for one update of a source.'''
+    def __init__(self):
+        self.started, self.seconds, self.counts = time.time(), dict.fromkeys(PHASES, 0.0), {}
+        self.outcome = self.message = None
+        self.elapsed = None
+        self._stack, self._mark, self._startClock = [], None, time.perf_counter()
+    def enter(self, phase):
+        '''Start charging time to ``phase`` until the matching ``exit``.'''
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.seconds[outer] = self.seconds.get(outer, 0.0) + now - self._mark
+        self._stack.append(phase)
+        self._mark = now
+    def exit(self):
+        '''Stop charging time to the innermost phase and go back to the one outside it.'''
+        now = time.perf_counter()
+        phase = self._stack.pop()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - self._mark
+        self._mark = now
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+    def count(self, name, amount=1):
+        '''Add ``amount`` to the count called ``name``.'''
+        self.counts[name] = self.counts.get(name, 0) + amount
+    def finish(self, outcome, message=None):
+        '''Note the update's done, with the given ``outcome`` and an optional ``message``.'''
+        self.outcome, self.message = outcome, message
+        self.elapsed = time.perf_counter() - self._startClock
+    def asDict(self):
+        return dict(
+            started=self.started, elapsed=self.elapsed, seconds=dict(self.seconds), counts=dict(self.counts),
+            outcome=self.outcome, message=self.message
+        )
+
+
+def processPeakMemory():
+    '''Give this process's peak resident set size so far, in bytes.'''
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def currentRecord():
+    '''Give the record for the update running on this thread, or None if there isn't one.'''
+    return getattr(_local, 'record', None)
+
+
+@contextlib.contextmanager
+def recording(record):
+    '''Make ``record`` the current record on this thread for the duration.'''
+    previous, _local.record = currentRecord(), record
+    try:
+        yield record
+    finally:
+        _local.record = previous
+
+
+@contextlib.contextmanager
+def recordRun(source, unchanged=(), record=None):
+    '''Record an update of ``source`` on this thread, in a new ``RunRecord`` unless given ``record``, and
+    save it on the source afterwards. Exceptions in ``unchanged`` mean there was nothing to update; any
+    others mean the update failed.'''
+    record = RunRecord() if record is None else record
+    try:
+        with recording(record):
+            yield record
+    except unchanged as ex:
+        _finish(source, record, 'unchanged', str(ex))
+        raise
+    except Exception as ex:
+        _finish(source, record, 'failed', str(ex))
+        raise
+    _finish(source, record, 'updated')
+
+
+def _path(source):
+    return '/'.join(source.getPhysicalPath()) if hasattr(source, 'getPhysicalPath') else str(source)
+
+
+def _finish(source, record, outcome, message=None):
+    record.finish(outcome, message)
+    saveRunRecord(source, record)
+    path = _path(source)
+    _updateSeconds.observe(record.elapsed, source=path, outcome=outcome)
+    for name, seconds in record.seconds.items():
+        if seconds: _phaseSeconds.inc(seconds, source=path, phase=name)
+
+
+@contextlib.contextmanager
+def phase(name):
+    '''Charge the time spent in the block to phase ``name`` of the current record, if any.'''
+    record = currentRecord()
+    if record is None:
+        yield
+        return
+    record.enter(name)
+    try:
+        yield
+    finally:
+        record.exit()
+
+
+def tokenized(row):
+    '''Give the ``(key, value)`` pairs of the DMCC ``row``. During a recorded update, the whole row's parsed
+    at once so that its time, read off the clock just twice, counts as tokenizing; otherwise they come
+    lazily from ``parseTokens``.
+    '''
+    record = currentRecord()
+    if record is None: return parseTokens(row)
+    with record.phase('tokenize'):
+        return list(parseTokens(row))
+
+
+def count(name, amount=1):
+    '''Add ``amount`` to the count called ``name`` in the current record, if any.'''
+    record = currentRecord()
+    if record is not None:
+        record.count(name, amount)
+
+
+def _savedRecords(source):
+    annotations = IAnnotations(source, None)
+    return annotations.get(RECORDS_KEY, []) if annotations is not None else []
+
+
+def getRunRecords(source):
+    '''Get the most recent run records, as mappings, of ``source``, oldest first: those kept on it and
+    those of unchanged updates this process remembers.'''
+    with _unchangedLock:
+        unchanged = list(_unchanged.get(_path(source), ()))
+    saved = _savedRecords(source)
+    if not unchanged: return saved
+    return sorted(list(saved) + unchanged, key=lambda i: i['started'])[-MAX_RECORDS:]
+
+
+def saveRunRecord(source, record):
+    '''Keep ``record`` with the most recent of ``source``: in memory if the update found nothing to do,
+    otherwise on the source.'''
+    if record.outcome == 'unchanged':
+        with _unchangedLock:
+            _unchanged.setdefault(_path(source), collections.deque(maxlen=MAX_RECORDS)).append(record.asDict())
+        return
+    IAnnotations(source)[RECORDS_KEY] = (list(_savedRecords(source)) + [record.asDict()])[-MAX_RECORDS:]
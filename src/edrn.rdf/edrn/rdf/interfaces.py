@@ -9,17 +9,43 @@ from zope.interface import Interface
 
 class IRDFUpdater(Interface):
     '''An object whose RDF may be updated'''
-    def updateRDF():
-        '''Update this object's RDF file.'''
+    def updateRDF(force=False):
+        '''Update this object's RDF file. If ``force`` is true, build the graph even if the upstream data
+        looks unchanged.'''
+    def getGenerator():
+        '''Check this object can be updated and return its RDF generator.'''
+    def previousUpstream(generator, force=False):
+        '''Give the upstream digests and snapshot that ``generator`` last made this object's current RDF file
+        from, or an empty mapping and None if it has no current file. If ``force`` is true, there's no
+        snapshot.'''
+    def storeRDF(output, generatorPath, upstreamDigests=None, upstreamSnapshot=None):
+        '''Make the RDF ``output`` (an ``RDFOutput``) this object's RDF file unless nothing changed, noting it
+        came from the generator at ``generatorPath``, and remember the ``upstreamDigests`` of the data it
+        was made from, along with any ``upstreamSnapshot`` the generator left of it.'''
+
+class IJobRunner(Interface):
+    '''Runs background update jobs of one kind; it's registered as a utility named for that kind.'''
+    def sources(site):
+        '''Give catalog results for all the sources in ``site`` that jobs of this kind update.'''
+    def run(site, results, force, progress):
+        '''Update the sources in catalog ``results``, telling ``progress`` (a ``JobProgress``) how each one
+        went. If ``force`` is true, regenerate even if upstream data looks unchanged. Returns a mapping of
+        statistics about the run, or None.'''
 
 class IGraphGenerator(Interface):
     '''An object that creates statement graphs.'''
     def generateGraph():
         '''Generate this object's RDF graph.'''
+    def generateTriples(sink):
+        '''Generate this object's RDF statements, calling ``sink.add`` with each one. Optional; without it,
+        callers fall back to ``generateGraph``.'''
 
 class IAsserter(Interface):
     '''An object that describes subjects with a known predicate and a given object'''
     def characterize(obj):
         '''Characterize some subject using a known predicate for complementary ``obj``.  Returns a sequence of doubles
         containing a predicate URI (a URIRef) and an appropriate Literal or URIRef object.'''
+    def compile():
+        '''Return a plain function that works like ``characterize`` but has everything it needs from the
+        handler built in, so calling it touches neither the ZODB nor Acquisition.'''
 
@@ -0,0 +1,330 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Background update jobs. Regenerating every source can take many minutes—too long to tie up a Zope
+thread and outlast proxy timeouts—so ``@@updateRDF`` and ``@@updateSummary`` just queue a ``Job`` and
+return its ID. Worker threads, started when Zope opens its database, claim queued jobs and hand them to
+the ``IJobRunner`` utility named for the job's kind, committing after each source so progress shows
+up in ``@@updateJobs`` as it happens.
+
+The queue is persistent, kept in an annotation on the site, so jobs survive restarts and several Zope
+processes sharing a database can share the work; ZODB conflicts decide who gets each job. Workers
+also queue jobs for sources that have an ``updateInterval``, so fast-changing sources can refresh more
+often than the site-wide update runs. Set ``EDRN_RDF_JOB_THREADS=0`` in the environment of processes
+that shouldn't run jobs.
+
+A job that's running keeps a heartbeat. Its worker beats it after each source, and a thread of its own
+beats it in the meantime, so a single slow source doesn't make the job look lost. A job that stops
+beating for ``STALE_SECONDS`` is presumed gone with its process, and another worker takes it over.
+'''
+
+from .instrumentation import getRunRecords
+from .interfaces import IJobRunner
+from AccessControl.SecurityManagement import newSecurityManager, noSecurityManager
+from AccessControl.SpecialUsers import system
+from BTrees.OOBTree import OOBTree
+from persistent import Persistent
+from persistent.list import PersistentList
+from Products.CMFCore.interfaces import ISiteRoot
+from Products.Five import BrowserView
+from Testing.makerequest import makerequest
+from zExceptions import NotFound
+from ZODB.POSException import ConflictError
+from zope.annotation.interfaces import IAnnotations
+from zope.component import getUtility, getUtilitiesFor
+from zope.component.hooks import setSite
+import contextlib, datetime, json, logging, os, plone.api, threading, time, transaction, uuid
+
+_logger = logging.getLogger('edrn.rdf')
+
+JOBS_KEY = 'edrn.rdf.jobs'
+MAX_FINISHED = 100    # Finished jobs to keep for reporting
+POLL_SECONDS = 60        # How often workers check schedules and look for jobs if nobody wakes them
+HEARTBEAT_SECONDS = 60   # How often a running job's heartbeat is beaten while a source is updating
+STALE_SECONDS = 600      # A running job not heard from in this long is presumed lost along with its process
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+def jobThreads():
+    '''Tell how many job worker threads this process should have, from ``EDRN_RDF_JOB_THREADS``.'''
+    return int(os.environ.get('EDRN_RDF_JOB_THREADS', '2'))
+
+
+class Heartbeat(Persistent):
+    '''When a running job was last known to be alive. It's apart from the job so that beating it doesn't
+    conflict with the worker saving the job's progress, and beats that do conflict keep the later time.'''
+    def __init__(self):
+        self.when = None
+    def beat(self, when=None):
+        self.when = time.time() if when is None else when
+    def _p_resolveConflict(self, oldState, savedState, newState):
+        return max(savedState, newState, key=lambda state: state.get('when') or 0)
+
+
+class Job(Persistent):
+    '''A request to update the sources of one ``kind``: all of them, or just those at ``sourcePaths``.'''
+    def __init__(self, kind, force=False, sourcePaths=None, scheduled=False):
+        now = time.time()
+        # IDs sort in the order jobs were made
+        stamp = datetime.datetime.utcfromtimestamp(now).strftime('%Y%m%dT%H%M%S.%f')
+        self.jobID = '%s-%s' % (stamp, uuid.uuid4().hex[:8])
+        self.kind, self.force, self.scheduled = kind, force, scheduled
+        self.sourcePaths = list(sourcePaths) if sourcePaths else None
+        self.state, self.created, self.started, self.finished, self.heartbeat = QUEUED, now, None, None, Heartbeat()
+        self.total = self.done = self.count = 0
+        self.failures, self.stats, self.message = PersistentList(), {}, None
+    def asDict(self):
+        '''Give this job's status in a form that can be turned into JSON.'''
+        return dict(
+            jobID=self.jobID, kind=self.kind, force=self.force, scheduled=self.scheduled,
+            sourcePaths=self.sourcePaths, state=self.state, created=self.created, started=self.started,
+            finished=self.finished, total=self.total, done=self.done, count=self.count,
+            failures=[dict(i) for i in self.failures], stats=dict(self.stats), message=self.message
+        )
+
+
+class JobQueue(Persistent):
+    '''A site's update jobs by ID, and when we last scheduled an update of each source, by path.'''
+    def __init__(self):
+        self.jobs, self.lastScheduled = OOBTree(), OOBTree()
+    def add(self, job):
+        '''Add ``job``, forgetting the oldest finished jobs if there are too many.'''
+        self.jobs[job.jobID] = job
+        finished = [i.jobID for i in self.jobs.values() if i.state in (DONE, FAILED)]
+        for jobID in finished[:max(len(finished) - MAX_FINISHED, 0)]:
+            del self.jobs[jobID]
+    def pending(self, sourcePath):
+        '''Tell if there's a job queued or running for the source at ``sourcePath``.'''
+        return any(
+            i.state in (QUEUED, RUNNING) and (i.sourcePaths is None or sourcePath in i.sourcePaths)
+            for i in self.jobs.values()
+        )
+    def claim(self):
+        '''Mark the oldest queued job, or one whose process seems to have died, as running and return it;
+        or return None if there's nothing to do.'''
+        now = time.time()
+        for job in self.jobs.values():
+            if job.state == QUEUED or (job.state == RUNNING and now - (job.heartbeat.when or 0) > STALE_SECONDS):
+                job.state = RUNNING
+                job.heartbeat.beat(now)
+                return job
+        return None
+
+
+def getQueue(site, create=False):
+    '''Get the job queue of ``site``, making it if ``create`` is true; otherwise it may be None.'''
+    annotations = IAnnotations(site)
+    queue = annotations.get(JOBS_KEY)
+    if queue is None and create:
+        queue = annotations[JOBS_KEY] = JobQueue()
+    return queue
+
+
+class JobProgress(object):
+    '''What a job runner tells how each source went. After each, we call ``checkpoint``.'''
+    def __init__(self, job, checkpoint):
+        self.job, self.checkpoint = job, checkpoint
+    def _tick(self):
+        self.job.done += 1
+        self.job.heartbeat.beat()
+        self.checkpoint()
+    def updated(self, brain):
+        '''Note the source in ``brain`` got updated.'''
+        self.job.count += 1
+        self._tick()
+    def skipped(self, brain, reason):
+        '''Note the source in ``brain`` needed no update, for the given ``reason``.'''
+        _logger.info('Ignoring exception "%s" on "%s"', reason, brain.getPath())
+        self._tick()
+    def failed(self, brain, source, ex):
+        '''Note the ``source`` in ``brain`` failed to update with exception ``ex``.'''
+        _logger.error('Failure updating "%s": %s', brain.getPath(), ex, exc_info=ex)
+        self.job.failures.append(dict(title=brain.Title, url=source.absolute_url(), message=str(ex)))
+        self._tick()
+    @property
+    def failures(self):
+        return list(self.job.failures)
+
+
+def enqueue(site, kind, force=False, sourcePaths=None):
+    '''Queue a job to update sources of ``kind`` in ``site`` and have the workers look for it once the
+    current transaction commits. Returns the job.'''
+    job = Job(kind, force, sourcePaths)
+    getQueue(site, create=True).add(job)
+    transaction.get().addAfterCommitHook(lambda succeeded: succeeded and _wake.set())
+    return job
+
+
+def runJob(site, job, checkpoint=lambda: None):
+    '''Run ``job`` for ``site`` right here, calling ``checkpoint`` whenever there's progress to save.'''
+    now = time.time()
+    job.state, job.started = RUNNING, now
+    job.heartbeat.beat(now)
+    runner = getUtility(IJobRunner, name=job.kind)
+    results = runner.sources(site)
+    if job.sourcePaths is not None:
+        results = [i for i in results if i.getPath() in job.sourcePaths]
+    job.total = len(results)
+    try:
+        job.stats = dict(runner.run(site, results, job.force, JobProgress(job, checkpoint)) or {})
+        job.state = DONE
+    except ConflictError:
+        raise
+    except Exception as ex:
+        _logger.exception('Update job %s failed', job.jobID)
+        job.state, job.message = FAILED, str(ex)
+    job.finished = time.time()
+    checkpoint()
+
+
+def schedule(site, queue):
+    '''Queue a job in ``queue`` for each active source in ``site`` whose ``updateInterval`` (in minutes)
+    has passed since we last queued one for it.'''
+    now = time.time()
+    for kind, runner in getUtilitiesFor(IJobRunner):
+        for brain in runner.sources(site):
+            source, path = brain.getObject(), brain.getPath()
+            interval = getattr(source, 'updateInterval', None)
+            if not interval or not source.active: continue
+            if now - queue.lastScheduled.get(path, 0) < interval * 60 or queue.pending(path): continue
+            queue.lastScheduled[path] = now
+            queue.add(Job(kind, sourcePaths=[path], scheduled=True))
+
+
+_wake, _startLock, _started = threading.Event(), threading.Lock(), []
+
+
+def startWorkers(db, threads=None):
+    '''Start ``threads`` threads (by default, ``jobThreads()``) to run jobs in the sites in ``db``, unless
+    we already have.'''
+    threads = jobThreads() if threads is None else threads
+    with _startLock:
+        if _started or threads < 1: return
+        for i in range(threads):
+            thread = threading.Thread(target=_work, args=(db,), name='edrn.rdf.jobs-%d' % i, daemon=True)
+            thread.start()
+            _started.append(thread)
+
+
+def databaseOpened(event):
+    '''Start the job workers when Zope opens its database.'''
+    startWorkers(event.database)
+
+
+def _work(db):
+    while True:
+        _wake.wait(POLL_SECONDS)
+        _wake.clear()
+        try:
+            _runPending(db)
+        except Exception:
+            _logger.exception('Error running update jobs')
+
+
+def _runPending(db):
+    connection = db.open()
+    try:
+        app = makerequest(connection.root()['Application'])
+        newSecurityManager(None, system)
+        for site in [i for i in app.objectValues() if ISiteRoot.providedBy(i)]:
+            setSite(site)
+            try:
+                schedule(site, getQueue(site, create=True))
+                transaction.commit()
+            except ConflictError:
+                transaction.abort()  # Another worker got there first
+            while _runNext(site):
+                pass
+    finally:
+        transaction.abort()
+        noSecurityManager()
+        setSite(None)
+        connection.close()
+
+
+@contextlib.contextmanager
+def beating(db, sitePath, jobID, interval=HEARTBEAT_SECONDS):
+    '''Beat the heartbeat of the job ``jobID`` in the site at ``sitePath`` in ``db`` every ``interval``
+    seconds for the duration, from a thread with its own connection, since the worker can't commit
+    while it's in the middle of a source.'''
+    stop = threading.Event()
+    def beat():
+        while not stop.wait(interval):
+            manager = transaction.TransactionManager()
+            connection = db.open(transaction_manager=manager)
+            try:
+                site = connection.root()['Application'].unrestrictedTraverse(sitePath)
+                getQueue(site).jobs[jobID].heartbeat.beat()
+                manager.commit()
+            except Exception:
+                manager.abort()
+                _logger.warning('Cannot beat the heartbeat of update job %s', jobID, exc_info=True)
+            finally:
+                connection.close()
+    thread = threading.Thread(target=beat, name='edrn.rdf.heartbeat-%s' % jobID, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _runNext(site):
+    # Claim and run the next job in ``site``, returning False if there isn't one
+    try:
+        job = getQueue(site, create=True).claim()
+        if job is None:
+            transaction.abort()
+            return False
+        transaction.commit()
+    except ConflictError:
+        transaction.abort()
+        return False
+    jobID = job.jobID
+    try:
+        with beating(site._p_jar.db(), site.getPhysicalPath(), jobID):
+            runJob(site, job, transaction.commit)
+    except ConflictError:
+        transaction.abort()
+        job = getQueue(site).jobs[jobID]
+        job.state, job.finished, job.message = FAILED, time.time(), 'Conflicting change to the database'
+        transaction.commit()
+    return True
+
+
+class JobsView(BrowserView):
+    '''Status of update jobs as JSON: the one named by the ``job`` parameter, or else every job we still
+    know about, newest first.'''
+    def __call__(self):
+        queue = getQueue(plone.api.portal.get())
+        jobs = queue.jobs if queue is not None else {}
+        jobID = self.request.form.get('job')
+        if jobID:
+            job = jobs.get(jobID)
+            if job is None:
+                raise NotFound('No update job %s' % jobID)
+            status = job.asDict()
+        else:
+            status = [i.asDict() for i in reversed(list(jobs.values()))]
+        self.request.response.setHeader('Content-Type', 'application/json')
+        return json.dumps(status)
+
+
+class RunRecordsView(BrowserView):
+    '''Run records—per-phase timings and sizes of recent updates—as JSON, keyed by source path: for the
+    source whose path is in the ``source`` parameter, or else for every source of every kind.'''
+    def __call__(self):
+        site, sourcePath = plone.api.portal.get(), self.request.form.get('source')
+        records = {}
+        for kind, runner in getUtilitiesFor(IJobRunner):
+            for brain in runner.sources(site):
+                path = brain.getPath()
+                if sourcePath and path != sourcePath: continue
+                records[path] = list(getRunRecords(brain.getObject()))
+        if sourcePath and sourcePath not in records:
+            raise NotFound('No source at %s' % sourcePath)
+        self.request.response.setHeader('Content-Type', 'application/json')
+        return json.dumps(records)
@@ -0,0 +1,119 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''LabCAS harvesting. The LabCAS collection generator needs counts of LabCAS's datasets and files and
+every EDRN collection. ``harvest`` gets all three at once over one pooled session, paging through the
+collections with Solr cursors so none are dropped by the server's limit on rows per request, and asking
+only for the fields the generator uses.
+
+``sync`` goes further, starting from a snapshot of the collections left by the last update. It asks
+only for collections indexed since then, plus the IDs of all of them to notice any that were deleted,
+and merges those changes into the snapshot. LabCAS collections have no modification time of their own,
+so the marker is Solr's ``_version_``, which Solr bumps every time it indexes a document.
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from pysolr import Solr
+from requests.adapters import HTTPAdapter
+import logging, requests
+
+_logger = logging.getLogger(__name__)
+
+QUERY = 'Consortium:EDRN'
+PAGE_ROWS = 500  # Collections per page; the server limits rows per request
+COLLECTION_FIELDS = (
+    'id', 'CollectionName', 'Consortium', 'LeadPI', 'Organ', 'ProtocolId', 'CollaborativeGroup', 'Discipline',
+    'DataCategory', 'OwnerPrincipal', 'QAState'
+)
+MARKER = '_version_'
+LOOKBACK = 600000 << 20  # Ten minutes of versions, whose high bits are milliseconds, for late commits
+
+
+def count(solr):
+    '''Give the number of EDRN documents in ``solr``.'''
+    return solr.search(q=QUERY, rows=0).hits
+
+
+def _page(solr, fields, rows, **kwargs):
+    # Page through the collections in ``solr`` with a cursor; returns the number of them and the docs
+    hits, docs, cursor = 0, [], '*'
+    while True:
+        # Cursors need a sort on the unique key
+        results = solr.search(q=QUERY, fl=','.join(fields), sort='id asc', rows=rows, cursorMark=cursor, **kwargs)
+        hits = results.hits
+        docs.extend(results.docs)
+        if not results.nextCursorMark or results.nextCursorMark == cursor: break
+        cursor = results.nextCursorMark
+    return hits, docs
+
+
+def harvestCollections(solr, rows=PAGE_ROWS):
+    '''Page through the collections in ``solr`` with a cursor, ``rows`` at a time, asking only for the
+    fields we use. Returns the number of collections and the collections themselves.'''
+    return _page(solr, COLLECTION_FIELDS, rows)
+
+
+def _snapshot(docs, marker=0):
+    # A snapshot of ``docs`` with the highest version among them, and the docs without their versions
+    collections = {}
+    for doc in docs:
+        doc = dict(doc)
+        marker = max(marker, doc.pop(MARKER, 0))
+        collections[doc['id']] = doc
+    return dict(marker=marker, collections=collections)
+
+
+def syncCollections(solr, snapshot=None, rows=PAGE_ROWS):
+    '''Bring the ``snapshot`` of collections from an earlier sync up to date with ``solr``, or make one
+    from scratch if there's none. Returns the number of collections, the collections in ID order, and the
+    new snapshot.'''
+    if snapshot is not None:
+        # Versions just under the marker may have been committed after we last looked, so look again
+        since = max(snapshot['marker'] - LOOKBACK, 0)
+        changed = _page(solr, COLLECTION_FIELDS + (MARKER,), rows, fq='%s:{%d TO *]' % (MARKER, since))[1]
+        hits, ids = _page(solr, ('id',), rows)
+        ids = set(doc['id'] for doc in ids)
+        updated = _snapshot(changed, snapshot['marker'])
+        collections = dict((i, doc) for i, doc in snapshot['collections'].items() if i in ids)
+        collections.update(updated['collections'])
+        if set(collections) == ids:
+            updated['collections'] = collections
+            return hits, [collections[i] for i in sorted(collections)], updated
+        # A collection we've never seen that's older than the marker; don't trust the snapshot
+        _logger.warning(
+            'LabCAS collections %r are missing from the snapshot; harvesting all of them', sorted(ids - set(collections))
+        )
+    hits, docs = _page(solr, COLLECTION_FIELDS + (MARKER,), rows)
+    snapshot = _snapshot(docs)
+    return hits, [snapshot['collections'][i] for i in sorted(snapshot['collections'])], snapshot
+
+
+def _harvest(url, auth, collect):
+    # Count datasets and files while ``collect`` gets the collections, over one pool of connections
+    with requests.Session() as session:
+        session.verify = False
+        adapter = HTTPAdapter(pool_maxsize=3)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        datasets, files, collections = [
+            Solr(url + '/' + core, auth=auth, verify=False, session=session) for core in ('datasets', 'files', 'collections')
+        ]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            numDatasets, numFiles = executor.submit(count, datasets), executor.submit(count, files)
+            collected = executor.submit(collect, collections).result()
+            return (numDatasets.result(), numFiles.result()) + collected
+
+
+def harvest(url, auth, rows=PAGE_ROWS):
+    '''Count the datasets and files in the LabCAS Solr at ``url`` and harvest its collections, all at
+    once, over one session's pool of connections. Returns the numbers of datasets, files, and
+    collections, and the collections.'''
+    return _harvest(url, auth, lambda solr: harvestCollections(solr, rows))
+
+
+def sync(url, auth, snapshot=None, rows=PAGE_ROWS):
+    '''Like ``harvest``, but bring the ``snapshot`` of collections from the last sync up to date rather
+    than harvesting them all. Returns the numbers of datasets, files, and collections, the collections,
+    and the new snapshot.'''
+    return _harvest(url, auth, lambda solr: syncCollections(solr, snapshot, rows))
@@ -5,14 +5,18 @@
 '''LabCAS RDF Generator.
 '''
 
+from .instrumentation import phase
+from .labcas import QUERY, count, harvest, sync
 from .rdfgenerator import IRDFGenerator
+from .sink import TripleGenerator
+from .upstream import UpstreamCheck
 from .utils import validateAccessibleURL
 from Acquisition import aq_inner
 from edrn.rdf import _
 from pysolr import Solr
 from rdflib.term import URIRef, Literal
 from zope import schema
-import rdflib, logging
+import rdflib, logging, json
 
 _logger = logging.getLogger(__name__)
 
@@ -76,27 +80,65 @@ class ILabCASCollectionRDFGenerator(IRDFGenerator):
         description=_('Password to confirm the identity of the username; this will be visible!'),
         required=True,
     )
+    cursorPaging = schema.Bool(
+        title=_('Harvest With Cursors'),
+        description=_(
+            'Page through every collection with Solr cursors, asking only for the fields used, and make all'
+            ' queries to LabCAS at once over shared connections. Otherwise, at most 500 collections are read.'
+        ),
+        required=False,
+        default=False,
+    )
+    incrementalSync = schema.Bool(
+        title=_('Sync Incrementally'),
+        description=_(
+            'Remember the collections from the last update and ask LabCAS only for those indexed since, plus'
+            ' the IDs of all of them to notice deletions. Forcing an update harvests everything again.'
+            ' This harvests with cursors regardless of the setting above.'
+        ),
+        required=False,
+        default=False,
+    )
 
 
-class LabCASCollectionGraphGenerator(object):
+class LabCASCollectionGraphGenerator(TripleGenerator):
     '''A graph generator that produces statements about EDRN's science data collections.'''
     def __init__(self, context):
         self.context = context
-    def generateGraph(self):
+        self.upstream = UpstreamCheck(context)
+    def generateTriples(self, sink):
         context = aq_inner(self.context)
-        graph = rdflib.Graph()
-        solr = Solr(context.labcasSolrURL + '/datasets', auth=(context.username, context.password), verify=False)
-        numDatasets = solr.search(q='Consortium:EDRN', rows=0).hits
-        solr = Solr(context.labcasSolrURL + '/files', auth=(context.username, context.password), verify=False)
-        numFiles = solr.search(q='Consortium:EDRN', rows=0).hits
-        solr = Solr(context.labcasSolrURL + '/collections', auth=(context.username, context.password), verify=False)
-        # Strange, rows=999999 fails with a 400 error, but rows=99999 works; this is new behavior
-        # as of 2025-05-30 because the server is configured to limit the number of rows thanks to
-        # VDP-1645. We'll never have that many collections anyway, so I'm limiting the rows even
-        # further in case someone edits the ~/labcas.properties on edrn-labcas to make it even lower.
-        results = solr.search(q='Consortium:EDRN', rows=500)
-        numCollections = results.hits
-        for i in results:
+        auth = (context.username, context.password)
+        # Worker threads have no record of their own, so the whole harvest counts as fetching here
+        with phase('fetch'):
+            if getattr(context, 'incrementalSync', False):
+                numDatasets, numFiles, numCollections, collections, self.upstream.snapshot = sync(
+                    context.labcasSolrURL, auth, self.upstream.previousSnapshot
+                )
+            elif getattr(context, 'cursorPaging', False):
+                numDatasets, numFiles, numCollections, collections = harvest(context.labcasSolrURL, auth)
+            else:
+                solr = Solr(context.labcasSolrURL + '/datasets', auth=auth, verify=False)
+                numDatasets = count(solr)
+                solr = Solr(context.labcasSolrURL + '/files', auth=auth, verify=False)
+                numFiles = count(solr)
+                solr = Solr(context.labcasSolrURL + '/collections', auth=auth, verify=False)
+                # Strange, rows=999999 fails with a 400 error, but rows=99999 works; this is new behavior
+                # as of 2025-05-30 because the server is configured to limit the number of rows thanks to
+                # VDP-1645. We'll never have that many collections anyway, so I'm limiting the rows even
+                # further in case someone edits the ~/labcas.properties on edrn-labcas to make it even lower.
+                results = solr.search(q=QUERY, rows=500)
+                numCollections, collections = results.hits, results.docs
+                if numCollections > len(collections):
+                    _logger.warning(
+                        'LabCAS has %d collections but we read only %d; turn on cursor harvesting for %s',
+                        numCollections, len(collections), '/'.join(context.getPhysicalPath())
+                    )
+        self.upstream.record('datasets', str(numDatasets))
+        self.upstream.record('files', str(numFiles))
+        self.upstream.record('collections', json.dumps({'hits': numCollections, 'docs': collections}, sort_keys=True))
+        self.upstream.verify()
+        for i in collections:
             collectionID, name, consortia = i.get('id'), i.get('CollectionName', '«unknown»'), i.get('Consortium', [])
             if not collectionID:
                 _logger.warn('😮 The ``id`` is missing from a LabCAS collection named %s; skipping', name)
@@ -105,40 +147,38 @@ class LabCASCollectionGraphGenerator(object):
                 _logger.warn('😌 Collection ``%s`` belongs to %r, not EDRN, so skipping it', collectionID, consortia)
                 continue
             subjectURI = URIRef(_subjectPrefix + collectionID)  # ⚠️ Note that we are not URI-escaping anything here, hope that's oK!
-            graph.add((subjectURI, rdflib.RDF.type, URIRef(_typeURI)))
-            graph.add((subjectURI, _titlePredicateURI, Literal(name)))
+            sink.add((subjectURI, rdflib.RDF.type, URIRef(_typeURI)))
+            sink.add((subjectURI, _titlePredicateURI, Literal(name)))
             for pi in i.get('LeadPI', []):
-                graph.add((subjectURI, _piPredicateURI, Literal(pi)))
+                sink.add((subjectURI, _piPredicateURI, Literal(pi)))
             for organ in i.get('Organ', []):
-                graph.add((subjectURI, _organPredicateURI, Literal(organ)))
+                sink.add((subjectURI, _organPredicateURI, Literal(organ)))
             for protocolID in i.get('ProtocolId', []):
                 try:
                     protocolID = int(protocolID)
-                    graph.add((subjectURI, _protocolPredicateURI, URIRef(f'{_protocolPrefix}{protocolID}')))
+                    sink.add((subjectURI, _protocolPredicateURI, URIRef(f'{_protocolPrefix}{protocolID}')))
                 except ValueError:
                     _logger.warn('😮 The protocol ID «%s» for collection «%s» looks invalid; I will skip it', protocolID, collectionID)
             for group in i.get('CollaborativeGroup', []):
                 group = _inconsistentCollaborativeGroupNaming.get(group)
                 if group is not None:
-                    graph.add((subjectURI, _collaborativeGroupPredicateURI, Literal(group)))
+                    sink.add((subjectURI, _collaborativeGroupPredicateURI, Literal(group)))
             for discipline in i.get('Discipline', []):
-                graph.add((subjectURI, _discplinePredicateURI, Literal(discipline)))
+                sink.add((subjectURI, _discplinePredicateURI, Literal(discipline)))
             for category in i.get('DataCategory', []):
-                graph.add((subjectURI, _dataCategoryPredicateURI, Literal(category)))
+                sink.add((subjectURI, _dataCategoryPredicateURI, Literal(category)))
             for owner in i.get('OwnerPrincipal', []):
                 # Work around https://github.com/EDRN/EDRN-metadata/issues/63
                 if owner.startswith('OwnerPrincipal='):
                     owner = owner[15:]
-                graph.add((subjectURI, _ownerPrincipal, Literal(owner)))
+                sink.add((subjectURI, _ownerPrincipal, Literal(owner)))
             for qaState in i.get('QAState', []):
-                graph.add((subjectURI, _qaState, Literal(qaState)))
+                sink.add((subjectURI, _qaState, Literal(qaState)))
 
         # And summary info
-        graph.add((URIRef(context.labcasSolrURL + '/collections'), _cardinalityPredicateURI, Literal(str(numCollections))))
-        graph.add((URIRef(context.labcasSolrURL + '/collections'), rdflib.RDF.type, _statsTypeURI))
-        graph.add((URIRef(context.labcasSolrURL + '/datasets'), _cardinalityPredicateURI, Literal(str(numDatasets))))
-        graph.add((URIRef(context.labcasSolrURL + '/datasets'), rdflib.RDF.type, _statsTypeURI))
-        graph.add((URIRef(context.labcasSolrURL + '/files'), _cardinalityPredicateURI, Literal(str(numFiles))))
-        graph.add((URIRef(context.labcasSolrURL + '/files'), rdflib.RDF.type, _statsTypeURI))
-
-        return graph
+        sink.add((URIRef(context.labcasSolrURL + '/collections'), _cardinalityPredicateURI, Literal(str(numCollections))))
+        sink.add((URIRef(context.labcasSolrURL + '/collections'), rdflib.RDF.type, _statsTypeURI))
+        sink.add((URIRef(context.labcasSolrURL + '/datasets'), _cardinalityPredicateURI, Literal(str(numDatasets))))
+        sink.add((URIRef(context.labcasSolrURL + '/datasets'), rdflib.RDF.type, _statsTypeURI))
+        sink.add((URIRef(context.labcasSolrURL + '/files'), _cardinalityPredicateURI, Literal(str(numFiles))))
+        sink.add((URIRef(context.labcasSolrURL + '/files'), rdflib.RDF.type, _statsTypeURI))
@@ -5,7 +5,7 @@
 
 from .predicatehandler import ISimplePredicateHandler
 from Acquisition import aq_inner
-import rdflib
+import functools, rdflib
 
 
 class ILiteralPredicateHandler(ISimplePredicateHandler):
@@ -13,10 +13,18 @@ class ILiteralPredicateHandler(ISimplePredicateHandler):
     # No further fields are necessary.
 
 
+def characterizeLiteral(predicateURI, obj):
+    '''Characterize ``obj`` with ``predicateURI`` and a literal.'''
+    return [(predicateURI, rdflib.Literal(obj))]
+
+
 class LiteralAsserter(object):
     '''Describes subjects using predicates with literal complementary objects.'''
     def __init__(self, context):
         self.context = context
+    def compile(self):
+        context = aq_inner(self.context)
+        return functools.partial(characterizeLiteral, rdflib.URIRef(context.predicateURI))
     def characterize(self, obj):
         context = aq_inner(self.context)
-        return [(rdflib.URIRef(context.predicateURI), rdflib.Literal(obj))]
+        return characterizeLiteral(rdflib.URIRef(context.predicateURI), obj)
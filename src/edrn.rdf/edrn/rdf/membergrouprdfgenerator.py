@@ -4,8 +4,13 @@
 
 '''Member group RDF generator.'''
 
+from .dmcccache import callDMCC
+from .instrumentation import tokenized
 from .rdfgenerator import IRDFGenerator
-from .utils import parseTokens, validateAccessibleURL, DEFAULT_VERIFICATION_NUM, splitDMCCRows, get_suds_client
+from .sink import TripleGenerator
+from .triplebuffer import TripleBuffer
+from .upstream import UpstreamCheck
+from .utils import validateAccessibleURL, DEFAULT_VERIFICATION_NUM, iterDMCCRows
 from Acquisition import aq_inner
 from edrn.rdf import _
 from rdflib.term import URIRef, Literal
@@ -86,27 +91,29 @@ class _Site:
         graph.add((subject, _role_uri, Literal(self.role)))
 
 
-class MemberGroupGraphGenerator(object):
+class MemberGroupGraphGenerator(TripleGenerator):
     '''A graph generator that produces statements about EDRN's organizational groups and their site members.'''
 
     def __init__(self, context):
         self.context = context
+        self.upstream = UpstreamCheck(context)
 
-    def generateGraph(self):
+    def generateTriples(self, sink):
         context = aq_inner(self.context)
         verification_num = context.verificationNum if context.verification_num else DEFAULT_VERIFICATION_NUM
-        client = get_suds_client(context.web_service_url, context)
-        member_group_func = getattr(client.service, 'MemberGroup')
-        horrible_member_groups = member_group_func(verification_num)
+        horrible_member_groups = self.upstream.record(
+            'MemberGroup', callDMCC(context.web_service_url, 'MemberGroup', verification_num)
+        )
+        self.upstream.verify()
 
         # Start off with a mapping of org groups to sites and a set of unique sites
         org_units, unique_sites = {}, set()
 
         # For each row given in the horrible string returned from SOAP:
-        for row in splitDMCCRows(horrible_member_groups):
+        for row in iterDMCCRows(horrible_member_groups):
             org_name = None
             slots = {}
-            for key, value in parseTokens(row):
+            for key, value in tokenized(row):
                 # Look for the MemberGroup key and save that as the org name. The rest of the keys are slots
                 # for the site being described.
                 if key == 'MemberGroup':
@@ -134,18 +141,17 @@ class MemberGroupGraphGenerator(object):
             sites.add(site)
             org_units[org_name] = sites
 
-        # First, add all the sites to the graph
-        graph = rdflib.Graph()
+        # First, describe all the sites
+        buffer = TripleBuffer()
         for site in unique_sites:
-            site.add_to_graph(graph)
+            site.add_to_graph(buffer)
 
         # Now add each org unit, referencing those sites described above
         for org_name, sites in org_units.items():
             org_subject = URIRef(_org_group_prefix + quote(org_name))
-            graph.add((org_subject, rdflib.RDF.type, _org_group_type_uri))
-            graph.add((org_subject, rdflib.namespace.DCTERMS.title, Literal(org_name)))
+            buffer.add((org_subject, rdflib.RDF.type, _org_group_type_uri))
+            buffer.add((org_subject, rdflib.namespace.DCTERMS.title, Literal(org_name)))
             for site in sites:
                 site_subject = site.uriref()
-                graph.add((org_subject, _member_site_uri, site_subject))
-
-        return graph
+                buffer.add((org_subject, _member_site_uri, site_subject))
+        buffer.writeTo(sink)
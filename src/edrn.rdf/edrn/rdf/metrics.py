@@ -0,0 +1,168 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Metrics for monitoring. A small registry of counters and histograms, shared by edrn.rdf and
+edrn.summarizer, that ``@@metrics`` on the site root gives in Prometheus's text exposition format.
+
+Metrics are bumped while serving requests and running updates, so that has to be cheap and must never
+wait on a lock. Each thread therefore keeps its own values for each metric—its *shard*—and only that
+thread ever writes to it. Reading a metric adds up every thread's shard; when a thread ends, its values
+are folded into a shard for departed threads so counts never go backwards.
+'''
+
+import threading, weakref
+
+# Upper bounds, in seconds, of the buckets for timing histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+EXPOSITION_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shards(object):
+    '''Per-thread mappings from label values to a metric's values.'''
+    def __init__(self, merge):
+        # Reentrant, since a thread's shard can be retired by garbage collection while we're adding them up
+        self.merge, self.local, self.lock, self.live, self.retired = merge, threading.local(), threading.RLock(), [], {}
+    def mine(self):
+        '''Give this thread's shard, making it the first time.'''
+        try:
+            return self.local.values
+        except AttributeError:
+            values = self.local.values = {}
+            with self.lock:
+                self.live.append(values)
+            weakref.finalize(threading.current_thread(), self._retire, values)
+            return values
+    def _retire(self, values):
+        with self.lock:
+            self.live.remove(values)
+            self.merge(self.retired, values)
+    def total(self):
+        '''Add up the values in every shard.'''
+        with self.lock:
+            shards = [self.retired] + self.live
+            totals = {}
+            for shard in shards:
+                # dict.copy is atomic, so the owning thread can keep writing while we read
+                self.merge(totals, shard.copy())
+        return totals
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(object):
+    kind = None
+    def __init__(self, name, documentation, labelNames=()):
+        self.name, self.documentation, self.labelNames = name, documentation, tuple(labelNames)
+        self.shards = _Shards(self.merge)
+    def key(self, labels):
+        if len(labels) != len(self.labelNames):
+            raise ValueError('Metric %s takes labels %r, not %r' % (self.name, self.labelNames, tuple(labels)))
+        return tuple(str(labels[name]) for name in self.labelNames)
+    def labelText(self, key, extra=()):
+        pairs = list(zip(self.labelNames, key)) + list(extra)
+        if not pairs: return ''
+        return '{%s}' % ','.join('%s="%s"' % (name, _escape(value)) for name, value in pairs)
+    def exposition(self):
+        '''Give this metric in the text exposition format, as a list of lines.'''
+        lines = ['# HELP %s %s' % (self.name, self.documentation.replace('\\', '\\\\').replace('\n', '\\n'))]
+        lines.append('# TYPE %s %s' % (self.name, self.kind))
+        for key, value in sorted(self.shards.total().items()):
+            lines.extend(self.samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    '''A count that only goes up, one for each combination of label values.'''
+    kind = 'counter'
+    @staticmethod
+    def merge(totals, values):
+        for key, value in values.items():
+            totals[key] = totals.get(key, 0) + value
+    def inc(self, amount=1, **labels):
+        '''Add ``amount`` to the count for the given ``labels``.'''
+        values, key = self.shards.mine(), self.key(labels)
+        values[key] = values.get(key, 0) + amount
+    def value(self, **labels):
+        return self.shards.total().get(self.key(labels), 0)
+    def samples(self, key, value):
+        return ['%s%s %s' % (self.name, self.labelText(key), _number(value))]
+
+
+class Histogram(_Metric):
+    '''Observations sorted into ``buckets`` by upper bound, with their sum and count, for each combination
+    of label values.'''
+    kind = 'histogram'
+    def __init__(self, name, documentation, labelNames=(), buckets=DEFAULT_BUCKETS):
+        super(Histogram, self).__init__(name, documentation, labelNames)
+        self.buckets = tuple(sorted(buckets))
+    @staticmethod
+    def merge(totals, values):
+        # Each value's a list of per-bucket counts (not cumulative), then the sum, then the count
+        for key, value in values.items():
+            total = totals.get(key)
+            totals[key] = list(value) if total is None else [a + b for a, b in zip(total, value)]
+    def observe(self, amount, **labels):
+        '''Note an observation of ``amount`` for the given ``labels``.'''
+        values, key = self.shards.mine(), self.key(labels)
+        value = values.get(key)
+        if value is None:
+            value = values[key] = [0] * (len(self.buckets) + 3)
+        index = 0
+        for bound in self.buckets:
+            if amount <= bound: break
+            index += 1
+        value[index] += 1
+        value[-2] += amount
+        value[-1] += 1
+    def value(self, **labels):
+        '''Give the count and sum of observations for the given ``labels``.'''
+        value = self.shards.total().get(self.key(labels))
+        return (0, 0) if value is None else (value[-1], value[-2])
+    def samples(self, key, value):
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), value[:-2]):
+            cumulative += count
+            lines.append('%s_bucket%s %d' % (self.name, self.labelText(key, [('le', _number(float(bound)))]), cumulative))
+        lines.append('%s_sum%s %s' % (self.name, self.labelText(key), _number(value[-2])))
+        lines.append('%s_count%s %d' % (self.name, self.labelText(key), value[-1]))
+        return lines
+
+
+class Registry(object):
+    '''Metrics by name. Asking for a metric that's already registered gives the existing one, so modules
+    can declare the metrics they use at import time in any order.'''
+    def __init__(self):
+        self.metrics, self.lock = {}, threading.Lock()
+    def _get(self, factory, name, *args, **kw):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = factory(name, *args, **kw)
+            elif not isinstance(metric, factory):
+                raise ValueError('Metric %s is already registered as a %s' % (name, metric.kind))
+            return metric
+    def counter(self, name, documentation, labelNames=()):
+        return self._get(Counter, name, documentation, labelNames)
+    def histogram(self, name, documentation, labelNames=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, documentation, labelNames, buckets)
+    def exposition(self):
+        '''Give every metric in the text exposition format.'''
+        with self.lock:
+            metrics = sorted(self.metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines.extend(metric.exposition())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+counter, histogram = REGISTRY.counter, REGISTRY.histogram
@@ -5,7 +5,7 @@
 
 from .predicatehandler import ISimplePredicateHandler
 from Acquisition import aq_inner
-import rdflib
+import functools, rdflib
 
 
 class IMultiLiteralPredicateHandler(ISimplePredicateHandler):
@@ -13,10 +13,18 @@ class IMultiLiteralPredicateHandler(ISimplePredicateHandler):
     # No further fields are necessary.
 
 
+def characterizeMultiLiteral(predicateURI, obj):
+    '''Characterize ``obj`` with ``predicateURI`` and a literal for each comma-separated value.'''
+    return [(predicateURI, rdflib.Literal(i.strip())) for i in obj.split(', ')]
+
+
 class MultiLiteralAsserter(object):
     '''Describes subjects using predicates with multiple literal complementary objects.'''
     def __init__(self, context):
         self.context = context
+    def compile(self):
+        context = aq_inner(self.context)
+        return functools.partial(characterizeMultiLiteral, rdflib.URIRef(context.predicateURI))
     def characterize(self, obj):
         context = aq_inner(self.context)
-        return [(rdflib.URIRef(context.predicateURI), rdflib.Literal(i.strip())) for i in obj.split(', ')]
+        return characterizeMultiLiteral(rdflib.URIRef(context.predicateURI), obj)
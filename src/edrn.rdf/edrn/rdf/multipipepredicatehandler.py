@@ -5,7 +5,7 @@
 
 from .predicatehandler import ISimplePredicateHandler
 from Acquisition import aq_inner
-import rdflib
+import functools, rdflib
 
 
 class IMultiPipePredicateHandler(ISimplePredicateHandler):
@@ -13,15 +13,23 @@ class IMultiPipePredicateHandler(ISimplePredicateHandler):
     # No further fields are necessary.
 
 
+def characterizeMultiPipe(predicateURI, obj):
+    '''Characterize ``obj`` with ``predicateURI`` and a numbered literal for each |-separated value.'''
+    rc, count = [], 0
+    for i in obj.split('|'):
+        literal = rdflib.Literal(f'{count:04} {i.strip()}')
+        rc.append((predicateURI, literal))
+        count += 1
+    return rc
+
+
 class MultiPipeAsserter(object):
     '''Describes subjects using predicates with multiple literal complementary objects separated by |.'''
     def __init__(self, context):
         self.context = context
+    def compile(self):
+        context = aq_inner(self.context)
+        return functools.partial(characterizeMultiPipe, rdflib.URIRef(context.predicateURI))
     def characterize(self, obj):
         context = aq_inner(self.context)
-        rc, count = [], 0
-        for i in obj.split('|'):
-            literal = rdflib.Literal(f'{count:04} {i.strip()}')
-            rc.append((rdflib.URIRef(context.predicateURI), literal))
-            count += 1
-        return rc
+        return characterizeMultiPipe(rdflib.URIRef(context.predicateURI), obj)
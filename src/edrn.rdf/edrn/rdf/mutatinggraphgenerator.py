@@ -5,6 +5,7 @@
 
 
 from .rdfgenerator import IRDFGenerator
+from .sink import TripleGenerator
 import rdflib, uuid
 
 
@@ -12,18 +13,16 @@ class IMutatingRDFGenerator(IRDFGenerator):
     '''A mutating RDF generator that produces ever-changing statements.'''
 
 
-class MutatingGraphGenerator(object):
+class MutatingGraphGenerator(TripleGenerator):
     '''A statement graph generator that produces ever-changing graphs.'''
 
     _typeURI = rdflib.URIRef('urn:edrn:types:MutatingTestObject')
 
     def __init__(self, context):
         self.context = context
-    def generateGraph(self):
-        '''Generate always-different graphs.'''
-        graph = rdflib.Graph()
+    def generateTriples(self, sink):
+        '''Generate always-different statements.'''
         identifier = str(uuid.uuid4())
         subjectURI = rdflib.URIRef(f'urn:edrn:objects:MutatingTestObjects:{identifier}')
-        graph.add((subjectURI, rdflib.RDF.type, self._typeURI))
-        graph.add((subjectURI, rdflib.namespace.DCTERMS.title, rdflib.Literal(f'Mutating Test Object «{identifier}»')))
-        return graph
+        sink.add((subjectURI, rdflib.RDF.type, self._typeURI))
+        sink.add((subjectURI, rdflib.namespace.DCTERMS.title, rdflib.Literal(f'Mutating Test Object «{identifier}»')))
@@ -8,17 +8,17 @@ a statement graph, always produces an empty graph containing no statements whats
 
 
 from .rdfgenerator import IRDFGenerator
-import rdflib
+from .sink import TripleGenerator
 
 
 class INullRDFGenerator(IRDFGenerator):
     '''A null RDF generator that produces no statements at all.'''
 
 
-class NullGraphGenerator(object):
+class NullGraphGenerator(TripleGenerator):
     '''A statement graph generator that always produces an empty graph.'''
     def __init__(self, context):
         self.context = context
-    def generateGraph(self):
-        '''Generate an empty graph.'''
-        return rdflib.Graph()
+    def generateTriples(self, sink):
+        '''Generate no statements at all.'''
+        pass
@@ -4,6 +4,10 @@
 
 '''RDF Source'''
 
+from .delivery import serveFile
+from .delta import PATCH_MIMETYPE, composeDeltas, getDelta, statementLines, writePatch
+from .exceptions import DeltaUnavailable
+from .formats import RDF_XML_MIMETYPE, chooseFormat, getAlternatives
 from .rdfgenerator import IRDFGenerator
 from Acquisition import aq_inner
 from edrn.rdf import _
@@ -11,7 +15,9 @@ from plone.app.vocabularies.catalog import CatalogSource
 from plone.supermodel import model
 from Products.Five import BrowserView
 from z3c.relationfield.schema import RelationChoice
+from zExceptions import BadRequest
 from zope import schema
+import datetime, io
 
 
 class IRDFSource(model.Schema):
@@ -44,13 +50,84 @@ class IRDFSource(model.Schema):
         required=False,
         default=False,
     )
+    updateInterval = schema.Int(
+        title=_('Update Interval'),
+        description=_(
+            'How often, in minutes, to regenerate RDF for this source in the background. Leave blank to update'
+            ' it only with the rest of the site.'
+        ),
+        required=False,
+        min=1,
+    )
 
 
 class View(BrowserView):
-    '''RDF output from an RDF source.'''
+    '''RDF output from an RDF source, in RDF/XML or whatever other format the request prefers via its
+    ``format`` parameter or ``Accept`` header.'''
     def __call__(self):
         context = aq_inner(self.context)
         if context.approvedFile and context.approvedFile.to_object:
-            self.request.response.redirect(context.approvedFile.to_object.absolute_url())
+            current = context.approvedFile.to_object
+            alternatives = getAlternatives(current)
+            try:
+                mimeType = chooseFormat(
+                    self.request.form.get('format'), self.request.getHeader('Accept'), list(alternatives.keys())
+                )
+            except ValueError as ex:
+                raise BadRequest(str(ex))
+            namedFile = current.file if mimeType == RDF_XML_MIMETYPE else alternatives[mimeType]
+            self.request.response.setHeader('Vary', 'Accept')
+            return serveFile(self.request, current, namedFile)
         else:
             raise ValueError('The RDF Source at %s does not have an active RDF file to send' % '/'.join(context.getPhysicalPath()))
+
+
+class DeltaView(BrowserView):
+    '''The changes to an RDF source's statements since an earlier RDF file, as an RDF Patch. The ``since``
+    parameter names the file the client has, either by its ID or by a timestamp, in which case we use
+    the newest file made at or before then. If we can't say what changed, we answer 410 Gone and the
+    client should reload the whole RDF.'''
+    def __call__(self):
+        context = aq_inner(self.context)
+        if not (context.approvedFile and context.approvedFile.to_object):
+            raise ValueError('The RDF Source at %s does not have an active RDF file' % '/'.join(context.getPhysicalPath()))
+        current, since = context.approvedFile.to_object, self.request.form.get('since')
+        if not since:
+            raise BadRequest('The "since" parameter is required')
+        response = self.request.response
+        try:
+            sinceID = self.resolve(since)
+            added, removed = composeDeltas(current.getId(), self.lookup, sinceID)
+        except DeltaUnavailable as ex:
+            response.setStatus(410)
+            response.setHeader('Content-Type', 'text/plain')
+            return str(ex)
+        stream = io.BytesIO()
+        writePatch(stream, current.getId(), sinceID, added, removed)
+        response.setHeader('Content-Type', PATCH_MIMETYPE)
+        response.setHeader('Content-Length', str(len(stream.getvalue())))
+        return stream.getvalue()
+    def resolve(self, since):
+        '''Give the ID of the file ``since`` means.'''
+        context = aq_inner(self.context)
+        if since in context.objectIds():
+            return since
+        try:
+            when = datetime.datetime.fromisoformat(since)
+        except ValueError:
+            raise BadRequest('The "since" parameter must be an RDF file ID or an ISO 8601 timestamp')
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)  # Like the timestamps in our file titles
+        candidates = [
+            (i.created().timeTime(), i.getId()) for i in context.objectValues()
+            if i.portal_type == 'File' and i.created().timeTime() <= when.timestamp()
+        ]
+        if not candidates:
+            raise DeltaUnavailable(since)
+        return max(candidates)[1]
+    def lookup(self, fileID):
+        '''Give the previous file's ID and the statements added and removed for ``fileID``.'''
+        rdfFile = aq_inner(self.context).get(fileID)
+        delta = getDelta(rdfFile) if rdfFile is not None else None
+        if delta is None: return None
+        return delta['previous'], statementLines(delta['added'].data), statementLines(delta['removed'].data)
@@ -2,8 +2,17 @@
 # Copyright 2012–2020 California Institute of Technology. ALL RIGHTS
 # RESERVED. U.S. Government Sponsorship acknowledged.
 
-from .exceptions import NoGeneratorError, NoUpdateRequired, SourceNotActive
+from .compression import compressFiles, setEncodings
+from .conditional import HashingStream
+from .delivery import setContentHashes
+from .delta import diffStatements, rdfXMLStatementLines, setDelta, statementLines
+from .exceptions import NoGeneratorError, NoUpdateRequired, SourceNotActive, UpstreamUnchanged
+from .fingerprint import getFingerprint, setFingerprint
+from .formats import ALTERNATIVES, NTRIPLES_MIMETYPE, RDF_XML_MIMETYPE, getAlternatives, setAlternatives
+from .instrumentation import count, phase, recordRun
 from .interfaces import IGraphGenerator
+from .sink import writeRDF
+from .upstream import getUpstreamDigests, getUpstreamSnapshot, saveUpstreamDigests
 from Acquisition import aq_inner
 from plone.dexterity.utils import createContentInContainer
 from plone.namedfile.file import NamedBlobFile
@@ -17,15 +26,64 @@ from zope.event import notify
 from zope.lifecycleevent import ObjectModifiedEvent
 import datetime, uuid, plone.api
 
-RDF_XML_MIMETYPE = 'application/rdf+xml'
 MAX_FILES = 15
 
 
+class RDFOutput(object):
+    '''What a generator made: the RDF/XML ``file``, the ``fingerprint`` of its statements, and
+    ``alternatives``, a mapping from MIME type to a file with the same statements in that format, and
+    ``hashes``, a mapping from MIME type to the SHA-256 hex digest of each file's content.
+    '''
+    def __init__(self, file, fingerprint, alternatives, hashes):
+        self.file, self.fingerprint, self.alternatives, self.hashes = file, fingerprint, alternatives, hashes
+
+
+def generateRDF(graphGenerator):
+    '''Have ``graphGenerator`` write RDF/XML, plus each alternative format, straight into new blob files
+    in a single pass over its statements.
+    '''
+    rdfFile = NamedBlobFile(contentType=RDF_XML_MIMETYPE)
+    alternatives = dict((mimeType, NamedBlobFile(contentType=mimeType)) for mimeType in ALTERNATIVES)
+    streams = dict((mimeType, alternative.open('w')) for mimeType, alternative in alternatives.items())
+    try:
+        hashing = dict((mimeType, HashingStream(stream)) for mimeType, stream in streams.items())
+        followers = [ALTERNATIVES[mimeType][1](stream) for mimeType, stream in hashing.items()]
+        with phase('build'), rdfFile.open('w') as stream:
+            hashing[RDF_XML_MIMETYPE] = HashingStream(stream)
+            writer = writeRDF(graphGenerator, hashing[RDF_XML_MIMETYPE], followers)
+    finally:
+        for stream in streams.values():
+            stream.close()
+    hashes = dict((mimeType, stream.hexdigest()) for mimeType, stream in hashing.items())
+    return RDFOutput(rdfFile, writer.fingerprint, alternatives, hashes)
+
+
+def _statementLines(rdfFile, alternatives, fingerprint):
+    # Lines of N-Triples for the statements in an RDF file, or None if it has blank nodes
+    nTriples = alternatives.get(NTRIPLES_MIMETYPE)
+    if nTriples is None:
+        return rdfXMLStatementLines(rdfFile.data)
+    return statementLines(nTriples.data) if fingerprint is not None else None
+
+
+def recordDelta(previous, newFile, output):
+    '''Store on ``newFile`` the statements added and removed since the ``previous`` file, if we can.'''
+    if output.fingerprint is None: return
+    old = _statementLines(previous.file, getAlternatives(previous), getFingerprint(previous))
+    if old is None: return
+    added, removed = diffStatements(old, _statementLines(output.file, output.alternatives, output.fingerprint))
+    setDelta(newFile, previous.getId(), *[
+        NamedBlobFile(''.join([line + '\n' for line in lines]).encode('utf-8'), contentType=NTRIPLES_MIMETYPE)
+        for lines in (added, removed)
+    ])
+
+
 class RDFUpdater(object):
     '''Update RDF.  Adapts RDF Sources and updates their content with a fresh RDF file, if necessary.'''
     def __init__(self, context):
         self.context = context
-    def updateRDF(self):
+    def getGenerator(self):
+        '''Make sure our RDF source is ready for updating and return its RDF generator.'''
         context = aq_inner(self.context)
         # If the RDF Source is inactive, we're done
         if not context.active:
@@ -33,26 +91,79 @@ class RDFUpdater(object):
         # Check if the RDF Source has an RDF Generator
         if not context.generator:
             raise NoGeneratorError(context)
-        generator = context.generator.to_object
+        return context.generator.to_object
+    def previousUpstream(self, generator, force=False):
+        '''Give the digests and snapshot of the upstream data that ``generator`` last made our RDF from.'''
+        source = aq_inner(self.context)
+        # Without a current file there's nothing for unchanged upstream data to go on serving
+        current = source.approvedFile.to_object if source.approvedFile else None
+        if current is None: return {}, None
+        # Forcing an update also means harvesting everything afresh
+        return getUpstreamDigests(source, generator), None if force else getUpstreamSnapshot(source, generator)
+    def updateRDF(self, force=False):
+        generator = self.getGenerator()
         generatorPath = '/'.join(generator.getPhysicalPath())
-        # Adapt the generator to a graph generator, and get the graph in XML form.
-        generator = IGraphGenerator(generator)
-        graph = generator.generateGraph()
+        # Adapt the generator to a graph generator, and have it write RDF/XML.
+        graphGenerator = IGraphGenerator(generator)
+        upstream = getattr(graphGenerator, 'upstream', None)
+        if upstream is not None:
+            upstream.previous, upstream.previousSnapshot = self.previousUpstream(generator, force)
+            upstream.force = force
+        with recordRun(aq_inner(self.context), (NoUpdateRequired,)):
+            try:
+                output = generateRDF(graphGenerator)
+            except UpstreamUnchanged:
+                raise NoUpdateRequired(aq_inner(self.context))
+            if upstream is not None:
+                self.storeRDF(output, generatorPath, upstream.digests, upstream.snapshot)
+            else:
+                self.storeRDF(output, generatorPath)
+    def storeRDF(self, output, generatorPath, upstreamDigests=None, upstreamSnapshot=None):
+        context = aq_inner(self.context)
+        try:
+            self.replaceFile(output, generatorPath)
+        except NoUpdateRequired:
+            # The RDF didn't change even if the upstream data did; either way, we've handled that data
+            if upstreamDigests:
+                saveUpstreamDigests(context, context.generator.to_object, upstreamDigests, upstreamSnapshot)
+            raise
+        if upstreamDigests:
+            saveUpstreamDigests(context, context.generator.to_object, upstreamDigests, upstreamSnapshot)
+    def replaceFile(self, output, generatorPath):
+        count('rdfBytes', output.file.getSize())
+        with phase('compare'):
+            self.compare(output)
+        # ~~TODO~~ DONE: https://github.com/EDRN/CancerDataExpo/issues/6
+        with phase('prune'):
+            self.prune()
+        with phase('store'):
+            self.store(output, generatorPath)
+    def compare(self, output):
+        '''Raise ``NoUpdateRequired`` if ``output`` has the same statements as our approved file.'''
+        context = aq_inner(self.context)
+        rdfFile, fingerprint = output.file, output.fingerprint
         # Is there an active file?
         if context.approvedFile:
             # Is it identical to what we just generated?
             try:
-                current = Graph().parse(data=context.approvedFile.to_object.file.data, format='xml')
-                if isomorphic(graph, current):
+                current = context.approvedFile.to_object
+                stored = getFingerprint(current)
+                if fingerprint is not None and stored is not None:
+                    if fingerprint == stored:
+                        raise NoUpdateRequired(context)
+                elif isomorphic(
+                    Graph().parse(data=rdfFile.data, format='xml'), Graph().parse(data=current.file.data, format='xml')
+                ):
+                    # Files made before we had fingerprints get one now, so next time we can skip the parse
+                    if fingerprint is not None:
+                        setFingerprint(current, fingerprint)
                     raise NoUpdateRequired(context)
             except AttributeError:
                 # File not found
                 pass
-
-        # Create a new file and set it active
-        # TODO: Add validation steps here
-
-        # ~~TODO~~ DONE: https://github.com/EDRN/CancerDataExpo/issues/6
+    def prune(self):
+        '''Delete our oldest files, if there are too many.'''
+        context = aq_inner(self.context)
         catalog = plone.api.portal.get_tool('portal_catalog')
         contents = catalog(
             path={'query': '/'.join(context.getPhysicalPath()), 'depth': 1},
@@ -62,18 +173,37 @@ class RDFUpdater(object):
         toDelete = len(contents) - MAX_FILES
         if toDelete > 0:
             plone.api.content.delete(objects=[i.getObject() for i in contents[0:toDelete]])
-
-        serialized = graph.serialize(format='pretty-xml')
+    def store(self, output, generatorPath):
+        '''Make a new file of ``output`` and make it our approved file.'''
+        context = aq_inner(self.context)
+        rdfFile, fingerprint = output.file, output.fingerprint
+        previous = context.approvedFile.to_object if context.approvedFile else None
+        # TODO: Add validation steps here
         timestamp = datetime.datetime.utcnow().isoformat()
         fileID = str(uuid.uuid4())
+        rdfFile.filename = fileID + '.rdf'
         newFile = createContentInContainer(
             context,
             'File',
             id=fileID,
             title='RDF {}'.format(timestamp),
             description='Generated at {} by {}'.format(timestamp, generatorPath),
-            file=NamedBlobFile(serialized, filename=fileID + '.rdf', contentType=RDF_XML_MIMETYPE)
+            file=rdfFile
         )
+        if fingerprint is not None:
+            setFingerprint(newFile, fingerprint)
+        for mimeType, alternative in output.alternatives.items():
+            alternative.filename = fileID + '.' + ALTERNATIVES[mimeType][0]
+        setAlternatives(newFile, output.alternatives)
+        setContentHashes(newFile, output.hashes)
+        files = dict(output.alternatives)
+        files[RDF_XML_MIMETYPE] = rdfFile
+        encodings = compressFiles(files)
+        setEncodings(newFile, encodings)
+        count('storedBytes', sum([i.getSize() for i in files.values()]))
+        count('storedBytes', sum([i.getSize() for variants in encodings.values() for i in variants.values()]))
+        if previous is not None:
+            recordDelta(previous, newFile, output)
         newFile.reindexObject()
         intIDs = getUtility(IIntIds)
         newFileID = intIDs.getId(newFile)
@@ -4,10 +4,10 @@
 
 from . import _
 from .predicatehandler import ISimplePredicateHandler
+from .validation import uris
 from Acquisition import aq_inner
-from rfc3986_validator import validate_rfc3986
 from zope import schema
-import rdflib, logging
+import functools, rdflib, logging
 
 _logger = logging.getLogger(__name__)
 
@@ -21,23 +21,35 @@ class IReferencePredicateHandler(ISimplePredicateHandler):
     )
 
 
+def characterizeReference(predicateURI, uriPrefix, title, obj):
+    '''Characterize ``obj`` with ``predicateURI`` and a reference to ``uriPrefix`` plus each comma-separated
+    value; ``title`` names the handler in warnings.
+    '''
+    characterizations = []
+    for i in obj.split(', '):
+        i = i.strip()
+        if not i: continue
+        target = uriPrefix + i
+        valid, error, first = uris.check(target)
+        if valid is not None:
+            characterizations.append((predicateURI, rdflib.URIRef(target)))
+        elif first:
+            _logger.warning(
+                'Encountered an invalid URI «%s» for %s which will not be put into RDF', target, title
+            )
+
+    return characterizations
+
+
 class ReferenceAsserter(object):
     '''Describes subjects using predicates with complementary references to other objects.'''
     def __init__(self, context):
         self.context = context
+    def compile(self):
+        context = aq_inner(self.context)
+        return functools.partial(
+            characterizeReference, rdflib.URIRef(context.predicateURI), context.uriPrefix, context.title
+        )
     def characterize(self, obj):
         context = aq_inner(self.context)
-        characterizations = []
-        for i in obj.split(', '):
-            i = i.strip()
-            if not i: continue
-            target = context.uriPrefix + i
-            if validate_rfc3986(target):
-                characterizations.append((rdflib.URIRef(context.predicateURI), rdflib.URIRef(target)))
-            else:
-                _logger.warning(
-                    'Encountered an invalid URI «%s» for %s which will not be put into RDF', target,
-                    self.context.title
-                )
-
-        return characterizations
+        return characterizeReference(rdflib.URIRef(context.predicateURI), context.uriPrefix, context.title, obj)
@@ -8,11 +8,14 @@ sets of data available at the DMCC by accessing their web service.
 
 from edrn.rdf import _
 
+from .dmcccache import callDMCC
 from .exceptions import MissingParameterError
+from .instrumentation import tokenized
 from .interfaces import IAsserter
 from .rdfgenerator import IRDFGenerator
-from .utils import get_suds_client
-from .utils import parseTokens, splitDMCCRows
+from .sink import TripleGenerator
+from .upstream import UpstreamCheck
+from .utils import iterDMCCRows
 from .utils import validateAccessibleURL
 from Acquisition import aq_inner
 from rdflib.term import URIRef
@@ -44,6 +47,15 @@ class ISimpleDMCCRDFGenerator(IRDFGenerator):
         description=_('Utterly pointless and needless parameter to pass to the operation. A default will be used if unset.'),
         required=False,
     )
+    rawSOAP = schema.Bool(
+        title=_('Lightweight SOAP Client'),
+        description=_(
+            'Call the DMCC by posting SOAP envelopes directly and streaming the responses, which uses far less'
+            ' memory than the full SOAP library. Operations the lightweight client does not know use the full one.'
+        ),
+        required=False,
+        default=False,
+    )
     uriPrefix = schema.TextLine(
         title=_('URI Prefix'),
         description=_('The Uniform Resource Identifier prepended to all subjects described by this generator.'),
@@ -61,11 +73,46 @@ class ISimpleDMCCRDFGenerator(IRDFGenerator):
     )
 
 
-class SimpleDMCCGraphGenerator(object):
+def compilePlan(generator):
+    '''Compile the predicate handlers in ``generator`` into a plain mapping from token key to a function that
+    characterizes values of that key.
+    '''
+    return dict((item.title, IAsserter(item).compile()) for objID, item in generator.contentItems())
+
+
+def describeRows(horribleString, plan, identifyingKey, uriPrefix, typeURI, sink):
+    '''Describe each row in ``horribleString`` to ``sink`` according to the compiled ``plan``. Nothing here
+    touches a persistent object. Returns the sets of used and unused slots.
+    '''
+    unusedSlots, usedSlots = set(), set()
+    for row in iterDMCCRows(horribleString):
+        subjectURI, statements, statementsMade = None, [], False
+        for key, value in tokenized(row):
+            usedSlots.add(key)
+            if key == identifyingKey and not subjectURI:
+                subjectURI = URIRef(uriPrefix + value)
+            elif key in plan and len(value) > 0:
+                statements.extend(plan[key](value))
+                statementsMade = True
+            elif key not in plan:
+                unusedSlots.add(key)
+        # DMCC is giving out empty rows: they have an Identifier number, but no values in any of the columns.
+        # While we may wish to generate RDF for those (essentially just saying "Disease #31 exists", for example)
+        # It means we need to update EDRN Portal code to handle them, which we can't do right now.
+        # So just drop these.  TODO: Add them back, but update the EDRN Portal.
+        if statementsMade:
+            sink.add((subjectURI, rdflib.RDF.type, typeURI))
+            for predicate, obj in statements:
+                sink.add((subjectURI, predicate, obj))
+    return usedSlots, unusedSlots
+
+
+class SimpleDMCCGraphGenerator(TripleGenerator):
     '''A statement graph generator that produces statements based on the DMCC's web service.'''
     def __init__(self, context):
         self.context = context
-    def generateGraph(self):
+        self.upstream = UpstreamCheck(context)
+    def generateTriples(self, sink):
         context = aq_inner(self.context)
         if not context.webServiceURL: raise MissingParameterError(context, 'webServiceURL')
         if not context.operationName: raise MissingParameterError(context, 'operationName')
@@ -73,36 +120,17 @@ class SimpleDMCCGraphGenerator(object):
         if not context.uriPrefix: raise MissingParameterError(context, 'uriPrefix')
         if not context.typeURI: raise MissingParameterError(context, 'typeURI')
         verificationNum = context.verificationNum if context.verificationNum else DEFAULT_VERIFICATION_NUM
-        predicates = {}
-        unusedSlots = set()
-        usedSlots = set()
-        for objID, item in context.contentItems():
-            predicates[item.title] = IAsserter(item)
-        client = get_suds_client(context.webServiceURL, context)
-        function = getattr(client.service, context.operationName)
-        horribleString = function(verificationNum)
-        graph = rdflib.Graph()
-        for row in splitDMCCRows(horribleString):
-            subjectURI, statements, statementsMade = None, [], False
-            for key, value in parseTokens(row):
-                usedSlots.add(key)
-                if key == context.identifyingKey and not subjectURI:
-                    subjectURI = URIRef(context.uriPrefix + value)
-                elif key in predicates and len(value) > 0:
-                    statements.extend(predicates[key].characterize(value))
-                    statementsMade = True
-                elif key not in predicates:
-                    unusedSlots.add(key)
-            # DMCC is giving out empty rows: they have an Identifier number, but no values in any of the columns.
-            # While we may wish to generate RDF for those (essentially just saying "Disease #31 exists", for example)
-            # It means we need to update EDRN Portal code to handle them, which we can't do right now.
-            # So just drop these.  TODO: Add them back, but update the EDRN Portal.
-            if statementsMade:
-                graph.add((subjectURI, rdflib.RDF.type, URIRef(context.typeURI)))
-                for predicate, obj in statements:
-                    graph.add((subjectURI, predicate, obj))
+        plan = compilePlan(context)
+        horribleString = self.upstream.record(
+            context.operationName, callDMCC(
+                context.webServiceURL, context.operationName, verificationNum, getattr(context, 'rawSOAP', False)
+            )
+        )
+        self.upstream.verify()
+        usedSlots, unusedSlots = describeRows(
+            horribleString, plan, context.identifyingKey, context.uriPrefix, URIRef(context.typeURI), sink
+        )
         if unusedSlots:
             _logger.warning('For %s the following slots were unused: %s', '/'.join(context.getPhysicalPath()),
                 ', '.join(unusedSlots))
         _logger.info('And the used slots are %s', ', '.join(usedSlots))
-        return graph
@@ -0,0 +1,226 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Triple sinks. Graph generators used to build a whole ``rdflib.Graph`` only to have it serialized with
+the (slow) pretty-xml serializer. Now they can write their statements to a *sink* instead—anything with
+an ``add(triple)`` method—by implementing ``generateTriples(sink)``.
+
+An ``rdflib.Graph`` is itself a sink, which is how ``TripleGenerator.generateGraph`` keeps working for
+callers that want a graph. The ``SerializingSink``s are the others: they write RDF/XML, N-Triples,
+Turtle, or JSON-LD to a stream as the statements arrive, so the graph never has to exist in memory at all.
+'''
+
+from .fingerprint import FingerprintAccumulator
+from .instrumentation import currentRecord
+from .interfaces import IGraphGenerator
+from rdflib.namespace import RDF, split_uri
+from rdflib.term import BNode, Literal, URIRef
+from xml.sax.saxutils import escape, quoteattr
+from zope.interface import implementer
+import abc, json, rdflib
+
+
+@implementer(IGraphGenerator)
+class TripleGenerator(abc.ABC):
+    '''Base for graph generators that implement ``generateTriples``.'''
+    @abc.abstractmethod
+    def generateTriples(self, sink):
+        '''Add this generator's statements to ``sink``; see ``IGraphGenerator``.'''
+    def generateGraph(self):
+        '''Generate this object's RDF graph by collecting all the statements into one.'''
+        graph = rdflib.Graph()
+        self.generateTriples(graph)
+        return graph
+
+
+class SerializingSink(abc.ABC):
+    '''Base for sinks that serialize statements to a binary ``stream`` as they arrive. Statements
+    are written just once however often they arrive (see ``FingerprintAccumulator``), and the fingerprint
+    of everything written is available from ``fingerprint``. Any ``followers``—other serializing sinks—get each new statement too, so one pass
+    over the statements can make several serializations without each one weeding out repeats. During a
+    recorded update, the time spent writing counts as serializing.
+    '''
+    def __init__(self, stream, followers=()):
+        self.stream, self.followers = stream, list(followers)
+        self.accumulator, self.record = FingerprintAccumulator(), currentRecord()
+        self.begin()
+    def _write(self, text):
+        self.stream.write(text.encode('utf-8'))
+    def begin(self):
+        '''Write whatever comes before the statements.'''
+    @abc.abstractmethod
+    def write(self, triple):
+        '''Write ``triple``, which we know is new.'''
+    def end(self):
+        '''Write whatever comes after the statements.'''
+    def add(self, triple):
+        '''Write ``triple`` unless we've already written it.'''
+        if not self.accumulator.add(triple): return
+        record = self.record
+        if record is not None: record.enter('serialize')
+        self.write(triple)
+        for follower in self.followers:
+            follower.write(triple)
+        if record is not None: record.exit()
+    def close(self):
+        '''Finish the serialization, and those of any followers.'''
+        self.end()
+        for follower in self.followers:
+            follower.end()
+        if self.record is not None:
+            self.record.count('triples', len(self))
+    def __len__(self):
+        return len(self.accumulator)
+    @property
+    def fingerprint(self):
+        return self.accumulator.fingerprint()
+
+
+def _node(term):
+    if isinstance(term, BNode):
+        return 'rdf:nodeID=%s' % quoteattr(str(term))
+    return 'rdf:about=%s' % quoteattr(str(term))
+
+
+class RDFXMLWriter(SerializingSink):
+    '''Writes statements as flat RDF/XML. Consecutive statements about the same subject share an
+    ``rdf:Description``, which is the most we ever hold in memory.
+    '''
+    def begin(self):
+        self.prefixes = {str(RDF): 'rdf'}
+        self.subject, self.properties, self.namespaces = None, [], set()
+        self._write('<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF xmlns:rdf="%s">\n' % RDF)
+    def _flush(self):
+        if self.subject is None: return
+        # We can't know every namespace up front, so each description declares the ones it uses
+        declarations = ''.join([
+            ' xmlns:%s=%s' % (self.prefixes[namespace], quoteattr(namespace)) for namespace in sorted(self.namespaces)
+        ])
+        self._write('  <rdf:Description %s%s>\n' % (_node(self.subject), declarations))
+        self._write(''.join(self.properties))
+        self._write('  </rdf:Description>\n')
+        self.subject, self.properties, self.namespaces = None, [], set()
+    def _property(self, predicate):
+        namespace, localName = split_uri(predicate)
+        prefix = self.prefixes.get(namespace)
+        if prefix is None:
+            prefix = self.prefixes[namespace] = 'ns%d' % len(self.prefixes)
+        if prefix != 'rdf':
+            self.namespaces.add(namespace)
+        return prefix + ':' + localName
+    def write(self, triple):
+        subject, predicate, obj = triple
+        if subject != self.subject:
+            self._flush()
+            self.subject = subject
+        name = self._property(predicate)
+        if isinstance(obj, URIRef):
+            self.properties.append('    <%s rdf:resource=%s/>\n' % (name, quoteattr(str(obj))))
+        elif isinstance(obj, BNode):
+            self.properties.append('    <%s rdf:nodeID=%s/>\n' % (name, quoteattr(str(obj))))
+        else:
+            attributes = ''
+            if isinstance(obj, Literal) and obj.language:
+                attributes = ' xml:lang=%s' % quoteattr(obj.language)
+            elif isinstance(obj, Literal) and obj.datatype:
+                attributes = ' rdf:datatype=%s' % quoteattr(str(obj.datatype))
+            self.properties.append('    <%s%s>%s</%s>\n' % (name, attributes, escape(str(obj)), name))
+    def end(self):
+        self._flush()
+        self._write('</rdf:RDF>\n')
+
+
+_ntEscapes = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+
+def _ntTerm(term):
+    if isinstance(term, URIRef):
+        return '<%s>' % term
+    if isinstance(term, BNode):
+        return '_:%s' % term
+    text = '"%s"' % str(term).translate(_ntEscapes)
+    if isinstance(term, Literal) and term.language:
+        return '%s@%s' % (text, term.language)
+    if isinstance(term, Literal) and term.datatype:
+        return '%s^^<%s>' % (text, term.datatype)
+    return text
+
+
+def ntriplesLine(triple):
+    '''Give ``triple`` as a line of N-Triples, without the line ending.'''
+    return '%s %s %s .' % tuple(_ntTerm(term) for term in triple)
+
+
+class NTriplesWriter(SerializingSink):
+    '''Writes statements as N-Triples, one line apiece.'''
+    def write(self, triple):
+        self._write(ntriplesLine(triple) + '\n')
+
+
+class TurtleWriter(SerializingSink):
+    '''Writes statements as Turtle, with consecutive statements about the same subject sharing it.'''
+    def begin(self):
+        self.subject = None
+    def write(self, triple):
+        subject, predicate, obj = triple
+        if subject == self.subject:
+            self._write(' ;\n    %s %s' % (_ntTerm(predicate), _ntTerm(obj)))
+        else:
+            if self.subject is not None:
+                self._write(' .\n')
+            self._write('%s %s %s' % (_ntTerm(subject), _ntTerm(predicate), _ntTerm(obj)))
+            self.subject = subject
+    def end(self):
+        if self.subject is not None:
+            self._write(' .\n')
+
+
+def _jsonldNode(term):
+    return '_:' + term if isinstance(term, BNode) else str(term)
+
+
+class JSONLDWriter(SerializingSink):
+    '''Writes statements as expanded JSON-LD: an array with a node object for each run of statements
+    about the same subject.
+    '''
+    def begin(self):
+        self.node, self.separator = None, ''
+        self._write('[')
+    def _flush(self):
+        if self.node is None: return
+        self._write(self.separator + '\n' + json.dumps(self.node, ensure_ascii=False))
+        self.node, self.separator = None, ','
+    def write(self, triple):
+        subject, predicate, obj = triple
+        if self.node is None or self.node['@id'] != _jsonldNode(subject):
+            self._flush()
+            self.node = {'@id': _jsonldNode(subject)}
+        if isinstance(obj, (URIRef, BNode)):
+            value = {'@id': _jsonldNode(obj)}
+        else:
+            value = {'@value': str(obj)}
+            if isinstance(obj, Literal) and obj.language:
+                value['@language'] = obj.language
+            elif isinstance(obj, Literal) and obj.datatype:
+                value['@type'] = str(obj.datatype)
+        self.node.setdefault(str(predicate), []).append(value)
+    def end(self):
+        self._flush()
+        self._write('\n]\n')
+
+
+def writeRDF(graphGenerator, stream, followers=()):
+    '''Have ``graphGenerator`` write its statements as RDF/XML to the binary ``stream``, and to any other
+    serializing sinks in ``followers``, returning the ``RDFXMLWriter`` used. Generators that only know how
+    to ``generateGraph`` still work; they just don't save any memory.
+    '''
+    writer = RDFXMLWriter(stream, followers)
+    generateTriples = getattr(graphGenerator, 'generateTriples', None)
+    if generateTriples is not None:
+        generateTriples(writer)
+    else:
+        for triple in graphGenerator.generateGraph():
+            writer.add(triple)
+    writer.close()
+    return writer
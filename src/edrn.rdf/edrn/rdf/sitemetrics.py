@@ -0,0 +1,14 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+from .metrics import EXPOSITION_MIMETYPE, REGISTRY
+from Products.Five import BrowserView
+
+
+class SiteMetrics(BrowserView):
+    '''Every metric in ``edrn.rdf.metrics`` in Prometheus's text exposition format, for scraping.'''
+    def __call__(self):
+        self.request.response.setHeader('Content-Type', EXPOSITION_MIMETYPE)
+        self.request.response.setHeader('Cache-Control', 'no-cache')
+        return REGISTRY.exposition()
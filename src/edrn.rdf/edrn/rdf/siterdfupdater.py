@@ -2,42 +2,158 @@
 # Copyright 2012 California Institute of Technology. ALL RIGHTS
 # RESERVED. U.S. Government Sponsorship acknowledged.
 
-from .exceptions import SourceNotActive, NoUpdateRequired
+from .dmcccache import dmccRun, inRun
+from .exceptions import SourceNotActive, NoUpdateRequired, UpstreamUnchanged
+from .instrumentation import PHASES, RunRecord, getRunRecords, processPeakMemory, recordRun, recording
+from .jobs import enqueue, runJob
 from .notifications import notify_update_failures
-from edrn.rdf.interfaces import IRDFUpdater
+from .validation import validationStats
+from concurrent.futures import ThreadPoolExecutor
+from edrn.rdf.interfaces import IGraphGenerator, IJobRunner, IRDFUpdater
 from edrn.rdf.rdfsource import IRDFSource
+from edrn.rdf.rdfupdater import generateRDF
 from plone.protect.interfaces import IDisableCSRFProtection
+from plone.registry.interfaces import IRegistry
 from Products.CMFCore.utils import getToolByName
 from Products.Five import BrowserView
-from zope.interface import alsoProvides
-import logging
+from zope.component import getUtility
+from zope.interface import alsoProvides, implementer
+import logging, plone.api, transaction
 
 _logger = logging.getLogger('edrn.rdf')
 
 
+def _generateRDF(db, generatorPath, previousDigests, previousSnapshot, force, record):
+    '''Generate RDF from the generator at ``generatorPath``, returning the ``RDFOutput`` and the digests of
+    its upstream data, unless they match ``previousDigests``, plus the snapshot it left of that data, if
+    any, and noting timings in ``record``. This runs in a worker thread, so it opens its own connection to
+    the ZODB ``db`` rather than sharing the caller's.
+    '''
+    connection = db.open()
+    try:
+        generator = connection.root()['Application'].unrestrictedTraverse(generatorPath)
+        graphGenerator = IGraphGenerator(generator)
+        upstream = getattr(graphGenerator, 'upstream', None)
+        if upstream is not None:
+            upstream.previous, upstream.force, upstream.previousSnapshot = previousDigests, force, previousSnapshot
+        with recording(record):
+            output = generateRDF(graphGenerator)
+        if upstream is None:
+            return output, None, None
+        return output, upstream.digests, upstream.snapshot
+    finally:
+        transaction.abort()
+        connection.close()
+
+
+_quiet = (SourceNotActive, NoUpdateRequired, UpstreamUnchanged)
+
+
+def _updateSequentially(results, force, progress):
+    for i in results:
+        source = i.getObject()
+        updater = IRDFUpdater(source)
+        try:
+            updater.updateRDF(force)
+            progress.updated(i)
+        except _quiet as ex:
+            progress.skipped(i, ex)
+        except Exception as ex:
+            progress.failed(i, source, ex)
+
+
+def _updateConcurrently(db, results, threads, force, progress):
+    # Generate RDF for every source in a pool of ``threads`` threads, but store the results on this
+    # thread so all the ZODB writes happen in its transaction
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        jobs = []
+        for i in results:
+            source = i.getObject()
+            updater = IRDFUpdater(source)
+            try:
+                generator = updater.getGenerator()
+            except _quiet as ex:
+                progress.skipped(i, ex)
+                continue
+            except Exception as ex:
+                progress.failed(i, source, ex)
+                continue
+            generatorPath = '/'.join(generator.getPhysicalPath())
+            # Just as when updating sequentially, a source that's lost its file must get a new one
+            previousDigests, previousSnapshot = updater.previousUpstream(generator, force)
+            # The worker fills in the record; we finish it here once the RDF's stored
+            record = RunRecord()
+            # Workers are part of this run, so they share its DMCC results
+            future = executor.submit(
+                inRun(_generateRDF), db, generatorPath, previousDigests, previousSnapshot, force, record
+            )
+            jobs.append((i, source, updater, generatorPath, record, future))
+        for i, source, updater, generatorPath, record, future in jobs:
+            try:
+                with recordRun(source, _quiet, record):
+                    output, upstreamDigests, upstreamSnapshot = future.result()
+                    updater.storeRDF(output, generatorPath, upstreamDigests, upstreamSnapshot)
+                progress.updated(i)
+            except _quiet as ex:
+                progress.skipped(i, ex)
+            except Exception as ex:
+                progress.failed(i, source, ex)
+
+
+@implementer(IJobRunner)
+class RDFJobRunner(object):
+    '''Runs jobs that update RDF sources.'''
+    def sources(self, site):
+        catalog = getToolByName(site, 'portal_catalog')
+        return catalog(object_provides=IRDFSource.__identifier__)
+    def run(self, site, results, force, progress):
+        threads = getUtility(IRegistry).get('edrn.rdf.update.threads') or 1
+        # Generators that share DMCC operations fetch each of them just once per run
+        with dmccRun() as cache:
+            if threads > 1:
+                _updateConcurrently(site._p_jar.db(), results, threads, force, progress)
+            else:
+                _updateSequentially(results, force, progress)
+            cacheStats = cache.stats()
+        _logger.info('DMCC response cache: %(hits)d hits, %(misses)d misses, %(bytesSaved)d bytes saved', cacheStats)
+        for name, stats in validationStats().items():
+            _logger.info(
+                'Validation cache for %s since startup: %d hits, %d misses, about %.2f seconds saved', name,
+                stats['hits'], stats['misses'], stats['secondsSaved']
+            )
+        _logger.info('Peak memory of this process so far: %d bytes', processPeakMemory())
+        notify_update_failures(site, progress.failures)
+        return cacheStats
+
+
 class SiteRDFUpdater(BrowserView):
-    '''A "view" that instructs all RDF sources to generate fresh RDF.'''
+    '''A "view" that queues a job to have all RDF sources generate fresh RDF. With ``?wait=1``, it runs
+    the job right away and reports how it went.'''
+    phases = PHASES
     def render(self):
         return self.index()
 
+    def runRecords(self, site):
+        '''Give the title, URL, and latest run record of each source this job updated.'''
+        records = []
+        for brain in getUtility(IJobRunner, name='rdf').sources(site):
+            latest = getRunRecords(brain.getObject())[-1:]
+            if latest and latest[0]['started'] >= self.job.started:
+                records.append(dict(title=brain.Title, url=brain.getURL(), record=latest[0]))
+        return records
+
     def __call__(self):
         alsoProvides(self.request, IDisableCSRFProtection)
         self.request.set('disable_border', True)
-        catalog = getToolByName(self.context, 'portal_catalog')
-        results = catalog(object_provides=IRDFSource.__identifier__)
-        self.count, self.failures = 0, []
-        for i in results:
-            source = i.getObject()
-            updater = IRDFUpdater(source)
-            try:
-                updater.updateRDF()
-                self.count += 1
-            except (SourceNotActive, NoUpdateRequired) as ex:
-                _logger.info('Ignoring exception "%s" on "%s"', ex, '/'.join(source.getPhysicalPath()))
-            except Exception as ex:
-                _logger.exception('Failure updating RDF for "%s"', '/'.join(source.getPhysicalPath()))
-                self.failures.append(dict(title=i.Title, url=source.absolute_url(), message=str(ex)))
+        site = plone.api.portal.get()
+        # Use ?force=1 after changing generator code to rebuild graphs even if upstream data hasn't changed
+        self.job = enqueue(site, 'rdf', force=bool(self.request.form.get('force')))
+        self.finished = bool(self.request.form.get('wait'))
+        if self.finished:
+            runJob(site, self.job)
+        self.count, self.failures, self.cacheStats = self.job.count, list(self.job.failures), self.job.stats
         self.numFailed = len(self.failures)
-        if self.numFailed > 0:
-            notify_update_failures(self.context, self.failures)
+        self.records = self.runRecords(site) if self.finished else []
+        self.processPeakMemory = processPeakMemory()
+        self.request.response.setHeader('X-EDRN-Update-Job', self.job.jobID)
         return self.render()
@@ -0,0 +1,116 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Pooled SOAP transport. suds's own transport uses urllib, which makes a new connection—and for https,
+a new TLS handshake—for every call, and never asks for compression. A full update makes more than
+fifteen calls to the DMCC, so ``PooledTransport`` keeps connections alive in a pool shared by the whole
+process, asks for gzip-compressed responses, gives each operation its own connect and read timeouts,
+and retries calls that can't connect or that the server's too busy to answer, backing off in between.
+SOAP calls that time out reading a response aren't retried, though.
+
+Only http and https go through the pool. Other schemes—``file``, and ``testscheme`` during tests—and
+proxied requests go through urllib just as before.
+'''
+
+from .metrics import counter
+from suds.transport import Reply, TransportError
+from suds.transport.https import HttpAuthenticated
+import http.client, io, logging, threading, urllib.error, urllib.parse, urllib3
+
+_logger = logging.getLogger(__name__)
+_requests = counter('edrn_soap_requests_total', 'HTTP requests made by the pooled SOAP transport', ('method', 'status'))
+
+DEFAULT_TIMEOUT = (10.0, 90.0)  # Seconds to connect and to read a response
+OPERATION_TIMEOUTS = {          # Operations whose large responses take the DMCC a while to make
+    'EDRN_Protocol':                        (10.0, 300.0),
+    'Protocol_Registered_Person_Specifics': (10.0, 300.0),
+    'Publication':                          (10.0, 300.0),
+    'Registered_Person':                    (10.0, 300.0),
+}
+RETRIES = 3          # Attempts after the first
+BACKOFF = 0.5        # Seconds before the first retry, doubling for each one after
+RETRY_STATUSES = (502, 503, 504)
+POOL_SIZE = 8        # Connections kept alive to each host; the protocol generator makes four calls at once
+ACCEPT_ENCODING = 'gzip, deflate'
+
+_pool, _poolLock = None, threading.Lock()
+
+
+def getPool():
+    '''Give the process-wide connection pool, making it the first time.'''
+    global _pool
+    with _poolLock:
+        if _pool is None:
+            _pool = urllib3.PoolManager(num_pools=4, maxsize=POOL_SIZE, block=False)
+        return _pool
+
+
+def operationOf(headers):
+    '''Give the name of the SOAP operation named by the SOAPAction in ``headers``, or None.'''
+    action = headers.get('SOAPAction', '')
+    if isinstance(action, bytes):  # As suds makes it
+        action = action.decode('utf-8')
+    action = action.strip('"').rstrip('/')
+    return action.rsplit('/', 1)[-1] or None
+
+
+def pooledRequest(method, url, body, headers, preload=True):
+    '''Make an http or https request through the pool, with the timeouts for the operation named in
+    ``headers`` and retries, asking for a compressed response. With ``preload`` false, the response body
+    is left to be streamed, and the caller must ``release_conn`` the response when done.'''
+    headers = dict(headers)
+    headers['Accept-Encoding'] = ACCEPT_ENCODING
+    connect, read = OPERATION_TIMEOUTS.get(operationOf(headers), DEFAULT_TIMEOUT)
+    retries = urllib3.Retry(
+        total=RETRIES, backoff_factor=BACKOFF, status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,  # DMCC operations only read, so POSTs are as safe to repeat as GETs
+        # But a POST that timed out reading may still be running at the DMCC, and trying it again just
+        # piles another on—and waits out another read timeout—so POSTs only retry if they couldn't connect
+        read=0 if method == 'POST' else None,
+        raise_on_status=False
+    )
+    try:
+        response = getPool().request(
+            method, url, body=body, headers=headers, retries=retries,
+            timeout=urllib3.Timeout(connect=connect, read=read), preload_content=preload
+        )
+    except urllib3.exceptions.HTTPError as ex:
+        # Fail the way urllib did so callers needn't know which transport they got
+        _requests.inc(method=method, status='error')
+        raise urllib.error.URLError(getattr(ex, 'reason', None) or ex)
+    _requests.inc(method=method, status=response.status)
+    history = response.retries.history if response.retries else ()
+    if history:
+        _logger.info('%s %s took %d retries', method, url, len(history))
+    return response
+
+
+class PooledTransport(HttpAuthenticated):
+    '''A suds transport that sends http and https requests through the process-wide pool of kept-alive
+    connections. It carries no per-call state of its own, so clones of a client can each have one.'''
+    def pooled(self, request):
+        return urllib.parse.urlparse(request.url).scheme in ('http', 'https') and not self.options.proxy
+    def open(self, request):
+        if not self.pooled(request):
+            return super(PooledTransport, self).open(request)
+        response = self._request('GET', request, None)
+        if response.status != http.client.OK:
+            raise TransportError(response.reason, response.status, io.BytesIO(response.data))
+        return io.BytesIO(response.data)
+    def send(self, request):
+        if not self.pooled(request):
+            return super(PooledTransport, self).send(request)
+        response = self._request('POST', request, request.message)
+        if response.status in (http.client.ACCEPTED, http.client.NO_CONTENT):
+            return None
+        if response.status != http.client.OK:
+            # suds reads any SOAP fault from the body
+            raise TransportError(response.reason, response.status, io.BytesIO(response.data))
+        return Reply(http.client.OK, dict(response.headers), response.data)
+    def _request(self, method, request, body):
+        headers = dict(request.headers)
+        username, password = self.credentials()
+        if username is not None and password is not None:
+            headers.update(urllib3.make_headers(basic_auth='%s:%s' % (username, password)))
+        return pooledRequest(method, request.url, body, headers)
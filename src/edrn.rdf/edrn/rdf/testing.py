@@ -5,8 +5,11 @@
 from plone.app.testing import PloneSandboxLayer, IntegrationTesting, FunctionalTesting, PLONE_FIXTURE
 from plone.testing import z2
 from suds.transport.http import HttpTransport
-from suds.cache import ObjectCache
-import pkg_resources, urllib, http
+from .wsdlcache import WSDL_CACHE
+import pkg_resources, urllib, http, os, shutil, tempfile
+
+# Update jobs run when tests ask for them, not in worker threads racing the tests
+os.environ['EDRN_RDF_JOB_THREADS'] = '0'
 
 
 class TestSchemeHandler(urllib.request.BaseHandler):
@@ -50,10 +53,6 @@ def monkeyedU2handlers(self):
     return handlers
 
 
-def monkeyedObjectCacheGetter(self, id):
-    return None
-
-
 class EDRN_RDF_Layer(PloneSandboxLayer):
     defaultBases = (PLONE_FIXTURE,)
     def setUpZope(self, app, configurationContext):
@@ -62,12 +61,16 @@ class EDRN_RDF_Layer(PloneSandboxLayer):
         urllib.request.install_opener(urllib.request.build_opener(TestSchemeHandler))
         # suds doesn't use the global openers, so monkey-patch it to include our testscheme handler
         HttpTransport.u2handlers = monkeyedU2handlers
-        # don't let suds cache anything in /tmp
-        ObjectCache.get = monkeyedObjectCacheGetter
+        # keep parsed WSDL somewhere of our own, starting empty
+        self.wsdlLocation, WSDL_CACHE.location = WSDL_CACHE.location, tempfile.mkdtemp()
+        WSDL_CACHE.clear()
     def setUpPloneSite(self, portal):
         self.applyProfile(portal, 'edrn.rdf:default')
     def tearDownZope(self, app):
         z2.uninstallProduct(app, 'edrn.rdf')
+        WSDL_CACHE.clear()
+        shutil.rmtree(WSDL_CACHE.location, ignore_errors=True)
+        WSDL_CACHE.location = self.wsdlLocation
 
 
 EDRN_RDF = EDRN_RDF_Layer()
@@ -0,0 +1,120 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — BioMuta row tests'''
+
+import unittest, csv, hashlib, io, pkg_resources, rdflib
+from unittest import mock
+from edrn.rdf import biomutardfgenerator
+from edrn.rdf.biomuta import compileColumns, describeRows, predicatesFor
+from edrn.rdf.biomutardfgenerator import BiomutaGraphGenerator
+from edrn.rdf.exceptions import UpstreamUnchanged
+
+
+_fields = {'GeneName': 'geneNamePredicateURI', 'UniProtAC': 'uniProtACPredicateURI', '#PMID': 'pmidCountPredicateURI'}
+_typeURI = rdflib.URIRef('urn:edrn:types:biomuta')
+
+
+class _Generator(object):
+    uriPrefix = 'urn:edrn:biomuta:'
+    geneNamePredicateURI = 'urn:edrn:predicates:geneName'
+    uniProtACPredicateURI = 'urn:edrn:predicates:uniProtAC'
+    pmidCountPredicateURI = 'urn:edrn:predicates:pmidCount'
+
+
+class _ListSink(list):
+    def add(self, triple):
+        self.append(triple)
+
+
+class BiomutaTest(unittest.TestCase):
+    '''Unit test of describing BioMuta rows'''
+    def setUp(self):
+        self.predicates = predicatesFor(_Generator(), _fields)
+    def testCompile(self):
+        '''Check the header turns into one predicate per column, and unknown columns aren't allowed'''
+        columns = compileColumns(['#PMID', 'GeneName'], self.predicates)
+        self.assertEquals([rdflib.URIRef(_Generator.pmidCountPredicateURI), rdflib.URIRef(_Generator.geneNamePredicateURI)], columns)
+        self.assertRaises(KeyError, compileColumns, ['GeneName', 'Mystery'], self.predicates)
+    def testRows(self):
+        '''See if each row describes its gene with a literal for every column'''
+        rows = csv.reader(io.StringIO('GeneName,UniProtAC,#PMID\nCCDC47 ,Q96A33,8\nACRV1,P26436,8\n'))
+        sink = _ListSink()
+        self.assertEquals(2, describeRows(rows, self.predicates, _Generator.uriPrefix, _typeURI, sink))
+        subject = rdflib.URIRef('urn:edrn:biomuta:CCDC47')
+        self.assertEquals([
+            (subject, rdflib.RDF.type, _typeURI),
+            (subject, rdflib.URIRef(_Generator.geneNamePredicateURI), rdflib.Literal('CCDC47')),
+            (subject, rdflib.URIRef(_Generator.uniProtACPredicateURI), rdflib.Literal('Q96A33')),
+            (subject, rdflib.URIRef(_Generator.pmidCountPredicateURI), rdflib.Literal('8')),
+        ], sink[:4])
+        self.assertTrue(sink[3][2] is sink[7][2])  # Repeated values share a literal
+        self.assertEquals(0, describeRows([], self.predicates, _Generator.uriPrefix, _typeURI, sink))
+    def testFixture(self):
+        '''Make sure the whole fixture comes out as it did when every cell was looked up on its own'''
+        predicates = dict((column, 'urn:edrn:predicates:' + column.strip('#')) for column in (
+            'GeneName', 'UniProtAC', '#mutated_site', '#PMID', '#CancerDO', '#AffectedProtFunSite'
+        ))
+        with open(pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/Biomuta.tsv'), 'rb') as f:
+            data = f.read().decode('utf-8')
+        expected, header = rdflib.Graph(), None
+        for row in csv.reader(io.StringIO(data)):
+            if header is None:
+                header = row
+                continue
+            subject = rdflib.URIRef(_Generator.uriPrefix + row[0].strip())
+            expected.add((subject, rdflib.RDF.type, _typeURI))
+            for index, column in enumerate(header):
+                expected.add((subject, rdflib.URIRef(predicates[column]), rdflib.Literal(row[index].strip())))
+        graph = rdflib.Graph()
+        describeRows(csv.reader(io.StringIO(data)), predicates, _Generator.uriPrefix, _typeURI, graph)
+        self.assertEquals(set(expected), set(graph))
+
+
+class _Context(object):
+    '''Stands in for a BioMuta RDF generator; every predicate is a URI named for its field.'''
+    webServiceURL, uriPrefix, typeURI = 'http://biomuta.example.com/', 'urn:edrn:biomuta:', str(_typeURI)
+    def __getattr__(self, name):
+        return 'urn:edrn:predicates:' + name
+    def getPhysicalPath(self):
+        return ('', 'site', 'biomuta')
+
+
+class GeneratorTest(unittest.TestCase):
+    '''Unit test of the BioMuta RDF generator'''
+    def setUp(self):
+        with open(pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/Biomuta.tsv'), 'rb') as f:
+            self.data = f.read()
+        for patcher in (
+            mock.patch.object(biomutardfgenerator, 'urlopen', lambda url: io.BytesIO(self.data)),
+            mock.patch.object(biomutardfgenerator, 'aq_inner', lambda obj: obj),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.generator = BiomutaGraphGenerator(_Context())
+    def testStreaming(self):
+        '''See if rows described as they stream in make the same statements, and the same digest, as the
+        whole payload read at once'''
+        sink, expected = _ListSink(), _ListSink()
+        self.generator.generateTriples(sink)
+        predicates = predicatesFor(_Context(), biomutardfgenerator._biomutaPredicates)
+        describeRows(
+            csv.reader(io.StringIO(self.data.decode('utf-8'))), predicates, _Context.uriPrefix, _typeURI, expected
+        )
+        self.assertEquals(expected, sink)
+        self.assertEquals(
+            {_Context.webServiceURL: hashlib.sha256(self.data).hexdigest()}, self.generator.upstream.digests
+        )
+    def testUnchanged(self):
+        '''Check that an unchanged payload is still caught, once it's been read'''
+        self.generator.upstream.previous = {_Context.webServiceURL: hashlib.sha256(self.data).hexdigest()}
+        self.assertRaises(UpstreamUnchanged, self.generator.generateTriples, _ListSink())
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
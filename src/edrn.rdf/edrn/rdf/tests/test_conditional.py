@@ -0,0 +1,93 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — conditional and range request tests'''
+
+import unittest, hashlib, io
+from edrn.rdf.conditional import HashingStream, byteRange, chooseEncoding, httpDate, isNotModified
+
+
+_etag, _modified = '"abc123"', 1700000000.0
+
+
+class IsNotModifiedTest(unittest.TestCase):
+    '''Unit test of conditional GET handling'''
+    def testEntityTags(self):
+        '''Check If-None-Match against the entity tag'''
+        self.assertTrue(isNotModified(_etag, None, _etag, _modified))
+        self.assertTrue(isNotModified('"zzz", W/"abc123"', None, _etag, _modified))
+        self.assertTrue(isNotModified('*', None, _etag, _modified))
+        self.assertFalse(isNotModified('"zzz"', None, _etag, _modified))
+    def testDates(self):
+        '''See if If-Modified-Since compares to the second'''
+        self.assertTrue(isNotModified(None, httpDate(_modified), _etag, _modified + 0.5))
+        self.assertFalse(isNotModified(None, httpDate(_modified - 1), _etag, _modified))
+        self.assertFalse(isNotModified(None, 'not a date', _etag, _modified))
+    def testPrecedence(self):
+        '''Make sure If-None-Match wins over If-Modified-Since'''
+        self.assertFalse(isNotModified('"zzz"', httpDate(_modified), _etag, _modified))
+        self.assertFalse(isNotModified(None, None, _etag, _modified))
+
+
+class ByteRangeTest(unittest.TestCase):
+    '''Unit test of Range header handling'''
+    def testRanges(self):
+        '''Check the single byte ranges we serve'''
+        self.assertEquals((0, 100), byteRange('bytes=0-99', None, 1000, _etag, _modified))
+        self.assertEquals((900, 1000), byteRange('bytes=900-', None, 1000, _etag, _modified))
+        self.assertEquals((950, 1000), byteRange('bytes=-50', None, 1000, _etag, _modified))
+        self.assertEquals((990, 1000), byteRange('bytes=990-2000', None, 1000, _etag, _modified))
+        self.assertEquals((0, 1000), byteRange('bytes=-5000', None, 1000, _etag, _modified))
+    def testWholeFile(self):
+        '''Ensure requests we don't understand get the whole file'''
+        for header in (None, '', 'lines=1-2', 'bytes=0-1,5-6', 'bytes=abc', 'bytes=5-2', 'bytes=-'):
+            self.assertIsNone(byteRange(header, None, 1000, _etag, _modified))
+    def testUnsatisfiable(self):
+        '''Confirm ranges past the end can't be satisfied'''
+        self.assertRaises(ValueError, byteRange, 'bytes=1000-', None, 1000, _etag, _modified)
+        self.assertRaises(ValueError, byteRange, 'bytes=-0', None, 1000, _etag, _modified)
+    def testIfRange(self):
+        '''See if a stale If-Range gets the whole file'''
+        self.assertEquals((0, 10), byteRange('bytes=0-9', _etag, 1000, _etag, _modified))
+        self.assertIsNone(byteRange('bytes=0-9', '"zzz"', 1000, _etag, _modified))
+        self.assertEquals((0, 10), byteRange('bytes=0-9', httpDate(_modified), 1000, _etag, _modified))
+        self.assertIsNone(byteRange('bytes=0-9', httpDate(_modified - 60), 1000, _etag, _modified))
+
+
+class ChooseEncodingTest(unittest.TestCase):
+    '''Unit test of picking a compressed variant'''
+    def testPreference(self):
+        '''Check we send our preferred coding when the client's indifferent'''
+        self.assertEquals('br', chooseEncoding('gzip, deflate, br', ['br', 'gzip']))
+        self.assertEquals('gzip', chooseEncoding('gzip, deflate, br', ['gzip']))
+        self.assertEquals('gzip', chooseEncoding('br;q=0.5, gzip', ['br', 'gzip']))
+        self.assertEquals('br', chooseEncoding('*', ['br', 'gzip']))
+        self.assertEquals('gzip', chooseEncoding('x-gzip', ['br', 'gzip']))
+    def testIdentity(self):
+        '''See if we send the file as is when we should'''
+        self.assertIsNone(chooseEncoding(None, ['br', 'gzip']))
+        self.assertIsNone(chooseEncoding('deflate', ['br', 'gzip']))
+        self.assertIsNone(chooseEncoding('gzip', []))
+        self.assertIsNone(chooseEncoding('gzip;q=0, br;q=0', ['br', 'gzip']))
+        self.assertIsNone(chooseEncoding('identity, gzip;q=0.5', ['gzip']))
+
+
+class HashingStreamTest(unittest.TestCase):
+    '''Unit test of hashing while writing'''
+    def testHash(self):
+        '''Check the hash matches what was written'''
+        stream = io.BytesIO()
+        hashing = HashingStream(stream)
+        hashing.write(b'<rdf:RDF>')
+        hashing.write(b'</rdf:RDF>')
+        self.assertEquals(hashlib.sha256(b'<rdf:RDF></rdf:RDF>').hexdigest(), hashing.hexdigest())
+        self.assertEquals(b'<rdf:RDF></rdf:RDF>', stream.getvalue())
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,60 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — RDF delta tests'''
+
+import unittest, io, rdflib
+from edrn.rdf.delta import composeDeltas, diffStatements, rdfXMLStatementLines, statementLines, writePatch
+from edrn.rdf.exceptions import DeltaUnavailable
+from edrn.rdf.sink import NTriplesWriter, ntriplesLine
+
+
+_a, _b, _c, _d = ['<urn:edrn:s> <urn:edrn:p> "%s" .' % i for i in 'abcd']
+
+
+class DeltaTest(unittest.TestCase):
+    '''Unit test of RDF deltas'''
+    def testDiff(self):
+        '''Check the lines added and removed between versions'''
+        self.assertEquals(([_c], [_a]), diffStatements({_a, _b}, {_b, _c}))
+        self.assertEquals(([], []), diffStatements({_a}, {_a}))
+    def testCompose(self):
+        '''See if a chain of deltas composes, with changes that undo each other cancelling out'''
+        deltas = {
+            'v2': ('v1', [_b], [_a]),      # {a} → {b}
+            'v3': ('v2', [_a, _c], [_b]),  # {b} → {a, c}
+            'v4': ('v3', [_d], [_c]),      # {a, c} → {a, d}
+        }
+        self.assertEquals(([_d], []), composeDeltas('v4', deltas.get, 'v1'))
+        self.assertEquals(([_a, _d], [_b]), composeDeltas('v4', deltas.get, 'v2'))
+        self.assertEquals(([], []), composeDeltas('v4', deltas.get, 'v4'))
+        self.assertRaises(DeltaUnavailable, composeDeltas, 'v4', deltas.get, 'v0')
+    def testStatementLines(self):
+        '''Make sure N-Triples we write and RDF/XML we parse give the same lines'''
+        triple = (rdflib.URIRef('urn:edrn:s'), rdflib.URIRef('urn:edrn:p'), rdflib.Literal('Two\nlines'))
+        stream = io.BytesIO()
+        writer = NTriplesWriter(stream)
+        writer.add(triple)
+        writer.close()
+        graph = rdflib.Graph()
+        graph.add(triple)
+        self.assertEquals({ntriplesLine(triple)}, statementLines(stream.getvalue()))
+        self.assertEquals({ntriplesLine(triple)}, rdfXMLStatementLines(graph.serialize(format='xml')))
+        graph.add((rdflib.BNode(), rdflib.URIRef('urn:edrn:p'), rdflib.Literal('Anonymous')))
+        self.assertIsNone(rdfXMLStatementLines(graph.serialize(format='xml')))
+    def testPatch(self):
+        '''Confirm the RDF Patch deletes, then adds'''
+        stream = io.BytesIO()
+        writePatch(stream, 'new', 'old', [_b], [_a])
+        self.assertEquals([
+            'H id <urn:uuid:new> .', 'H prev <urn:uuid:old> .', 'TX .', 'D ' + _a, 'A ' + _b, 'TC .'
+        ], stream.getvalue().decode('utf-8').splitlines())
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
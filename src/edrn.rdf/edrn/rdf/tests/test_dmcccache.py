@@ -0,0 +1,80 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — DMCC response cache tests'''
+
+import unittest, threading
+from concurrent.futures import ThreadPoolExecutor
+from edrn.rdf import dmcccache
+
+
+class DMCCResponseCacheTest(unittest.TestCase):
+    '''Unit test of the run-scoped DMCC response cache'''
+    def setUp(self):
+        self.calls = []
+    def fetcher(self, result):
+        def fetch():
+            self.calls.append(result)
+            return result
+        return fetch
+    def testReuse(self):
+        '''See if a key is fetched just once and repeat requests count as hits'''
+        cache = dmcccache.DMCCResponseCache()
+        self.assertEquals('<a>1</a>', cache.get(('url', 'Op', '0'), self.fetcher('<a>1</a>')))
+        self.assertEquals('<a>1</a>', cache.get(('url', 'Op', '0'), self.fetcher('<a>2</a>')))
+        self.assertEquals('<b>3</b>', cache.get(('url', 'Other', '0'), self.fetcher('<b>3</b>')))
+        self.assertEquals(['<a>1</a>', '<b>3</b>'], self.calls)
+        self.assertEquals(dict(entries=2, hits=1, misses=2, bytesSaved=8), cache.stats())
+    def testFailures(self):
+        '''Make sure failed fetches aren't cached'''
+        cache = dmcccache.DMCCResponseCache()
+        def fail():
+            raise IOError('DMCC is down again')
+        with self.assertRaises(IOError):
+            cache.get(('url', 'Op', '0'), fail)
+        self.assertEquals('<a>1</a>', cache.get(('url', 'Op', '0'), self.fetcher('<a>1</a>')))
+        self.assertEquals(2, cache.stats()['misses'])
+    def testRunScope(self):
+        '''Check that a run within a run shares its cache, and the cache goes away when the run ends'''
+        self.assertIsNone(dmcccache._current.get())
+        with dmcccache.dmccRun() as outer:
+            with dmcccache.dmccRun() as inner:
+                self.assertIs(outer, inner)
+            self.assertIs(outer, dmcccache._current.get())
+        self.assertIsNone(dmcccache._current.get())
+    def testSeparateRuns(self):
+        '''See if overlapping runs in other threads get caches of their own, and other threads get none'''
+        caches, started, finish = [], threading.Barrier(2), threading.Event()
+        def run():
+            with dmcccache.dmccRun() as cache:
+                caches.append(cache)
+                started.wait()
+                finish.wait()
+        thread = threading.Thread(target=run)
+        thread.start()
+        with dmcccache.dmccRun() as cache:
+            started.wait()
+            self.assertIsNot(cache, caches[0])
+        outside = []
+        other = threading.Thread(target=lambda: outside.append(dmcccache._current.get()))
+        other.start()
+        other.join()
+        finish.set()
+        thread.join()
+        self.assertEquals([None], outside)
+    def testPoolThreads(self):
+        '''Make sure work wrapped with inRun joins the run, even in a pool thread, and only while it lasts'''
+        with dmcccache.dmccRun() as cache, ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEquals([cache, cache], list(executor.map(dmcccache.inRun(lambda i: dmcccache._current.get()), range(2))))
+            self.assertEquals([None], list(executor.map(lambda i: dmcccache._current.get(), range(1))))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertIsNone(executor.submit(dmcccache.inRun(dmcccache._current.get)).result())
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -4,8 +4,9 @@
 
 '''EDRN RDF Service — DMCC parser tests'''
 
-import unittest
-from edrn.rdf.utils import parseTokens
+import unittest, pkg_resources
+from edrn.rdf.utils import clone_suds_client, parseTokens, iterDMCCRows
+from suds.client import Client
 
 
 class TokenizerTest(unittest.TestCase):
@@ -72,6 +73,53 @@ class TokenizerTest(unittest.TestCase):
         k, v = next(parseTokens('<msg>Hello,\nworld.</msg>'))
         self.assertEquals('msg', k)
         self.assertEquals('Hello,\nworld.', v)
+    def testEmbeddedMarkup(self):
+        '''Make sure values containing other elements come through intact'''
+        tokens = list(parseTokens('<Abstract><p>Hot <b>salsa</b></p></Abstract> <Title>Dip</Title>'))
+        self.assertEquals([('Abstract', '<p>Hot <b>salsa</b></p>'), ('Title', 'Dip')], tokens)
+    def testGreediness(self):
+        '''Check a value runs to the last closing tag for its key, as it did with the regex parser'''
+        self.assertEquals([('A', 'x<A>y</A>z')], list(parseTokens('<A>x<A>y</A>z</A>')))
+        self.assertEquals([('A', '1</A><A>2')], list(parseTokens('<A>1</A><A>2</A>')))
+    def testLaziness(self):
+        '''Ensure tokens come out one at a time, before a later malformed token is reached'''
+        generator = parseTokens('<Temperature>Spicy</Temperature><Protein>Shrimp')
+        self.assertEquals(('Temperature', 'Spicy'), next(generator))
+        with self.assertRaises(ValueError):
+            next(generator)
+
+
+_sep = '<recordNumber>%d</recordNumber><numberOfRecords>2</numberOfRecords><ontologyVersion>1.8</ontologyVersion>'
+
+
+class RowSplitterTest(unittest.TestCase):
+    '''Unit test of the lazy DMCC row splitter'''
+    def testEmptyString(self):
+        '''Check that an empty string or one with no row separators yields no rows'''
+        self.assertEquals([], list(iterDMCCRows('')))
+        self.assertEquals([], list(iterDMCCRows('<Identifier>1</Identifier>')))
+    def testRows(self):
+        '''See if rows come out in order without their separators'''
+        rows = iterDMCCRows((_sep % 1) + '<Identifier>1</Identifier>' + (_sep % 2) + '<Identifier>2</Identifier>')
+        self.assertEquals('<Identifier>1</Identifier>', next(rows))
+        self.assertEquals('<Identifier>2</Identifier>', next(rows))
+        with self.assertRaises(StopIteration):
+            next(rows)
+
+
+class CloneSudsClientTest(unittest.TestCase):
+    '''Unit test of cloning suds clients'''
+    def testClone(self):
+        '''Check a clone shares the WSDL but not the options or transport'''
+        wsdl = pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/wsdl.xml')
+        client = Client('file://' + wsdl, timeout=17)
+        clone = clone_suds_client(client)
+        clone.set_options(retxml=True)
+        self.assertTrue(clone.wsdl is client.wsdl)
+        self.assertEquals(17, clone.options.timeout)
+        self.assertFalse(client.options.retxml)
+        self.assertFalse(clone.options.transport is client.options.transport)
+        self.assertTrue(hasattr(clone.service, 'Body_System'))
 
 
 def test_suite():
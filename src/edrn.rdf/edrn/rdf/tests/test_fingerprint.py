@@ -0,0 +1,125 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — graph fingerprint tests'''
+
+import unittest, rdflib
+from unittest import mock
+from edrn.rdf import dmcccommitteerdfgenerator
+from edrn.rdf.benchmarks import soapResult
+from edrn.rdf.dmcccommitteerdfgenerator import DMCCCommitteeGraphGenerator
+from edrn.rdf.dmccprotocolrdfgenerator import DMCCProtocolGraphGenerator
+from edrn.rdf.fingerprint import graphFingerprint, FingerprintAccumulator
+
+
+_statements = [
+    (rdflib.URIRef('urn:edrn:organs:1'), rdflib.RDF.type, rdflib.URIRef('urn:edrn:types:organ')),
+    (rdflib.URIRef('urn:edrn:organs:1'), rdflib.URIRef('urn:edrn:predicates:title'), rdflib.Literal('Liver')),
+    (rdflib.URIRef('urn:edrn:organs:2'), rdflib.URIRef('urn:edrn:predicates:title'), rdflib.Literal('Lung', lang='en')),
+]
+
+
+def _graph(statements):
+    graph = rdflib.Graph()
+    for statement in statements:
+        graph.add(statement)
+    return graph
+
+
+class FingerprintTest(unittest.TestCase):
+    '''Unit test of graph fingerprints'''
+    def testOrderIndependence(self):
+        '''See if the same statements in any order give the same fingerprint'''
+        self.assertEquals(graphFingerprint(_graph(_statements)), graphFingerprint(_graph(reversed(_statements))))
+    def testDifferentGraphs(self):
+        '''Check that different statements give different fingerprints'''
+        self.assertNotEquals(graphFingerprint(_graph(_statements)), graphFingerprint(_graph(_statements[1:])))
+        changed = _statements[:2] + [(_statements[2][0], _statements[2][1], rdflib.Literal('Lung'))]
+        self.assertNotEquals(graphFingerprint(_graph(_statements)), graphFingerprint(_graph(changed)))
+    def testEmptyGraph(self):
+        '''Ensure an empty graph still has a fingerprint'''
+        self.assertEquals('0' * 64, graphFingerprint(rdflib.Graph()))
+    def testBlankNodes(self):
+        '''Confirm graphs with blank nodes have no fingerprint'''
+        graph = _graph(_statements)
+        graph.add((rdflib.BNode(), rdflib.RDF.type, rdflib.URIRef('urn:edrn:types:organ')))
+        self.assertIsNone(graphFingerprint(graph))
+
+
+class FingerprintAccumulatorTest(unittest.TestCase):
+    '''Unit test of fingerprints worked out a statement at a time'''
+    def testSameAsGraph(self):
+        '''See if the accumulated fingerprint matches the graph's, repeats and all'''
+        accumulator = FingerprintAccumulator()
+        for statement in _statements[:2] + _statements[:2] + _statements[2:]:
+            accumulator.add(statement)
+        self.assertEquals(graphFingerprint(_graph(_statements)), accumulator.fingerprint())
+        self.assertEquals(3, len(accumulator))
+    def testRepeats(self):
+        '''Check that repeats are ignored, even after statements about other subjects'''
+        accumulator = FingerprintAccumulator()
+        self.assertTrue(accumulator.add(_statements[0]))
+        self.assertFalse(accumulator.add(_statements[0]))
+        self.assertTrue(accumulator.add(_statements[2]))
+        self.assertFalse(accumulator.add(_statements[0]))
+        self.assertTrue(accumulator.add(_statements[1]))
+        self.assertEquals(3, len(accumulator))
+
+
+class _Context(object):
+    '''Stands in for an RDF generator: operations are named after their fixtures and everything else is a URI.'''
+    protocolOrStudyOperation = 'Protocol_or_Study'
+    protoSiteSpecificsOperation = 'Protocol_Site_Specifics'
+    protoProtoRelationshipOperation = 'Protocol_Protocol_Relationship'
+    edrnProtocolOperation = 'EDRN_Protocol'
+    committeeOperation, membershipOperation = 'Committees', 'Committee_Membership'
+    webServiceURL, verificationNum, rawSOAP = 'testscheme://localhost/ws_newcompass.asmx?WSDL', None, False
+    def __getattr__(self, name):
+        if name.endswith('Prefix'):
+            return 'urn:edrn:test:' + name + ':'
+        return 'http://edrn.nci.nih.gov/rdf/test#' + name
+    def getPhysicalPath(self):
+        return ('', 'site', 'generator')
+
+
+class _ListSink(list):
+    add = list.append
+
+
+class GeneratorFingerprintTest(unittest.TestCase):
+    '''Unit test of accumulated fingerprints of real generators' statements'''
+    def check(self, sink):
+        graph = rdflib.Graph()
+        for statement in sink:
+            graph.add(statement)
+        # Generators come back to subjects they've moved on from, so repeats needn't come together
+        runs = [subject for i, (subject, predicate, obj) in enumerate(sink) if i == 0 or sink[i - 1][0] != subject]
+        self.assertLess(len(set(runs)), len(runs))
+        for statements in (sink, list(reversed(sink)), sorted(sink, key=lambda i: i[2])):
+            accumulator = FingerprintAccumulator()
+            for statement in statements:
+                accumulator.add(statement)
+            self.assertEquals(graphFingerprint(graph), accumulator.fingerprint())
+            self.assertEquals(len(graph), len(accumulator))
+    def testProtocols(self):
+        '''See if the protocol generator's statements, in any order, fingerprint the same as its graph'''
+        generator, sink = DMCCProtocolGraphGenerator(_Context()), _ListSink()
+        generator.makeGraph(*[soapResult(operation + '.xml') for operation in generator.operations], graph=sink)
+        self.check(sink)
+    def testCommittees(self):
+        '''Check that the committee generator's statements, in any order, fingerprint the same as its graph'''
+        def callDMCC(url, operation, verificationNum, raw=False, client=None):
+            return soapResult(operation + '.xml')
+        generator, sink = DMCCCommitteeGraphGenerator(_Context()), _ListSink()
+        with mock.patch.object(dmcccommitteerdfgenerator, 'callDMCC', callDMCC):
+            with mock.patch.object(dmcccommitteerdfgenerator, 'aq_inner', lambda obj: obj):
+                generator.generateTriples(sink)
+        self.check(sink)
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
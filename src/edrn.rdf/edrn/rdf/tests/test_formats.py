@@ -0,0 +1,52 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — format negotiation tests'''
+
+import unittest
+from edrn.rdf.formats import ALTERNATIVES, RDF_XML_MIMETYPE, chooseFormat
+
+
+_all = list(ALTERNATIVES.keys())
+
+
+class ChooseFormatTest(unittest.TestCase):
+    '''Unit test of choosing an RDF format'''
+    def testDefault(self):
+        '''Check that RDF/XML is what we send when the request doesn't say'''
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, None, _all))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, '*/*', _all))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, 'text/html,application/xhtml+xml', _all))
+    def testFormatName(self):
+        '''See if the format parameter wins over the Accept header'''
+        self.assertEquals('text/turtle', chooseFormat('ttl', 'application/n-triples', _all))
+        self.assertEquals('application/ld+json', chooseFormat('JSON-LD', None, _all))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat('xml', 'text/turtle', _all))
+        self.assertRaises(ValueError, chooseFormat, 'yaml', None, _all)
+    def testAccept(self):
+        '''Make sure quality values order the Accept header'''
+        accept = 'application/rdf+xml;q=0.5, text/turtle;q=0.9, application/n-triples;q=0.8'
+        self.assertEquals('text/turtle', chooseFormat(None, accept, _all))
+        self.assertEquals('application/n-triples', chooseFormat(None, 'text/turtle;q=0, application/n-triples', _all))
+        self.assertEquals('text/turtle', chooseFormat(None, 'text/*', _all))
+    def testWildcards(self):
+        '''Check that concrete types beat wildcards of the same quality, but not better ones'''
+        self.assertEquals('text/turtle', chooseFormat(None, '*/*, text/turtle', _all))
+        self.assertEquals('application/ld+json', chooseFormat(None, 'application/*, application/ld+json', _all))
+        self.assertEquals('application/n-triples', chooseFormat(None, 'text/*, application/n-triples', _all))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, 'application/*', _all))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, '*/*, text/turtle;q=0.5', _all))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, '*/*, text/turtle', []))
+    def testUnavailable(self):
+        '''Confirm we fall back to RDF/XML for files made before there were alternatives'''
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat(None, 'text/turtle', []))
+        self.assertEquals(RDF_XML_MIMETYPE, chooseFormat('nt', None, []))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
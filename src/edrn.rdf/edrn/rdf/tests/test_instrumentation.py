@@ -0,0 +1,169 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — update instrumentation tests'''
+
+import unittest, io, itertools, time
+from unittest import mock
+from edrn.rdf import instrumentation
+from edrn.rdf.instrumentation import (
+    RunRecord, count, currentRecord, getRunRecords, phase, processPeakMemory, recordRun, recording,
+    saveRunRecord, tokenized
+)
+from edrn.rdf.sink import NTriplesWriter
+from edrn.rdf.tokenizer import parseTokens
+import rdflib
+
+
+class _Unchanged(Exception):
+    pass
+
+
+class _Clock(object):
+    '''A clock that advances one second every time it's read.'''
+    def __init__(self):
+        self.ticks = itertools.count()
+    def __call__(self):
+        return float(next(self.ticks))
+
+
+class RunRecordTest(unittest.TestCase):
+    '''Unit test of run records'''
+    def setUp(self):
+        patcher = mock.patch.object(time, 'perf_counter', _Clock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    def testNesting(self):
+        '''Check that time in an inner phase isn't charged to the outer one too'''
+        record = RunRecord()                 # Clock reads 0
+        record.enter('build')                # 1
+        record.enter('fetch')                # 2: build gets 1
+        record.exit()                        # 3: fetch gets 1
+        record.enter('serialize')            # 4: build gets 1 more
+        record.exit()                        # 5: serialize gets 1
+        record.exit()                        # 6: build gets 1 more
+        record.finish('updated')             # 7
+        self.assertEquals(3.0, record.seconds['build'])
+        self.assertEquals(1.0, record.seconds['fetch'])
+        self.assertEquals(1.0, record.seconds['serialize'])
+        self.assertEquals(0.0, record.seconds['store'])
+        self.assertEquals(7.0, record.elapsed)
+        self.assertEquals('updated', record.asDict()['outcome'])
+    def testProcessPeakMemory(self):
+        '''Ensure memory is reported for the process, not for each record'''
+        self.assertGreater(processPeakMemory(), 0)
+        self.assertNotIn('peakMemoryDelta', RunRecord().asDict())
+    def testTokenizing(self):
+        '''See if a row's tokenizing is charged to its phase, timed once however many tokens it has'''
+        record = RunRecord()
+        with recording(record):
+            tokens = tokenized('<Temperature>Spicy</Temperature><Color>Red</Color><Size>Big</Size>')
+        self.assertEquals(3, len(tokens))
+        # One second between entering and leaving the phase, not one per token
+        self.assertEquals(1.0, record.seconds['tokenize'])
+    def testLazyTokenizer(self):
+        '''Make sure the tokenizer itself stays lazy while an update's recorded'''
+        record = RunRecord()
+        with recording(record):
+            pairs = parseTokens(None)
+            self.assertRaises(TypeError, next, pairs)
+            pairs = parseTokens('<Color>Red</Color><Size>Big')
+            self.assertEquals(('Color', 'Red'), next(pairs))
+            self.assertRaises(ValueError, next, pairs)
+        self.assertEquals(0.0, record.seconds['tokenize'])
+
+
+class RecordingTest(unittest.TestCase):
+    '''Unit test of recording updates'''
+    def testNoRecord(self):
+        '''Make sure the hooks do nothing when nobody's recording'''
+        self.assertEquals(None, currentRecord())
+        with phase('fetch'):
+            count('fetchBytes', 10)
+        self.assertEquals([('Temperature', 'Spicy')], list(parseTokens('<Temperature>Spicy</Temperature>')))
+    def testRecording(self):
+        '''Confirm the hooks find the current record'''
+        record = RunRecord()
+        with recording(record):
+            with phase('fetch'):
+                count('fetchBytes', 10)
+                count('fetchBytes', 5)
+            writer = NTriplesWriter(io.BytesIO())
+            writer.add((rdflib.URIRef('urn:edrn:s'), rdflib.URIRef('urn:edrn:p'), rdflib.Literal('o')))
+            writer.close()
+        self.assertEquals(None, currentRecord())
+        self.assertEquals(15, record.counts['fetchBytes'])
+        self.assertEquals(1, record.counts['triples'])
+    def testOutcomes(self):
+        '''Check each update's outcome gets saved'''
+        with mock.patch('edrn.rdf.instrumentation.saveRunRecord') as save:
+            with recordRun('source') as record:
+                pass
+            self.assertEquals('updated', record.outcome)
+            with self.assertRaises(_Unchanged):
+                with recordRun('source', (_Unchanged,)) as record:
+                    raise _Unchanged()
+            self.assertEquals('unchanged', record.outcome)
+            with self.assertRaises(ValueError):
+                with recordRun('source', (_Unchanged,)) as record:
+                    raise ValueError('Bad data')
+            self.assertEquals('failed', record.outcome)
+            self.assertEquals('Bad data', record.message)
+            self.assertEquals(3, save.call_count)
+
+
+class _Source(object):
+    def __init__(self, path):
+        self.path, self.annotations = path, {}
+    def getPhysicalPath(self):
+        return tuple(self.path.split('/'))
+
+
+class SavingTest(unittest.TestCase):
+    '''Unit test of keeping run records'''
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(instrumentation, 'IAnnotations', lambda obj, default=None: obj.annotations),
+            mock.patch.dict(instrumentation._unchanged, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.source = _Source('/site/body-systems')
+    def save(self, outcome, started):
+        record = RunRecord()
+        record.finish(outcome)
+        record.started = started
+        saveRunRecord(self.source, record)
+    def testUnchangedInMemory(self):
+        '''Make sure records of updates that changed nothing don't touch the source'''
+        self.save('unchanged', 1.0)
+        self.assertEquals({}, self.source.annotations)
+        self.assertEquals(['unchanged'], [i['outcome'] for i in getRunRecords(self.source)])
+        self.assertEquals([], getRunRecords(_Source('/site/diseases')))
+    def testOthersSaved(self):
+        '''Check that records of updates and failures are kept on the source'''
+        self.save('updated', 1.0)
+        self.save('failed', 2.0)
+        saved = self.source.annotations[instrumentation.RECORDS_KEY]
+        self.assertEquals(['updated', 'failed'], [i['outcome'] for i in saved])
+    def testMerged(self):
+        '''See if records from the source and from memory come back together, oldest first, and no more
+        than the most we keep'''
+        self.save('updated', 1.0)
+        self.save('unchanged', 2.0)
+        self.save('failed', 3.0)
+        self.assertEquals(['updated', 'unchanged', 'failed'], [i['outcome'] for i in getRunRecords(self.source)])
+        for i in range(instrumentation.MAX_RECORDS):
+            self.save('unchanged', 4.0 + i)
+        records = getRunRecords(self.source)
+        self.assertEquals(instrumentation.MAX_RECORDS, len(records))
+        self.assertEquals(['unchanged'], list(set(i['outcome'] for i in records)))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,168 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — update job tests'''
+
+import unittest, threading
+from unittest import mock
+from edrn.rdf import jobs
+from edrn.rdf.jobs import DONE, FAILED, QUEUED, RUNNING, Heartbeat, Job, JobQueue, beating, runJob
+
+
+class _Clock(object):
+    '''A clock that says whatever time it's set to.'''
+    def __init__(self, now=1000.0):
+        self.now = now
+    def __call__(self):
+        return self.now
+
+
+class _Brain(object):
+    def __init__(self, path):
+        self.path, self.Title = path, path
+    def getPath(self):
+        return self.path
+
+
+class _Runner(object):
+    '''A job runner that updates each source it's given, or fails outright if told to.'''
+    def __init__(self, paths, error=None):
+        self.paths, self.error, self.ran = paths, error, []
+    def sources(self, site):
+        return [_Brain(i) for i in self.paths]
+    def run(self, site, results, force, progress):
+        if self.error is not None: raise self.error
+        for brain in results:
+            self.ran.append(brain.getPath())
+            progress.updated(brain)
+        return dict(updated=len(results))
+
+
+class JobQueueTest(unittest.TestCase):
+    '''Unit test of claiming jobs from the queue'''
+    def setUp(self):
+        self.clock = _Clock()
+        patcher = mock.patch.object(jobs.time, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.queue = JobQueue()
+    def add(self, kind='rdf'):
+        self.clock.now += 1
+        job = Job(kind)
+        self.queue.add(job)
+        return job
+    def testNothingToDo(self):
+        '''Check that an empty queue has nothing to claim'''
+        self.assertIsNone(self.queue.claim())
+    def testOldestFirst(self):
+        '''See if jobs are claimed oldest first, each just once'''
+        first, second = self.add(), self.add()
+        self.assertIs(first, self.queue.claim())
+        self.assertEquals(RUNNING, first.state)
+        self.assertEquals(QUEUED, second.state)
+        self.assertIs(second, self.queue.claim())
+        self.assertIsNone(self.queue.claim())
+    def testBeating(self):
+        '''Make sure a running job that keeps beating isn't claimed again, however long it runs'''
+        job = self.add()
+        self.queue.claim()
+        for i in range(10):
+            self.clock.now += jobs.STALE_SECONDS - 1
+            job.heartbeat.beat()
+            self.assertIsNone(self.queue.claim())
+    def testStale(self):
+        '''Ensure a running job that stops beating is taken over'''
+        job = self.add()
+        self.queue.claim()
+        self.clock.now += jobs.STALE_SECONDS + 1
+        self.assertIs(job, self.queue.claim())
+        self.assertEquals(self.clock.now, job.heartbeat.when)
+        self.assertIsNone(self.queue.claim())
+    def testFinished(self):
+        '''Confirm finished jobs are never claimed, and only the most recent are kept'''
+        done, failed = self.add(), self.add()
+        done.state, failed.state = DONE, FAILED
+        self.clock.now += jobs.STALE_SECONDS + 1
+        self.assertIsNone(self.queue.claim())
+        with mock.patch.object(jobs, 'MAX_FINISHED', 1):
+            self.add()
+        self.assertEquals([failed.jobID], [i.jobID for i in self.queue.jobs.values() if i.state in (DONE, FAILED)])
+    def testPending(self):
+        '''See if a source counts as pending only while a job for it is queued or running'''
+        job = Job('rdf', sourcePaths=['/site/a'])
+        self.queue.add(job)
+        self.assertTrue(self.queue.pending('/site/a'))
+        self.assertFalse(self.queue.pending('/site/b'))
+        job.state = DONE
+        self.assertFalse(self.queue.pending('/site/a'))
+
+
+class HeartbeatTest(unittest.TestCase):
+    '''Unit test of job heartbeats'''
+    def testConflicts(self):
+        '''Check that conflicting beats keep the later one'''
+        heartbeat = Heartbeat()
+        self.assertEquals({'when': 20}, heartbeat._p_resolveConflict({'when': 1}, {'when': 20}, {'when': 10}))
+        self.assertEquals({'when': 10}, heartbeat._p_resolveConflict({'when': 1}, {'when': None}, {'when': 10}))
+    def testBeating(self):
+        '''Make sure a job's heartbeat is beaten from another thread while it runs'''
+        job, beaten = Job('rdf'), threading.Event()
+        site = mock.Mock()
+        db = mock.Mock()
+        db.open.return_value.root.return_value = {'Application': site}
+        queue = mock.Mock(jobs={job.jobID: job})
+        job.heartbeat = mock.Mock(beat=mock.Mock(side_effect=lambda: beaten.set()))
+        with mock.patch.object(jobs, 'getQueue', return_value=queue):
+            with beating(db, ('', 'site'), job.jobID, 0.01):
+                self.assertTrue(beaten.wait(5))
+        site.unrestrictedTraverse.assert_called_with(('', 'site'))
+        self.assertTrue(db.open.return_value.close.called)
+
+
+class RunJobTest(unittest.TestCase):
+    '''Unit test of running jobs'''
+    def runWith(self, runner, job):
+        checkpoints = []
+        with mock.patch.object(jobs, 'getUtility', return_value=runner):
+            runJob(None, job, lambda: checkpoints.append(job.done))
+        return checkpoints
+    def testDone(self):
+        '''See if a job that runs through is done, having beaten and checkpointed after each source'''
+        runner, job = _Runner(['/site/a', '/site/b']), Job('rdf')
+        self.assertEquals([1, 2, 2], self.runWith(runner, job))
+        self.assertEquals(DONE, job.state)
+        self.assertEquals((2, 2, 2), (job.total, job.done, job.count))
+        self.assertEquals(dict(updated=2), job.stats)
+        self.assertIsNotNone(job.heartbeat.when)
+        self.assertIsNotNone(job.finished)
+    def testSourcePaths(self):
+        '''Check that a job for particular sources updates just those'''
+        runner = _Runner(['/site/a', '/site/b'])
+        self.runWith(runner, Job('rdf', sourcePaths=['/site/b']))
+        self.assertEquals(['/site/b'], runner.ran)
+    def testFailed(self):
+        '''Ensure a job whose runner fails is marked so, with why'''
+        job = Job('rdf')
+        self.runWith(_Runner(['/site/a'], ValueError('No DMCC today')), job)
+        self.assertEquals(FAILED, job.state)
+        self.assertEquals('No DMCC today', job.message)
+        self.assertIsNotNone(job.finished)
+
+
+class WorkerTest(unittest.TestCase):
+    '''Unit test of starting job workers'''
+    def testDisabled(self):
+        '''Confirm no workers start when EDRN_RDF_JOB_THREADS is 0'''
+        with mock.patch.dict(jobs.os.environ, {'EDRN_RDF_JOB_THREADS': '0'}):
+            with mock.patch.object(jobs.threading, 'Thread') as thread:
+                jobs.databaseOpened(mock.Mock())
+                self.assertFalse(thread.called)
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
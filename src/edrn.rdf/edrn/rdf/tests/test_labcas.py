@@ -0,0 +1,139 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — LabCAS harvesting tests'''
+
+import unittest, http.server, json, pkg_resources, re, threading, time, urllib.parse
+from unittest import mock
+from edrn.rdf import labcas
+from edrn.rdf.labcas import COLLECTION_FIELDS, harvest, sync
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    '''Answers Solr queries from the LabCAS fixture, paging by cursor the way Solr does.'''
+    protocol_version = 'HTTP/1.1'
+    def setup(self):
+        super(_Handler, self).setup()
+        with self.server.lock:
+            self.server.connections += 1
+    def do_GET(self):
+        with self.server.lock:
+            self.server.active += 1
+            self.server.mostActive = max(self.server.mostActive, self.server.active)
+        try:
+            time.sleep(0.05)  # Long enough for concurrent queries to overlap
+            path = urllib.parse.urlparse(self.path)
+            core, params = path.path.strip('/').split('/')[0], dict(urllib.parse.parse_qsl(path.query))
+            self.server.queries.append((core, params))
+            docs = self.server.docs if core == 'collections' else []
+            if 'fq' in params:
+                since = int(re.match(r'_version_:\{(\d+) TO \*\]$', params['fq']).group(1))
+                docs = [d for d in docs if d['_version_'] > since]
+            response = dict(response=dict(numFound=len(docs) if core == 'collections' else 1234, docs=[]))
+            if 'cursorMark' in params:
+                cursor, rows = params['cursorMark'], int(params['rows'])
+                page = [d for d in sorted(docs, key=lambda d: d['id']) if cursor == '*' or d['id'] > cursor][:rows]
+                fields = params['fl'].split(',')
+                response['response']['docs'] = [dict((k, v) for k, v in d.items() if k in fields) for d in page]
+                self.server.answers.append((params, page))
+                response['nextCursorMark'] = page[-1]['id'] if page else cursor
+            else:
+                response['response']['docs'] = docs[:int(params.get('rows', 10))]
+            body = json.dumps(response).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+    def log_message(self, format, *args):
+        pass
+
+
+class _ServerTestCase(unittest.TestCase):
+    '''Starts a stand-in LabCAS Solr on a local port for each test.'''
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        with open(pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/labcas-solr.json'), 'rb') as f:
+            self.server.docs = json.load(f)['response']['docs']
+        self.server.lock, self.server.queries, self.server.answers = threading.Lock(), [], []
+        self.server.connections = self.server.active = self.server.mostActive = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = 'http://127.0.0.1:%d' % self.server.server_port
+
+
+class HarvestTest(_ServerTestCase):
+    '''Unit test of harvesting LabCAS with cursors'''
+    def testPaging(self):
+        '''Check every collection comes back, a page at a time, with just the fields we use'''
+        numDatasets, numFiles, numCollections, collections = harvest(self.url, ('service', 'secret'), rows=5)
+        self.assertEquals((1234, 1234, 19), (numDatasets, numFiles, numCollections))
+        self.assertEquals(sorted(d['id'] for d in self.server.docs), [d['id'] for d in collections])
+        self.assertTrue(all(set(d) <= set(COLLECTION_FIELDS) for d in collections))
+        pages = [params for core, params in self.server.queries if core == 'collections']
+        self.assertEquals(5, len(pages))  # Four with collections in them, then one to find there are no more
+        self.assertEquals(('Consortium:EDRN', 'id asc'), (pages[0]['q'], pages[0]['sort']))
+        # Seven requests, but connections are kept alive and shared
+        self.assertTrue(self.server.connections <= 3)
+    def testConcurrency(self):
+        '''See if the three queries run at once'''
+        harvest(self.url, ('service', 'secret'), rows=100)
+        self.assertEquals(3, self.server.mostActive)
+
+
+class SyncTest(_ServerTestCase):
+    '''Unit test of syncing LabCAS incrementally'''
+    def setUp(self):
+        super(SyncTest, self).setUp()
+        patcher = mock.patch.object(labcas, 'LOOKBACK', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    def changes(self):
+        # How many collections came back from queries for changed ones
+        return sum([len(docs) for params, docs in self.server.answers if 'fq' in params])
+    def testFirstSync(self):
+        '''Check a sync with no snapshot harvests what a full harvest does and remembers the latest version'''
+        numDatasets, numFiles, numCollections, collections, snapshot = sync(self.url, ('service', 'secret'))
+        self.assertEquals(harvest(self.url, ('service', 'secret'))[3], collections)
+        self.assertEquals(max(d['_version_'] for d in self.server.docs), snapshot['marker'])
+        self.assertEquals(19, len(snapshot['collections']))
+    def testChanges(self):
+        '''See if only changed collections are fetched again and merged with additions and deletions'''
+        snapshot = sync(self.url, ('service', 'secret'))[4]
+        numCollections, collections, again = sync(self.url, ('service', 'secret'), snapshot)[2:]
+        self.assertEquals(0, self.changes())
+        self.assertEquals(snapshot, again)
+        marker = snapshot['marker']
+        docs = sorted(self.server.docs, key=lambda d: d['id'])
+        deleted, changed, added = docs[0], dict(docs[1]), dict(docs[2])
+        changed['CollectionName'], changed['_version_'] = 'Renamed', marker + 1
+        added['id'], added['_version_'] = 'Added', marker + 2
+        self.server.docs = docs[2:] + [changed, added]
+        numCollections, collections, again = sync(self.url, ('service', 'secret'), snapshot)[2:]
+        self.assertEquals(2, self.changes())
+        self.assertEquals(19, numCollections)
+        self.assertEquals(harvest(self.url, ('service', 'secret'))[3], collections)
+        self.assertEquals('Renamed', again['collections'][changed['id']]['CollectionName'])
+        self.assertFalse(deleted['id'] in again['collections'])
+        self.assertEquals(marker + 2, again['marker'])
+    def testUnknownCollection(self):
+        '''Make sure a collection older than the marker but missing from the snapshot brings on a full harvest'''
+        snapshot = sync(self.url, ('service', 'secret'))[4]
+        missing = sorted(snapshot['collections'])[5]
+        del snapshot['collections'][missing]
+        collections, again = sync(self.url, ('service', 'secret'), snapshot)[3:]
+        self.assertTrue(missing in again['collections'])
+        self.assertEquals(harvest(self.url, ('service', 'secret'))[3], collections)
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,79 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — metrics tests'''
+
+import unittest, gc, threading
+from edrn.rdf.metrics import Registry
+
+
+class CounterTest(unittest.TestCase):
+    '''Unit test of counters'''
+    def setUp(self):
+        self.registry = Registry()
+        self.counter = self.registry.counter('edrn_test_total', 'Test counts', ('view',))
+    def testThreads(self):
+        '''Check counts from every thread add up, even after the threads are gone'''
+        def work():
+            for i in range(1000):
+                self.counter.inc(view='rdf')
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        del threads, thread
+        gc.collect()
+        self.counter.inc(2, view='summary')
+        self.assertEquals(4000, self.counter.value(view='rdf'))
+        self.assertEquals(2, self.counter.value(view='summary'))
+        self.assertEquals(1, len(self.counter.shards.live))
+    def testLabels(self):
+        '''Make sure we insist on the declared labels'''
+        self.assertRaises(ValueError, self.counter.inc)
+        self.assertRaises(KeyError, self.counter.inc, colour='red')
+    def testExposition(self):
+        '''See if counters come out in the text format, with label values escaped'''
+        self.counter.inc(3, view='a "quoted"\nview')
+        self.assertEquals(
+            '# HELP edrn_test_total Test counts\n# TYPE edrn_test_total counter\n'
+            'edrn_test_total{view="a \\"quoted\\"\\nview"} 3\n',
+            self.registry.exposition()
+        )
+
+
+class HistogramTest(unittest.TestCase):
+    '''Unit test of histograms'''
+    def testBuckets(self):
+        '''Confirm buckets are cumulative and end with +Inf'''
+        registry = Registry()
+        histogram = registry.histogram('edrn_test_seconds', 'Test times', buckets=(1.0, 0.1))
+        for amount in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(amount)
+        self.assertEquals((4, 6.05), histogram.value())
+        self.assertEquals([
+            '# HELP edrn_test_seconds Test times',
+            '# TYPE edrn_test_seconds histogram',
+            'edrn_test_seconds_bucket{le="0.1"} 1',
+            'edrn_test_seconds_bucket{le="1.0"} 3',
+            'edrn_test_seconds_bucket{le="+Inf"} 4',
+            'edrn_test_seconds_sum 6.05',
+            'edrn_test_seconds_count 4',
+        ], registry.exposition().splitlines())
+
+
+class RegistryTest(unittest.TestCase):
+    '''Unit test of the metrics registry'''
+    def testSameName(self):
+        '''Check that asking again for a metric gives the same one, but not as a different kind'''
+        registry = Registry()
+        counter = registry.counter('edrn_test_total', 'Test counts')
+        self.assertTrue(counter is registry.counter('edrn_test_total', 'Test counts'))
+        self.assertRaises(ValueError, registry.histogram, 'edrn_test_total', 'Test counts')
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
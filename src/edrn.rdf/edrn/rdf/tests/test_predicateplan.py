@@ -0,0 +1,174 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — compiled predicate plan tests'''
+
+import unittest, functools, rdflib
+from unittest import mock
+from edrn.rdf import validation
+from edrn.rdf.benchmarks import soapResult
+from edrn.rdf.emailpredicatehandler import EmailAsserter
+from edrn.rdf.literalpredicatehandler import LiteralAsserter
+from edrn.rdf.multiliteralpredicatehandler import MultiLiteralAsserter
+from edrn.rdf.multipipepredicatehandler import MultiPipeAsserter
+from edrn.rdf.referencepredicatehandler import ReferenceAsserter
+from edrn.rdf.simpledmccrdfgenerator import compilePlan, describeRows
+from edrn.rdf.tokenizer import parseTokens
+from edrn.rdf.uripredicatehandler import URIAsserter
+from edrn.rdf.utils import iterDMCCRows
+from email_validator import EmailNotValidError, validate_email
+from rfc3986_validator import validate_rfc3986
+
+
+# Checking deliverability means DNS; neither path should need the network here
+_validateEmail = functools.partial(validate_email, check_deliverability=False)
+
+
+# How predicate handlers characterized values before they were compiled, one call per value
+def _literal(handler, obj):
+    return [(rdflib.URIRef(handler.predicateURI), rdflib.Literal(obj))]
+
+
+def _reference(handler, obj):
+    characterizations = []
+    for i in obj.split(', '):
+        i = i.strip()
+        if not i: continue
+        target = handler.uriPrefix + i
+        if validate_rfc3986(target):
+            characterizations.append((rdflib.URIRef(handler.predicateURI), rdflib.URIRef(target)))
+    return characterizations
+
+
+def _uri(handler, obj):
+    return [(rdflib.URIRef(handler.predicateURI), rdflib.URIRef(obj))] if validate_rfc3986(obj) else []
+
+
+def _email(handler, obj):
+    characterizations = []
+    for i in obj.split(', '):
+        i = i.strip()
+        if not i: continue
+        try:
+            address = _validateEmail(i).email
+        except EmailNotValidError:
+            continue
+        characterizations.append((rdflib.URIRef(handler.predicateURI), rdflib.URIRef('mailto:' + address)))
+    return characterizations
+
+
+def _multiLiteral(handler, obj):
+    return [(rdflib.URIRef(handler.predicateURI), rdflib.Literal(i.strip())) for i in obj.split(', ')]
+
+
+def _multiPipe(handler, obj):
+    return [
+        (rdflib.URIRef(handler.predicateURI), rdflib.Literal(f'{count:04} {i.strip()}'))
+        for count, i in enumerate(obj.split('|'))
+    ]
+
+
+class _Handler(object):
+    '''A predicate handler of some kind, with the asserter that compiles it and how it used to characterize.'''
+    def __init__(self, title, asserter, characterize, uriPrefix=None):
+        self.title, self.asserter, self.characterize, self.uriPrefix = title, asserter, characterize, uriPrefix
+        self.predicateURI = 'urn:edrn:predicates:' + title
+
+
+class _Generator(object):
+    def __init__(self, *handlers):
+        self.handlers = handlers
+    def contentItems(self):
+        return [(handler.title, handler) for handler in self.handlers]
+
+
+_typeURI = rdflib.URIRef('urn:edrn:types:thing')
+_prefix = 'urn:edrn:things:'
+
+# Fixtures, and handlers for some of their keys, to cover every kind of handler
+_cases = (
+    ('Disease.xml', _Generator(
+        _Handler('icd9', LiteralAsserter, _literal),
+        _Handler('icd10', LiteralAsserter, _literal),
+        _Handler('body_system', ReferenceAsserter, _reference, 'urn:edrn:organs:'),
+    )),
+    ('Publication.xml', _Generator(
+        _Handler('Author', MultiLiteralAsserter, _multiLiteral),
+        _Handler('Publication_URL', URIAsserter, _uri),
+        _Handler('Journal', MultiPipeAsserter, _multiPipe),
+        _Handler('Year', LiteralAsserter, _literal),
+    )),
+    ('Site.xml', _Generator(
+        _Handler('IDs_for_Staff', ReferenceAsserter, _reference, 'urn:edrn:people:'),
+        _Handler('Institution_URL', URIAsserter, _uri),
+        _Handler('Member_Type', LiteralAsserter, _literal),
+    )),
+    ('Registered_Person.xml', _Generator(
+        _Handler('Email', EmailAsserter, _email),
+        _Handler('Photo_file_name', ReferenceAsserter, _reference, 'http://edrn.nci.nih.gov/photos/'),
+        _Handler('Name_First', LiteralAsserter, _literal),
+        _Handler('Specialty', MultiPipeAsserter, _multiPipe),
+    )),
+)
+
+
+def _characterizeRows(horribleString, generator):
+    '''Describe the rows as the generator did before its handlers were compiled.'''
+    handlers, graph = dict(generator.contentItems()), rdflib.Graph()
+    for row in iterDMCCRows(horribleString):
+        subjectURI, statements, statementsMade = None, [], False
+        for key, value in parseTokens(row):
+            if key == 'Identifier' and not subjectURI:
+                subjectURI = rdflib.URIRef(_prefix + value)
+            elif key in handlers and len(value) > 0:
+                statements.extend(handlers[key].characterize(handlers[key], value))
+                statementsMade = True
+        if statementsMade:
+            graph.add((subjectURI, rdflib.RDF.type, _typeURI))
+            for predicate, obj in statements:
+                graph.add((subjectURI, predicate, obj))
+    return graph
+
+
+class CompiledPlanTest(unittest.TestCase):
+    '''Unit test of compiled predicate plans against per-value characterization'''
+    def setUp(self):
+        for patcher in (
+            mock.patch('edrn.rdf.simpledmccrdfgenerator.IAsserter', lambda handler: handler.asserter(handler)),
+            mock.patch.object(validation, 'validate_email', _validateEmail),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for cache in (validation.uris, validation.emailAddresses):
+            cache.clear()
+            self.addCleanup(cache.clear)
+    def testFixtures(self):
+        '''See if each kind of handler, compiled, says just what it did one value at a time'''
+        for fixture, generator in _cases:
+            with self.subTest(fixture=fixture):
+                horribleString = soapResult(fixture)
+                expected = _characterizeRows(horribleString, generator)
+                graph = rdflib.Graph()
+                describeRows(horribleString, compilePlan(generator), 'Identifier', _prefix, _typeURI, graph)
+                self.assertEquals(set(expected), set(graph))
+                # Make sure every handler had something to say, or the comparison proves little
+                for handler in generator.handlers:
+                    self.assertIn(rdflib.URIRef(handler.predicateURI), set(graph.predicates()))
+    def testCharacterize(self):
+        '''Check that asking an asserter to characterize still works, one value at a time'''
+        for fixture, generator in _cases:
+            for handler in generator.handlers:
+                with self.subTest(handler=handler.title):
+                    value = 'alpha, beta|gamma' if handler.characterize is not _email else 'edrn@example.com'
+                    self.assertEquals(
+                        handler.characterize(handler, value), handler.asserter(handler).characterize(value)
+                    )
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,120 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — triple sink tests'''
+
+import unittest, io, rdflib
+from edrn.rdf.fingerprint import graphFingerprint
+from edrn.rdf.interfaces import IGraphGenerator
+from edrn.rdf.sink import JSONLDWriter, NTriplesWriter, RDFXMLWriter, SerializingSink, TripleGenerator, TurtleWriter, writeRDF
+
+
+_title = rdflib.URIRef('http://purl.org/dc/terms/title')
+_statements = [
+    (rdflib.URIRef('urn:edrn:organs:1'), rdflib.RDF.type, rdflib.URIRef('urn:edrn:types:organ')),
+    (rdflib.URIRef('urn:edrn:organs:1'), _title, rdflib.Literal('Liver & <Gallbladder>')),
+    (rdflib.URIRef('urn:edrn:organs:2'), _title, rdflib.Literal('Lung', lang='en')),
+    (rdflib.URIRef('urn:edrn:organs:2'), rdflib.URIRef('urn:edrn:predicates:weight'), rdflib.Literal(3)),
+    (rdflib.URIRef('urn:edrn:organs:1'), rdflib.URIRef('urn:edrn:predicates:near'), rdflib.URIRef('urn:edrn:organs:2')),
+]
+
+
+class _Generator(TripleGenerator):
+    def generateTriples(self, sink):
+        # Repeats, as generators make them, both among the statements about a subject and after it
+        for statement in _statements[:2] + _statements + _statements[:1]:
+            sink.add(statement)
+
+
+class _EmptyGenerator(TripleGenerator):
+    def generateTriples(self, sink):
+        pass
+
+
+class _LegacyGenerator(object):
+    def generateGraph(self):
+        graph = rdflib.Graph()
+        for statement in _statements:
+            graph.add(statement)
+        return graph
+
+
+def _parse(data):
+    return set(rdflib.Graph().parse(data=data, format='xml'))
+
+
+class RDFXMLWriterTest(unittest.TestCase):
+    '''Unit test of the streaming RDF/XML writer'''
+    def testRoundTrip(self):
+        '''See if what we write parses back into the same statements, each written once'''
+        stream = io.BytesIO()
+        writer = writeRDF(_Generator(), stream)
+        self.assertEquals(set(_statements), _parse(stream.getvalue()))
+        self.assertEquals(len(_statements), len(writer))
+        self.assertEquals(1, stream.getvalue().count(b'Gallbladder'))
+    def testFingerprint(self):
+        '''Check that the writer's fingerprint matches the graph's'''
+        stream = io.BytesIO()
+        writer = writeRDF(_Generator(), stream)
+        self.assertEquals(graphFingerprint(_Generator().generateGraph()), writer.fingerprint)
+    def testBlankNodes(self):
+        '''Ensure blank nodes come through and leave no fingerprint'''
+        stream = io.BytesIO()
+        writer = RDFXMLWriter(stream)
+        node = rdflib.BNode()
+        writer.add((node, _title, rdflib.Literal('Anonymous')))
+        writer.add((rdflib.URIRef('urn:edrn:organs:1'), rdflib.URIRef('urn:edrn:predicates:part'), node))
+        writer.close()
+        self.assertEquals(2, len(rdflib.Graph().parse(data=stream.getvalue(), format='xml')))
+        self.assertIsNone(writer.fingerprint)
+    def testLegacyGenerators(self):
+        '''Make sure generators that only make graphs still get written'''
+        stream = io.BytesIO()
+        writeRDF(_LegacyGenerator(), stream)
+        self.assertEquals(set(_statements), _parse(stream.getvalue()))
+    def testEmpty(self):
+        '''Confirm an empty generator writes an empty, valid document'''
+        stream = io.BytesIO()
+        writeRDF(_EmptyGenerator(), stream)
+        self.assertEquals(set(), _parse(stream.getvalue()))
+    def testAbstract(self):
+        '''Check generators and sinks must say how to make and write statements'''
+        self.assertTrue(IGraphGenerator.providedBy(_EmptyGenerator()))
+        self.assertRaises(TypeError, TripleGenerator)
+        self.assertRaises(TypeError, SerializingSink, io.BytesIO())
+
+
+class AlternativeWritersTest(unittest.TestCase):
+    '''Unit test of the N-Triples, Turtle, and JSON-LD writers'''
+    def _roundTrip(self, writerClass, formatName):
+        stream, rdfXML = io.BytesIO(), io.BytesIO()
+        writeRDF(_Generator(), rdfXML, [writerClass(stream)])
+        self.assertEquals(set(_statements), set(rdflib.Graph().parse(data=stream.getvalue(), format=formatName)))
+        self.assertEquals(set(_statements), _parse(rdfXML.getvalue()))
+    def testNTriples(self):
+        '''See if N-Triples written alongside RDF/XML parse back into the same statements'''
+        self._roundTrip(NTriplesWriter, 'nt')
+    def testTurtle(self):
+        '''See if Turtle written alongside RDF/XML parses back into the same statements'''
+        self._roundTrip(TurtleWriter, 'turtle')
+    def testJSONLD(self):
+        '''See if JSON-LD written alongside RDF/XML parses back into the same statements'''
+        self._roundTrip(JSONLDWriter, 'json-ld')
+    def testEscapes(self):
+        '''Ensure quotes, backslashes, and newlines in literals survive'''
+        statement = (rdflib.URIRef('urn:edrn:organs:3'), _title, rdflib.Literal('A "quoted"\\ title\nover two lines'))
+        for writerClass, formatName in ((NTriplesWriter, 'nt'), (TurtleWriter, 'turtle'), (JSONLDWriter, 'json-ld')):
+            stream = io.BytesIO()
+            writer = writerClass(stream)
+            writer.add(statement)
+            writer.close()
+            self.assertEquals({statement}, set(rdflib.Graph().parse(data=stream.getvalue(), format=formatName)))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
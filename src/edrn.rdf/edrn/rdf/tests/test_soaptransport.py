@@ -0,0 +1,173 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — pooled SOAP transport and lightweight DMCC client tests'''
+
+import unittest, gzip, http.server, pkg_resources, threading, time, urllib.error
+from unittest import mock
+from edrn.rdf import dmcccache, soaptransport
+from edrn.rdf.benchmarks import soapResult
+from edrn.rdf.exceptions import DMCCFault
+from edrn.rdf.soaptransport import PooledTransport, operationOf
+from edrn.rdf.utils import clone_suds_client, streamDMCC
+from suds.cache import NoCache
+from suds.client import Client
+from suds.transport import Request
+
+
+def _testData(name):
+    return pkg_resources.resource_string('edrn.rdf', 'tests/testdata/' + name)
+
+
+_fault = b'''<?xml version="1.0" encoding="utf-8"?><soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+<soap:Body><soap:Fault><faultcode>soap:Server</faultcode><faultstring>Server was unable to process request.</faultstring>
+</soap:Fault></soap:Body></soap:Envelope>'''
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    '''Answers SOAP calls from the test data, like the DMCC would, but over kept-alive connections.'''
+    protocol_version = 'HTTP/1.1'
+    def setup(self):
+        super(_Handler, self).setup()
+        self.server.connections += 1
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.encodings.append(self.headers.get('Accept-Encoding'))
+        self.server.bodies.append(body)
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.server.fault:
+            self.send_response(500)
+            self.send_header('Content-Type', 'text/xml; charset=utf-8')
+            self.send_header('Content-Length', str(len(_fault)))
+            self.end_headers()
+            self.wfile.write(_fault)
+            return
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = gzip.compress(_testData(operationOf(self.headers) + '.xml'))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml; charset=utf-8')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+
+
+class _ServerTestCase(unittest.TestCase):
+    '''Starts a stand-in DMCC on a local port and a fresh connection pool for each test.'''
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.connections, self.server.failures, self.server.encodings = 0, 0, []
+        self.server.fault, self.server.bodies, self.server.delay = False, [], 0
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        patcher = mock.patch.object(soaptransport, '_pool', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = 'http://127.0.0.1:%d/ws_newcompass.asmx' % self.server.server_port
+
+
+class PooledTransportTest(_ServerTestCase):
+    '''Unit test of the pooled SOAP transport'''
+    def setUp(self):
+        super(PooledTransportTest, self).setUp()
+        wsdl = pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/wsdl.xml')
+        self.client = Client(
+            'file://' + wsdl, cache=NoCache(), transport=PooledTransport(),
+            location=self.url
+        )
+    def testKeepAlive(self):
+        '''Check that calls from clones share one kept-alive connection and get gzipped responses'''
+        for i in range(3):
+            result = clone_suds_client(self.client).service.Body_System('0')
+            self.assertTrue(result.startswith('<recordNumber>1</recordNumber>'))
+        self.assertEquals(1, self.server.connections)
+        self.assertEquals(['gzip, deflate'] * 3, self.server.encodings)
+    def testRetries(self):
+        '''See if a busy server gets tried again, but not forever'''
+        with mock.patch.object(soaptransport, 'BACKOFF', 0.0):
+            self.server.failures = 2
+            self.assertTrue(self.client.service.Body_System('0').startswith('<recordNumber>'))
+            self.server.failures = soaptransport.RETRIES + 1
+            with self.assertRaises(Exception):
+                self.client.service.Body_System('0')
+        self.assertEquals(0, self.server.failures)
+    def testUnreachable(self):
+        '''Make sure connection failures come out as they did from urllib'''
+        self.server.shutdown()
+        self.server.server_close()
+        with mock.patch.object(soaptransport, 'BACKOFF', 0.0), mock.patch.object(soaptransport, 'RETRIES', 1):
+            self.assertRaises(urllib.error.URLError, self.client.service.Body_System, '0')
+    def testReadTimeouts(self):
+        '''Ensure SOAP calls that time out reading aren't sent again'''
+        self.server.delay = 0.5
+        with mock.patch.object(soaptransport, 'BACKOFF', 0.0), mock.patch.object(soaptransport, 'DEFAULT_TIMEOUT', (10.0, 0.1)):
+            self.assertRaises(urllib.error.URLError, self.client.service.Body_System, '0')
+        self.assertEquals(1, len(self.server.bodies))
+    def testOtherSchemes(self):
+        '''Confirm schemes other than http and https still go through urllib'''
+        wsdl = pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/wsdl.xml')
+        self.assertEquals(_testData('wsdl.xml'), PooledTransport().open(Request('file://' + wsdl)).read())
+        self.assertEquals(0, self.server.connections)
+    def testTimeouts(self):
+        '''Check operations get their own timeouts'''
+        self.assertEquals('Registered_Person', operationOf({'SOAPAction': '"http://a/b.asmx/Registered_Person"'}))
+        self.assertEquals(None, operationOf({}))
+        with mock.patch.object(soaptransport.urllib3.PoolManager, 'request') as request:
+            request.return_value.status, request.return_value.data, request.return_value.retries = 200, b'<a/>', None
+            request.return_value.headers = {}
+            transport = PooledTransport()
+            transport.send(Request('http://a/b.asmx', b'<a/>'))
+            self.assertEquals(soaptransport.DEFAULT_TIMEOUT[1], request.call_args[1]['timeout'].read_timeout)
+            r = Request('http://a/b.asmx', b'<a/>')
+            r.headers = {'SOAPAction': '"http://a/b.asmx/Registered_Person"'}
+            transport.send(r)
+            self.assertEquals(soaptransport.OPERATION_TIMEOUTS['Registered_Person'], (
+                request.call_args[1]['timeout'].connect_timeout, request.call_args[1]['timeout'].read_timeout
+            ))
+
+
+class StreamDMCCTest(_ServerTestCase):
+    '''Unit test of calling the DMCC without suds'''
+    def testResult(self):
+        '''Check the streamed result is what suds would give, and arrives in more than one piece'''
+        chunks = list(streamDMCC(self.url + '?WSDL', 'Registered_Person', '0<&>'))
+        self.assertTrue(len(chunks) > 1)
+        self.assertEquals(soapResult('Registered_Person.xml'), ''.join(chunks))
+        self.assertTrue(b'<verificationNum>0&lt;&amp;&gt;</verificationNum>' in self.server.bodies[0])
+    def testFault(self):
+        '''See if a SOAP fault is raised as one'''
+        self.server.fault = True
+        with self.assertRaises(DMCCFault):
+            list(streamDMCC(self.url, 'Body_System', '0'))
+    def testSelection(self):
+        '''Make sure callDMCC only streams when asked and for operations it knows'''
+        with mock.patch.object(dmcccache, 'get_suds_client') as client:
+            client.return_value.service.MemberGroup.return_value = 'From suds'
+            client.return_value.service.Body_System.return_value = 'From suds'
+            self.assertEquals('From suds', dmcccache.callDMCC(self.url, 'MemberGroup', '0', raw=True))
+            self.assertEquals('From suds', dmcccache.callDMCC(self.url, 'Body_System', '0'))
+            self.assertEquals(soapResult('Body_System.xml'), dmcccache.callDMCC(self.url, 'Body_System', '0', raw=True))
+            own = mock.Mock()
+            own.service.Disease.return_value = 'From our own client'
+            self.assertEquals('From our own client', dmcccache.callDMCC(self.url, 'Disease', '0', client=own))
+            self.assertEquals(2, client.call_count)  # Not for the call with its own client
+        self.assertEquals(1, len(self.server.bodies))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
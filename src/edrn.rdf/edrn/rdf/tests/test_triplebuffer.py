@@ -0,0 +1,78 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — triple buffer tests'''
+
+import unittest, rdflib
+from edrn.rdf.triplebuffer import TripleBuffer
+
+
+_title = rdflib.URIRef('http://purl.org/dc/terms/title')
+_organ1, _organ2 = rdflib.URIRef('urn:edrn:organs:1'), rdflib.URIRef('urn:edrn:organs:2')
+
+
+class _ListSink(list):
+    def add(self, triple):
+        self.append(triple)
+
+
+class TripleBufferTest(unittest.TestCase):
+    '''Unit test of the interned triple buffer'''
+    def testDeduplication(self):
+        '''See if repeated statements are dropped, even when made of new but equal terms'''
+        buffer = TripleBuffer()
+        self.assertTrue(buffer.add((_organ1, _title, rdflib.Literal('Liver'))))
+        self.assertFalse(buffer.add((rdflib.URIRef(str(_organ1)), _title, rdflib.Literal('Liver'))))
+        self.assertEquals(1, len(buffer))
+        self.assertIn((_organ1, _title, rdflib.Literal('Liver')), buffer)
+        self.assertNotIn((_organ2, _title, rdflib.Literal('Liver')), buffer)
+    def testDistinctLiterals(self):
+        '''Check that literals differing only in language or datatype stay distinct'''
+        buffer = TripleBuffer()
+        buffer.add((_organ1, _title, rdflib.Literal('1')))
+        buffer.add((_organ1, _title, rdflib.Literal('1', lang='en')))
+        buffer.add((_organ1, _title, rdflib.Literal('1', datatype=rdflib.XSD.string)))
+        buffer.add((_organ1, _title, rdflib.URIRef('1')))
+        self.assertEquals(4, len(buffer))
+        self.assertEquals(4, len(buffer.toGraph()))
+    def testInterning(self):
+        '''Ensure equal terms come back as the very same object'''
+        buffer = TripleBuffer()
+        self.assertIs(buffer.term(_organ1), buffer.term(rdflib.URIRef(str(_organ1))))
+    def testManyStatements(self):
+        '''Check that repeats are still caught once the index has sorted and merged its keys'''
+        buffer = TripleBuffer()
+        statements = [
+            (rdflib.URIRef('urn:edrn:organs:%d' % (i % 97)), _title, rdflib.Literal(i)) for i in range(5000)
+        ]
+        for statement in statements:
+            self.assertTrue(buffer.add(statement))
+        for statement in reversed(statements):
+            self.assertFalse(buffer.add(statement))
+            self.assertIn(statement, buffer)
+        self.assertNotIn((_organ1, _title, rdflib.Literal(5000)), buffer)
+        self.assertEquals(5000, len(buffer))
+        self.assertEquals(set(statements), set(buffer.toGraph()))
+    def testGrouping(self):
+        '''Make sure writing to a sink groups statements by subject, keeping their order'''
+        buffer = TripleBuffer()
+        statements = [
+            (_organ1, _title, rdflib.Literal('Liver')),
+            (_organ2, _title, rdflib.Literal('Lung')),
+            (_organ1, rdflib.RDF.type, rdflib.URIRef('urn:edrn:types:organ')),
+        ]
+        for statement in statements:
+            buffer.add(statement)
+        self.assertEquals(statements, list(buffer))
+        written = _ListSink()
+        buffer.writeTo(written)
+        self.assertEquals([statements[0], statements[2], statements[1]], written)
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,207 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — upstream check tests'''
+
+import unittest, contextlib
+from unittest import mock
+from edrn.rdf.exceptions import NoUpdateRequired, UpstreamUnchanged
+from edrn.rdf.rdfgenerator import IRDFGenerator
+from edrn.rdf.rdfupdater import RDFUpdater
+from edrn.rdf.siterdfupdater import _updateConcurrently
+from edrn.rdf.upstream import (
+    UpstreamCheck, generatorModified, getUpstreamDigests, predicateHandlerModified, predicateHandlerMoved,
+    saveUpstreamDigests
+)
+from zope.interface import alsoProvides
+from zope.lifecycleevent import ObjectAddedEvent, ObjectModifiedEvent, ObjectRemovedEvent
+
+
+class _Item(object):
+    '''Something with annotations and a path, standing in for content.'''
+    def __init__(self, path, parent=None):
+        self.path, self.aq_parent, self.annotations = path, parent, {}
+    def getPhysicalPath(self):
+        return tuple(self.path.split('/'))
+
+
+class _Brain(object):
+    def __init__(self, obj):
+        self.obj = obj
+    def getObject(self):
+        return self.obj
+
+
+class _Relation(object):
+    def __init__(self, obj):
+        self.to_object = obj
+
+
+class _GraphGenerator(object):
+    '''A graph generator that fetches whatever payload it's given.'''
+    def __init__(self, generator, payload):
+        self.upstream, self.payload = UpstreamCheck(generator), payload
+    def generateTriples(self, sink):
+        self.upstream.record('Body_System', self.payload)
+        self.upstream.verify()
+
+
+def _generateRDF(graphGenerator):
+    graphGenerator.generateTriples(None)
+    return 'output'
+
+
+class _Base(unittest.TestCase):
+    def setUp(self):
+        for patcher in (
+            mock.patch('edrn.rdf.upstream.IAnnotations', lambda obj, default=None: obj.annotations),
+            mock.patch('edrn.rdf.upstream.aq_parent', lambda obj: obj.aq_parent),
+            mock.patch('edrn.rdf.upstream.aq_inner', lambda obj: obj),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.generator = _Item('/site/generators/body-systems')
+        alsoProvides(self.generator, IRDFGenerator)
+        self.source = _Item('/site/body-systems')
+        self.source.active, self.source.generator, self.source.approvedFile = True, _Relation(self.generator), None
+
+
+class UpstreamCheckTest(_Base):
+    '''Unit test of checks for unchanged upstream data'''
+    def check(self, payload, force=False):
+        upstream = UpstreamCheck(self.generator)
+        upstream.previous, upstream.force = getUpstreamDigests(self.source, self.generator), force
+        upstream.record('Body_System', payload)
+        upstream.verify()
+        return upstream
+    def testUnchanged(self):
+        '''See if the same payload as last time is reported unchanged'''
+        saveUpstreamDigests(self.source, self.generator, self.check('<Identifier>1</Identifier>').digests)
+        self.assertRaises(UpstreamUnchanged, self.check, '<Identifier>1</Identifier>')
+        self.assertRaises(UpstreamUnchanged, self.check, b'<Identifier>1</Identifier>')
+    def testChanged(self):
+        '''Check that a different payload goes ahead'''
+        saveUpstreamDigests(self.source, self.generator, self.check('<Identifier>1</Identifier>').digests)
+        self.check('<Identifier>2</Identifier>')
+    def testForce(self):
+        '''Make sure forcing goes ahead even with the same payload'''
+        saveUpstreamDigests(self.source, self.generator, self.check('<Identifier>1</Identifier>').digests)
+        self.check('<Identifier>1</Identifier>', force=True)
+    def testOtherGenerator(self):
+        '''Ensure digests saved for another generator don't count'''
+        other = _Item('/site/generators/diseases')
+        saveUpstreamDigests(self.source, other, self.check('<Identifier>1</Identifier>').digests)
+        self.check('<Identifier>1</Identifier>')
+    def testNothingFetched(self):
+        '''Confirm a generator that fetched nothing isn't held up'''
+        UpstreamCheck(self.generator).verify()
+
+
+class ConfigurationTest(_Base):
+    '''Unit test of forgetting upstream digests when a generator's configuration changes'''
+    def setUp(self):
+        super(ConfigurationTest, self).setUp()
+        saveUpstreamDigests(self.source, self.generator, {'Body_System': 'abc'})
+        self.handler = _Item('/site/generators/body-systems/title', self.generator)
+    def testUnchanged(self):
+        '''See if the digests hold while nothing changes'''
+        self.assertEquals({'Body_System': 'abc'}, getUpstreamDigests(self.source, self.generator))
+    def testGeneratorModified(self):
+        '''Check that editing the generator forgets the digests'''
+        generatorModified(self.generator, ObjectModifiedEvent(self.generator))
+        self.assertEquals({}, getUpstreamDigests(self.source, self.generator))
+    def testHandlerModified(self):
+        '''Check that editing a predicate handler forgets the digests'''
+        predicateHandlerModified(self.handler, ObjectModifiedEvent(self.handler))
+        self.assertEquals({}, getUpstreamDigests(self.source, self.generator))
+    def testHandlerAdded(self):
+        '''Check that adding a predicate handler forgets the digests'''
+        predicateHandlerMoved(self.handler, ObjectAddedEvent(self.handler, self.generator, 'title'))
+        self.assertEquals({}, getUpstreamDigests(self.source, self.generator))
+    def testHandlerRemoved(self):
+        '''Check that removing a predicate handler forgets the digests'''
+        predicateHandlerMoved(self.handler, ObjectRemovedEvent(self.handler, self.generator, 'title'))
+        self.assertEquals({}, getUpstreamDigests(self.source, self.generator))
+    def testOtherParent(self):
+        '''Ensure handlers going in or out of something other than a generator don't matter'''
+        folder = _Item('/site/folder')
+        predicateHandlerMoved(self.handler, ObjectAddedEvent(self.handler, folder, 'title'))
+        self.assertEquals({}, folder.annotations)
+
+
+class UpdateTest(_Base):
+    '''Unit test of updates skipped or not because of upstream data'''
+    def setUp(self):
+        super(UpdateTest, self).setUp()
+        for patcher in (
+            mock.patch('edrn.rdf.rdfupdater.aq_inner', lambda obj: obj),
+            mock.patch('edrn.rdf.rdfupdater.recordRun', lambda *args: contextlib.nullcontext()),
+            mock.patch('edrn.rdf.rdfupdater.generateRDF', _generateRDF),
+            mock.patch.object(RDFUpdater, 'replaceFile'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.update('<Identifier>1</Identifier>')
+        self.source.approvedFile = _Relation(_Item('/site/body-systems/1'))
+    def update(self, payload, force=False):
+        with mock.patch('edrn.rdf.rdfupdater.IGraphGenerator', lambda generator: _GraphGenerator(generator, payload)):
+            RDFUpdater(self.source).updateRDF(force)
+    def stores(self, payload, force=False):
+        RDFUpdater.replaceFile.reset_mock()
+        self.update(payload, force)
+        return RDFUpdater.replaceFile.called
+    def testUnchanged(self):
+        '''See if an unchanged payload skips building anything'''
+        self.assertRaises(NoUpdateRequired, self.stores, '<Identifier>1</Identifier>')
+        self.assertFalse(RDFUpdater.replaceFile.called)
+    def testChanged(self):
+        '''Check that a changed payload makes new RDF'''
+        self.assertTrue(self.stores('<Identifier>2</Identifier>'))
+        self.assertRaises(NoUpdateRequired, self.update, '<Identifier>2</Identifier>')
+    def testConfigurationEdited(self):
+        '''Make sure editing the generator makes new RDF from the same payload'''
+        generatorModified(self.generator, ObjectModifiedEvent(self.generator))
+        self.assertTrue(self.stores('<Identifier>1</Identifier>'))
+    def testForce(self):
+        '''Confirm forcing makes new RDF from the same payload'''
+        self.assertTrue(self.stores('<Identifier>1</Identifier>', force=True))
+    def testNoCurrentFile(self):
+        '''Ensure a source without a current file gets one even if the payload's unchanged'''
+        self.source.approvedFile = None
+        self.assertTrue(self.stores('<Identifier>1</Identifier>'))
+        self.source.approvedFile = _Relation(None)
+        self.assertTrue(self.stores('<Identifier>1</Identifier>'))
+
+
+class ConcurrentUpdateTest(UpdateTest):
+    '''Unit test of updates skipped or not because of upstream data, when sources are updated concurrently'''
+    def update(self, payload, force=False):
+        db, progress = mock.Mock(), mock.Mock()
+        db.open.return_value.root.return_value = {'Application': mock.Mock(unrestrictedTraverse=lambda path: self.generator)}
+        with mock.patch('edrn.rdf.rdfupdater.IGraphGenerator', lambda generator: _GraphGenerator(generator, payload)):
+            with mock.patch('edrn.rdf.siterdfupdater.IGraphGenerator', lambda generator: _GraphGenerator(generator, payload)):
+                _updateConcurrently(db, [_Brain(self.source)], 2, force, progress)
+        if progress.skipped.called:
+            # Updating concurrently skips on unchanged upstream data straight away; either way, it's skipped
+            ex = progress.skipped.call_args[0][1]
+            raise NoUpdateRequired(self.source) if isinstance(ex, UpstreamUnchanged) else ex
+        if progress.failed.called:
+            raise progress.failed.call_args[0][2]
+    def setUp(self):
+        for patcher in (
+            mock.patch('edrn.rdf.siterdfupdater.IRDFUpdater', RDFUpdater),
+            mock.patch('edrn.rdf.siterdfupdater.recordRun', lambda *args: contextlib.nullcontext()),
+            mock.patch('edrn.rdf.siterdfupdater.generateRDF', _generateRDF),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        super(ConcurrentUpdateTest, self).setUp()
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,62 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — validation cache tests'''
+
+from unittest import mock
+import unittest
+from edrn.rdf.validation import ValidationCache
+
+
+def _validate(value):
+    return (value.lower(), None) if value.isalpha() else (None, 'not alphabetic')
+
+
+class ValidationCacheTest(unittest.TestCase):
+    '''Unit test of the LRU validation cache'''
+    def testCaching(self):
+        '''See if valid and invalid values are both remembered, and only the first check is "first"'''
+        cache = ValidationCache(_validate)
+        self.assertEquals(('abc', None, True), cache.check('ABC'))
+        self.assertEquals(('abc', None, False), cache.check('ABC'))
+        self.assertEquals((None, 'not alphabetic', True), cache.check('A1'))
+        self.assertEquals((None, 'not alphabetic', False), cache.check('A1'))
+        stats = cache.stats()
+        self.assertEquals((2, 2, 2), (stats['entries'], stats['hits'], stats['misses']))
+    def testEviction(self):
+        '''Check that the least recently used value goes first when the cache is full'''
+        cache = ValidationCache(_validate, maxEntries=2)
+        cache.check('a')
+        cache.check('b')
+        cache.check('a')
+        cache.check('c')
+        self.assertFalse(cache.check('a')[2])
+        self.assertTrue(cache.check('b')[2])
+    def testClear(self):
+        '''Ensure clearing forgets everything'''
+        cache = ValidationCache(_validate)
+        cache.check('a')
+        cache.clear()
+        self.assertTrue(cache.check('a')[2])
+        self.assertEquals(1, cache.stats()['misses'])
+    def testFailureSeconds(self):
+        '''Make sure failures are forgotten after ``failureSeconds`` but valid values aren't'''
+        cache = ValidationCache(_validate, failureSeconds=60)
+        with mock.patch('edrn.rdf.validation.time.monotonic', return_value=1000.0):
+            cache.check('a')
+            cache.check('1')
+            self.assertFalse(cache.check('1')[2])
+        with mock.patch('edrn.rdf.validation.time.monotonic', return_value=1061.0):
+            self.assertFalse(cache.check('a')[2])
+            self.assertEquals((None, 'not alphabetic', True), cache.check('1'))
+            self.assertFalse(cache.check('1')[2])
+        self.assertEquals(3, cache.stats()['misses'])
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,94 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''EDRN RDF Service — WSDL cache tests'''
+
+import unittest, os, pkg_resources, shutil, tempfile, threading
+from unittest import mock
+from edrn.rdf.wsdlcache import WSDLCache, DEFAULT_LOCATION
+from suds import wsdl
+
+
+class WSDLCacheTest(unittest.TestCase):
+    '''Unit test of the process-wide WSDL cache'''
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, True)
+        self.wsdl = os.path.join(self.location, 'wsdl.xml')
+        shutil.copy(pkg_resources.resource_filename('edrn.rdf', 'tests/testdata/wsdl.xml'), self.wsdl)
+        self.url = 'file://' + self.wsdl
+    def pickles(self):
+        return [name for name in os.listdir(self.location) if name.endswith('.pickle')]
+    def testOncePerProcess(self):
+        '''Check that threads asking at once for the same WSDL get the same client, parsed once'''
+        cache, clients = WSDLCache(self.location), []
+        with mock.patch('suds.client.Definitions', side_effect=wsdl.Definitions) as parse:
+            threads = [threading.Thread(target=lambda: clients.append(cache.client(self.url))) for i in range(8)]
+            for thread in threads: thread.start()
+            for thread in threads: thread.join()
+            self.assertEquals(1, parse.call_count)
+        self.assertEquals(8, len(clients))
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertEquals(1, len(self.pickles()))
+    def testRestart(self):
+        '''See if a new process gets the parsed WSDL from disk without parsing it'''
+        WSDLCache(self.location).client(self.url)
+        with mock.patch('suds.client.Definitions', side_effect=AssertionError('Parsed again')):
+            client = WSDLCache(self.location).client(self.url)
+        self.assertTrue(hasattr(client.service, 'Body_System'))
+        self.assertTrue(client.wsdl.options is client.options)
+    def testChangedWSDL(self):
+        '''Make sure a changed WSDL is parsed again and replaces the old pickle'''
+        WSDLCache(self.location).client(self.url)
+        before = self.pickles()
+        with open(self.wsdl, 'ab') as f:
+            f.write(b'\n<!-- Changed -->\n')
+        with mock.patch('suds.client.Definitions', side_effect=wsdl.Definitions) as parse:
+            WSDLCache(self.location).client(self.url)
+            self.assertEquals(1, parse.call_count)
+        after = self.pickles()
+        self.assertEquals(1, len(after))
+        self.assertNotEquals(before, after)
+    def testSharedDirectory(self):
+        '''Ensure pickles in a directory others can get into are neither read nor written'''
+        WSDLCache(self.location).client(self.url)
+        os.chmod(self.location, 0o755)
+        with mock.patch('suds.client.Definitions', side_effect=wsdl.Definitions) as parse:
+            WSDLCache(self.location).client(self.url)
+            self.assertEquals(1, parse.call_count)
+        os.chmod(self.location, 0o700)
+        for name in self.pickles(): os.unlink(os.path.join(self.location, name))
+        os.chmod(self.location, 0o755)
+        WSDLCache(self.location).client(self.url)
+        self.assertEquals([], self.pickles())
+    def testSymlinkedDirectory(self):
+        '''Check that a symlink standing in for the pickle directory isn't trusted'''
+        WSDLCache(self.location).client(self.url)
+        link = self.location + '-link'
+        os.symlink(self.location, link)
+        self.addCleanup(os.unlink, link)
+        with mock.patch('suds.client.Definitions', side_effect=wsdl.Definitions) as parse:
+            WSDLCache(link).client(self.url)
+            self.assertEquals(1, parse.call_count)
+    def testInstanceLocation(self):
+        '''See that by default pickles go in a private directory of the Zope instance's var'''
+        location = os.path.join(self.location, 'var', 'edrn.rdf-wsdl')
+        with mock.patch('edrn.rdf.wsdlcache.instanceLocation', return_value=location):
+            WSDLCache(DEFAULT_LOCATION).client(self.url)
+        self.assertEquals(0o700, os.stat(location).st_mode & 0o777)
+        self.assertEquals(1, len([name for name in os.listdir(location) if name.endswith('.pickle')]))
+        with mock.patch('edrn.rdf.wsdlcache.instanceLocation', return_value=None):
+            WSDLCache(DEFAULT_LOCATION).client(self.url)
+    def testMemoryOnly(self):
+        '''Confirm nothing goes to disk without a location'''
+        WSDLCache(None).client(self.url)
+        self.assertEquals([], self.pickles())
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
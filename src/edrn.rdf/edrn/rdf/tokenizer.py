@@ -0,0 +1,47 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''DMCC tokenizer. The DMCC's web service hands back rows of ``<Key>value</Key>`` tokens. This module
+scans each row exactly once with a cursor: no regular expressions get built per key and the row itself
+is never re-sliced; only the values handed back are copied out of it. As with the greedy regex it
+replaced, a value runs to the *last* closing tag for its key in the row, so a value may contain the
+same element nested or repeated.
+
+This is shared by ``edrn.rdf`` and ``edrn.summarizer``.
+'''
+
+import re
+
+# <Key>, saving "Key"; used with ``match(s, pos, endpos)`` so we never need to copy the row
+_startTag = re.compile(r'<([-_A-Za-z0-9]+)>')
+
+# Closing tags are tiny, but there's no need to make them over and over for every row
+_closingTags = {}
+
+
+def parseTokens(s):
+    '''Parse DMCC-style tokenized key-value pairs in the string ``s``, yielding ``(key, value)`` pairs.
+
+    Raises ``TypeError`` if ``s`` isn't a string and ``ValueError`` if it's not well-formed, just as the
+    regex-based parser before it.
+    '''
+    if not isinstance(s, str): raise TypeError('Token parsing works on strings only')
+    cursor, end = 0, len(s)
+    while cursor < end and s[cursor].isspace(): cursor += 1
+    while end > cursor and s[end - 1].isspace(): end -= 1
+    while cursor < end:
+        match = _startTag.match(s, cursor, end)
+        if not match: raise ValueError('Missing start element')
+        key = match.group(1)
+        closingTag = _closingTags.get(key)
+        if closingTag is None:
+            closingTag = _closingTags[key] = '</' + key + '>'
+        cursor = match.end()
+        # Greedy, like the old ``(.*)</Key>``: the last closing tag wins
+        close = s.rfind(closingTag, cursor, end)
+        if close < 0: raise ValueError('Unterminated <%s> element' % key)
+        value = s[cursor:close]
+        cursor = close + len(closingTag)
+        while cursor < end and s[cursor].isspace(): cursor += 1
+        yield key, value
@@ -0,0 +1,139 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Triple buffers. Generators that gather up their statements before handing them to a sink make the same
+``URIRef`` and ``Literal`` over and over—a type URI for every row, a prefix plus identifier for every
+statement about a subject. A ``TripleBuffer`` keeps just one of each term, numbered in the order they
+arrive, and stores statements as three ``array`` columns of those numbers. Repeated statements are
+dropped as they're added.
+
+The repeats are found with an index that's an array too: each statement packs into one 64-bit key, and
+keys go into an open-addressed hash table that's an ``array('Q')`` at most half full. Apart from the
+terms themselves, a buffered statement costs about fifty bytes in all, not a Python object apiece.
+Generators that can give their statements straight to a sink should, though—a ``SerializingSink``
+holds less still—so a buffer's only for those that have to gather first.
+
+Only at the edge do the numbers turn back into terms: ``toGraph`` for an ``rdflib.Graph`` or ``writeTo``
+to feed another sink, such as ``edrn.rdf.sink.RDFXMLWriter``.
+'''
+
+from array import array
+import rdflib
+
+
+# A key is a subject and object number of _termBits apiece and a predicate number of _predicateBits;
+# predicates are numbered on their own, since there are only ever a few of them
+_termBits, _predicateBits = 26, 12
+_initialBits = 10  # The index starts with 2¹⁰ slots and doubles whenever it's half full
+_multiplier, _mask64 = 0x9E3779B97F4A7C15, (1 << 64) - 1  # Fibonacci hashing spreads the packed keys out
+
+
+def _termKey(term):
+    # Literals that compare equal can still differ in datatype or language, so key on those too
+    return type(term), term, getattr(term, 'datatype', None), getattr(term, 'language', None)
+
+
+class TripleBuffer(object):
+    '''A compact, de-duplicating collection of statements; it's a sink, too.'''
+    def __init__(self):
+        self._ids, self._terms, self._predicateIDs = {}, [], {}
+        self._subjects, self._predicates, self._objects = array('q'), array('q'), array('q')
+        self._slotBits, self._table = _initialBits, array('Q', bytes(8 << _initialBits))
+    def intern(self, term):
+        '''Give the number for ``term``, assigning a new one if we've not seen it before.'''
+        key = _termKey(term)
+        identifier = self._ids.get(key)
+        if identifier is None:
+            identifier = len(self._terms)
+            # The last number's kept back so a key, one more than the packed numbers, still fits in 64 bits
+            if (identifier + 1) >> _termBits: raise OverflowError('Too many terms for one triple buffer')
+            self._ids[key] = identifier
+            self._terms.append(term)
+        return identifier
+    def term(self, term):
+        '''Give the buffer's own copy of ``term``, so callers can reuse it rather than make another.'''
+        return self._terms[self.intern(term)]
+    def _predicate(self, p):
+        number = self._predicateIDs.get(p)
+        if number is None:
+            number = len(self._predicateIDs)
+            if number >> _predicateBits: raise OverflowError('Too many predicates for one triple buffer')
+            self._predicateIDs[p] = number
+        return number
+    def _key(self, s, p, o):
+        # One more than the packed numbers, since an empty slot is zero
+        return ((((s << _predicateBits) | self._predicateIDs[p]) << _termBits) | o) + 1
+    def _slot(self, key):
+        # The slot that has ``key``, or the empty one where it'd go
+        table, mask = self._table, (1 << self._slotBits) - 1
+        i = ((key * _multiplier) & _mask64) >> (64 - self._slotBits)
+        while True:
+            found = table[i]
+            if found == key or found == 0: return i
+            i = (i + 1) & mask
+    def _grow(self):
+        old = self._table
+        self._slotBits += 1
+        self._table = array('Q', bytes(8 << self._slotBits))
+        for key in old:
+            if key: self._table[self._slot(key)] = key
+    def add(self, triple):
+        '''Add ``triple``, returning False if we already had it.'''
+        intern = self.intern
+        s, p, o = intern(triple[0]), intern(triple[1]), intern(triple[2])
+        number = self._predicateIDs.get(p)
+        if number is None: number = self._predicate(p)
+        # This is ``_key`` and ``_slot`` over again, but every statement comes through here
+        key = ((((s << _predicateBits) | number) << _termBits) | o) + 1
+        table, bits = self._table, self._slotBits
+        i, mask = ((key * _multiplier) & _mask64) >> (64 - bits), (1 << bits) - 1
+        found = table[i]
+        while found:
+            if found == key: return False
+            i = (i + 1) & mask
+            found = table[i]
+        table[i] = key
+        self._subjects.append(s)
+        self._predicates.append(p)
+        self._objects.append(o)
+        if len(self._subjects) << 1 > len(table): self._grow()
+        return True
+    def __len__(self):
+        return len(self._subjects)
+    def __contains__(self, triple):
+        numbers = []
+        for term in triple:
+            identifier = self._ids.get(_termKey(term))
+            if identifier is None: return False
+            numbers.append(identifier)
+        if numbers[1] not in self._predicateIDs: return False
+        return self._table[self._slot(self._key(*numbers))] != 0
+    def __iter__(self):
+        '''Yield the statements in the order they were first added.'''
+        terms = self._terms
+        for s, p, o in zip(self._subjects, self._predicates, self._objects):
+            yield terms[s], terms[p], terms[o]
+    def writeTo(self, sink):
+        '''Add every statement to ``sink``, with all the statements about each subject together, in order of
+        subject number and each one's statements in the order they were added.
+        '''
+        terms, subjects, predicates, objects = self._terms, self._subjects, self._predicates, self._objects
+        # A counting sort on subject numbers, in arrays: count each subject's statements, work out where
+        # each subject's go, and put them there
+        starts = array('q', bytes(8 * (len(terms) + 1)))
+        for s in subjects:
+            starts[s + 1] += 1
+        for s in range(len(terms)):
+            starts[s + 1] += starts[s]
+        order = array('q', bytes(8 * len(subjects)))
+        for i, s in enumerate(subjects):
+            order[starts[s]] = i
+            starts[s] += 1
+        for i in order:
+            sink.add((terms[subjects[i]], terms[predicates[i]], terms[objects[i]]))
+    def toGraph(self):
+        '''Make an ``rdflib.Graph`` out of the buffered statements.'''
+        graph = rdflib.Graph()
+        self.writeTo(graph)
+        return graph
@@ -187,3 +187,10 @@ def upgrade11to12(setupTool, logger=None):
         predicateURI='http://xmlns.com/foaf/0.1/img'
     )
     publish(handler, plone.api.portal.get_tool('portal_workflow'))
+
+
+def upgrade12to13(setupTool, logger=None):
+    if logger is None:
+        logger = logging.getLogger(PACKAGE_NAME)
+    setupTool.runImportStepFromProfile(DEFAULT_PROFILE, 'plone.app.registry')
+    logger.info('Loaded registry')
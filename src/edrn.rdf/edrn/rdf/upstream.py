@@ -0,0 +1,144 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Upstream checks. Most of the time the DMCC, BioMuta, and LabCAS hand back exactly what they did last
+time. Generators record a digest of every raw payload they fetch and, before parsing any of it, compare
+them to the digests behind the RDF source's current file. If they all match, there's no point in
+building a graph at all. A generator that describes its data as it streams in—BioMuta's—can only
+compare once it's read it all, so it builds the graph anyway but still gets to skip storing it.
+
+Those digests are kept in an annotation on the RDF source, along with which generator made them and a
+stamp of that generator's configuration. Editing the generator, or adding, editing, or removing one of
+its predicate handlers, gives it a new stamp, since a new configuration can make new RDF out of old data.
+
+A generator that syncs incrementally also leaves a ``snapshot`` of what it harvested, saved alongside the
+digests and only when they are, so the next update starts from exactly the data behind the current RDF.
+'''
+
+from .exceptions import UpstreamUnchanged
+from .instrumentation import count
+from .rdfgenerator import IRDFGenerator
+from Acquisition import aq_inner, aq_parent
+from zope.annotation.interfaces import IAnnotations
+import contextlib, hashlib, uuid
+
+UPSTREAM_KEY = 'edrn.rdf.upstream'  # On RDF sources
+CONFIGURATION_KEY = 'edrn.rdf.configuration'  # On RDF generators
+
+
+def _configuration(generator):
+    annotations = IAnnotations(generator, None)
+    return annotations.get(CONFIGURATION_KEY) if annotations is not None else None
+
+
+def _record(source, generator):
+    # The upstream record behind ``source``'s current RDF, if ``generator`` as it's configured now made it
+    annotations = IAnnotations(source, None)
+    record = annotations.get(UPSTREAM_KEY) if annotations is not None else None
+    if not record: return None
+    if record['generator'] != '/'.join(generator.getPhysicalPath()): return None
+    if record['configuration'] != _configuration(generator): return None
+    return record
+
+
+def getUpstreamDigests(source, generator):
+    '''Get the digests of the upstream data behind ``source``'s current RDF, provided it was made by
+    ``generator`` as it's configured now; otherwise, an empty mapping.
+    '''
+    record = _record(source, generator)
+    return record['digests'] if record is not None else {}
+
+
+def getUpstreamSnapshot(source, generator):
+    '''Get the snapshot ``generator`` left of the upstream data behind ``source``'s current RDF, provided
+    it's configured as it was then; otherwise, None.
+    '''
+    record = _record(source, generator)
+    return record.get('snapshot') if record is not None else None
+
+
+def saveUpstreamDigests(source, generator, digests, snapshot=None):
+    '''Remember that ``source``'s current RDF came from upstream data with ``digests`` via ``generator``,
+    and the ``snapshot`` it left of that data, if any.'''
+    record = dict(
+        generator='/'.join(generator.getPhysicalPath()),
+        configuration=_configuration(generator),
+        digests=dict(digests)
+    )
+    if snapshot is not None:
+        record['snapshot'] = snapshot
+    IAnnotations(source)[UPSTREAM_KEY] = record
+
+
+def touchConfiguration(generator):
+    '''Give ``generator`` a new configuration stamp so digests saved under the old one no longer match.'''
+    IAnnotations(generator)[CONFIGURATION_KEY] = uuid.uuid4().hex
+
+
+class HashingReader(object):
+    '''Wraps a binary ``stream`` being read, keeping a SHA-256 digest and a count of the bytes read from it,
+    whether by iterating over its lines or calling ``read``.'''
+    def __init__(self, stream):
+        self.stream, self.hash, self.size = stream, hashlib.sha256(), 0
+    def _update(self, data):
+        self.hash.update(data)
+        self.size += len(data)
+        return data
+    def __iter__(self):
+        for line in self.stream:
+            yield self._update(line)
+    def read(self, size=-1):
+        return self._update(self.stream.read(size))
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
+class UpstreamCheck(object):
+    '''Digests of the raw upstream payloads a generator fetches during one update. Before the generator
+    runs, the updater sets ``previous`` to the digests from the last successful update and ``force`` if
+    the graph should be built regardless. Generators that sync incrementally find the snapshot they left
+    last time in ``previousSnapshot`` and put the one to leave this time in ``snapshot``.
+    '''
+    def __init__(self, generator):
+        self.generator, self.force, self.previous, self.digests = generator, False, {}, {}
+        self.previousSnapshot = self.snapshot = None
+    def record(self, name, payload):
+        '''Record a digest of the raw ``payload`` (str or bytes) fetched as ``name`` and return the payload.'''
+        data = payload.encode('utf-8') if isinstance(payload, str) else payload
+        self.digests[name] = hashlib.sha256(data).hexdigest()
+        count('fetchBytes', len(data))
+        return payload
+    @contextlib.contextmanager
+    def reading(self, name, stream):
+        '''Give a ``HashingReader`` of the binary ``stream`` fetched as ``name`` to read all of, and record its
+        digest—the same one ``record`` would give the whole payload—once that's done.'''
+        reader = HashingReader(stream)
+        yield reader
+        self.digests[name] = reader.hexdigest()
+        count('fetchBytes', reader.size)
+    def verify(self):
+        '''Raise ``UpstreamUnchanged`` if every payload matches the last successful update, unless forced.'''
+        if self.force or not self.digests: return
+        if self.digests == self.previous:
+            raise UpstreamUnchanged(self.generator)
+
+
+def generatorModified(generator, event):
+    '''Subscriber: a generator's configuration changed, so digests made under the old one no longer apply.'''
+    touchConfiguration(generator)
+
+
+def predicateHandlerModified(handler, event):
+    '''Subscriber: a predicate handler changed, so its generator's configuration changed too.'''
+    generator = aq_parent(aq_inner(handler))
+    if generator is not None:
+        touchConfiguration(generator)
+
+
+def predicateHandlerMoved(handler, event):
+    '''Subscriber: a predicate handler was added to or removed from a generator, so that generator's
+    configuration changed.'''
+    for parent in (event.oldParent, event.newParent):
+        if IRDFGenerator.providedBy(parent):
+            touchConfiguration(parent)
@@ -3,9 +3,9 @@
 # RESERVED. U.S. Government Sponsorship acknowledged.
 
 from .predicatehandler import ISimplePredicateHandler
+from .validation import uris
 from Acquisition import aq_inner
-from rfc3986_validator import validate_rfc3986
-import rdflib, logging
+import functools, rdflib, logging
 
 _logger = logging.getLogger(__name__)
 
@@ -15,18 +15,28 @@ class IURIPredicateHandler(ISimplePredicateHandler):
     pass
 
 
+def characterizeURI(predicateURI, title, obj):
+    '''Characterize ``obj`` with ``predicateURI`` and a single URI reference; ``title`` names the handler in
+    warnings.
+    '''
+    valid, error, first = uris.check(obj)
+    if valid is not None:
+        return [(predicateURI, rdflib.URIRef(obj))]
+    else:
+        if first:
+            _logger.warning("Got an invalid URI «%s» for %s which won't be put into RDF", obj, title)
+        return []
+
+
 class URIAsserter(object):
     '''Describes subjects using a predicate with a single complementary references to some other URI.'''
     def __init__(self, context):
         self.context = context
 
-    def characterize(self, obj):
+    def compile(self):
         context = aq_inner(self.context)
+        return functools.partial(characterizeURI, rdflib.URIRef(context.predicateURI), context.title)
 
-        if validate_rfc3986(obj):
-            return [(rdflib.URIRef(context.predicateURI), rdflib.URIRef(obj))]
-        else:
-            _logger.warning(
-                "Got an invalid URI «%s» for %s which won't be put into RDF", obj, self.context.title
-            )
-            return []
+    def characterize(self, obj):
+        context = aq_inner(self.context)
+        return characterizeURI(rdflib.URIRef(context.predicateURI), context.title, obj)
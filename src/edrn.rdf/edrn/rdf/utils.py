@@ -6,8 +6,16 @@
 EDRN RDF Service: utilities.
 '''
 
-from suds.client import Client
-import urllib, re
+from .exceptions import DMCCFault
+from .soaptransport import pooledRequest
+from .tokenizer import parseTokens  # Kept here for existing callers
+from .wsdlcache import WSDL_CACHE
+from suds.client import ServiceSelector
+from suds.options import Options
+from suds.properties import Unskin
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+import copy, urllib.error, urllib.parse, urllib.request, re
 
 # Why, why, why? This is utterly pointless.
 DEFAULT_VERIFICATION_NUM = '0' * 40960
@@ -37,11 +45,23 @@ _rowSep = re.compile(
 )
 
 
+def iterDMCCRows(horribleString):
+    '''Lazily split a DMCC string into rows, yielding each one in turn. Only one row at a time is ever
+    copied out of ``horribleString``, so memory stays bounded by the largest row rather than the whole
+    result.
+    '''
+    start = None  # Anything to the left of the first row separator isn't a row, so skip it
+    for match in _rowSep.finditer(horribleString):
+        if start is not None:
+            yield horribleString[start:match.start()]
+        start = match.end()
+    if start is not None:
+        yield horribleString[start:]
+
+
 def splitDMCCRows(horribleString):
-    '''Split a DMCC string into rows.  Returns an iterable.'''
-    i = _rowSep.split(horribleString)
-    i = i[1:]  # Skip first item, which is the empty string to the left of the first row separator
-    return i
+    '''Split a DMCC string into rows.  Returns a list; prefer ``iterDMCCRows`` for large results.'''
+    return list(iterDMCCRows(horribleString))
 
 
 def validateAccessibleURL(s):
@@ -53,62 +73,136 @@ def validateAccessibleURL(s):
     return parts.scheme in ACCESSIBLE_SCHEMES
 
 
-START_TAG = re.compile(r'^<([-_A-Za-z0-9]+)>')  # <Key>, saving "Key"
-
-
-def parseTokens(s):
-    '''Parse DMCC-style tokenized key-value pairs in the string ``s``.'''
-    if not isinstance(s, str): raise TypeError('Token parsing works on strings only')
-    s = s.strip()
-    while len(s) > 0:
-        match = START_TAG.match(s)
-        if not match: raise ValueError('Missing start element')
-        key = match.group(1)
-        s = s[match.end():]
-        match = re.match(r'^(.*)</' + key + '>', s, re.DOTALL)
-        if not match: raise ValueError('Unterminated <%s> element' % key)
-        value = match.group(1)
-        s = s[match.end():].lstrip()
-        yield key, value
-
-
-# The following comes from z3c.suds, an abandoned project that caches suds client connections
-# in the context of a Zope application; see https://pypi.org/project/z3c.suds/
-# The ZPL 1.0 applies.
-
-try:
-    from zope.component.hooks import getSite
-    _get_default_context = getSite
-except ImportError:
+# The DMCC operations our generators call (see ``setuphandlers``). Each takes just a verificationNum and
+# answers with one string, so we can call them without suds.
+DMCC_OPERATIONS = frozenset((
+    'Body_System',
+    'Committee_Membership',
+    'Committees',
+    'Disease',
+    'EDRN_Protocol',
+    'Protocol_Protocol_Relationship',
+    'Protocol_Site_Specifics',
+    'Protocol_or_Study',
+    'Publication',
+    'Registered_Person',
+    'Site',
+))
+DMCC_NAMESPACE = 'http://www.compass.fhcrc.org/edrn_ws/ws_newcompass.asmx'
+_soapNamespace = 'http://schemas.xmlsoap.org/soap/envelope/'
+_envelope = (
+    '<?xml version="1.0" encoding="UTF-8"?><soap:Envelope xmlns:soap="%s"><soap:Body>'
+    '<%%(operation)s xmlns="%s"><verificationNum>%%(verificationNum)s</verificationNum></%%(operation)s>'
+    '</soap:Body></soap:Envelope>'
+) % (_soapNamespace, DMCC_NAMESPACE)
+_chunkSize = 65536
+
+
+class _DMCCResultReader(object):
+    '''Parses a DMCC SOAP response as it arrives, keeping none of it but the text of the operation's
+    result and of any fault.'''
+    def __init__(self, operation):
+        self.result, self.fault = '%s %sResult' % (DMCC_NAMESPACE, operation), None
+        self.text, self.faultText, self.collecting = [], [], None
+        self.parser = expat.ParserCreate(namespace_separator=' ')
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        self.parser.CharacterDataHandler = self.data
+    def start(self, name, attributes):
+        if name == self.result:
+            self.collecting = self.text
+        elif name == 'faultstring':
+            self.collecting = self.faultText
+        elif name == _soapNamespace + ' Fault':
+            self.fault = ''
+    def end(self, name):
+        if name == 'faultstring':
+            self.fault = ''.join(self.faultText)
+        self.collecting = None
+    def data(self, text):
+        if self.collecting is not None:
+            self.collecting.append(text)
+    def feed(self, data, final=False):
+        '''Parse ``data`` and give the result text it held.'''
+        self.parser.Parse(data, final)
+        text = ''.join(self.text)
+        del self.text[:]
+        return text
+
+
+def streamDMCC(webServiceURL, operation, verificationNum):
+    '''Call the DMCC ``operation`` on the web service whose WSDL is at ``webServiceURL`` by posting its
+    envelope directly, yielding the text of its result in chunks as the response arrives. The response is
+    parsed incrementally and no model of the envelope is ever built, unlike with suds; how much of the
+    result is held in memory is up to the caller. ``callDMCC`` joins the chunks into the whole result,
+    since that's what's cached for the run and digested before any parsing. Only ``DMCC_OPERATIONS`` can
+    be called this way; use suds for anything else.
+    '''
+    parts = urllib.parse.urlsplit(webServiceURL)
+    endpoint = urllib.parse.urlunsplit(parts._replace(query='', fragment=''))  # The DMCC serves at its WSDL's URL
+    body = (_envelope % dict(operation=operation, verificationNum=escape(verificationNum))).encode('utf-8')
+    # Bytes, as suds sends it and as the testscheme stand-in expects
+    headers = {
+        'Content-Type': 'text/xml; charset=utf-8',
+        'SOAPAction': ('"%s/%s"' % (DMCC_NAMESPACE, operation)).encode('utf-8')
+    }
+    if parts.scheme in ('http', 'https'):
+        response = pooledRequest('POST', endpoint, body, headers, preload=False)
+        status, reason, close = response.status, response.reason, response.release_conn
+        chunks = response.stream(_chunkSize)
+    else:
+        try:
+            response = urllib.request.urlopen(urllib.request.Request(endpoint, body, headers))
+        except urllib.error.HTTPError as ex:
+            response = ex  # Its body may have a fault in it
+        status, reason, close = response.getcode(), getattr(response, 'reason', ''), response.close
+        chunks = iter(lambda: response.read(_chunkSize), b'')
+    reader = _DMCCResultReader(operation)
     try:
-        from zope.app.component.hooks import getSite
-        _get_default_context = getSite
-    except ImportError:
-        _get_default_context = lambda: None
-
+        if status != 200:
+            try:
+                for data in chunks:
+                    reader.feed(data)
+                reader.feed(b'', True)
+            except expat.ExpatError:
+                pass  # Not a SOAP response at all
+            if reader.fault is not None:
+                raise DMCCFault(operation, reader.fault)
+            raise urllib.error.HTTPError(endpoint, status, reason, None, None)
+        for data in chunks:
+            text = reader.feed(data)
+            if text: yield text
+        text = reader.feed(b'', True)
+        if text: yield text
+    finally:
+        close()
+    if reader.fault is not None:
+        raise DMCCFault(operation, reader.fault)
+
+
+def get_suds_client(wsdl_uri):
+    '''Give a suds client for the WSDL at ``wsdl_uri`` that's the calling thread's to use. Parsed WSDL is
+    shared by the whole process; see ``edrn.rdf.wsdlcache``.
+    '''
+    return clone_suds_client(WSDL_CACHE.client(wsdl_uri))
 
-def get_suds_client(wsdl_uri, context=None):
-    if context is None:
-        context = _get_default_context()
 
-    if context is None:
-        # no cache
-        client = Client(wsdl_uri)
-    else:
-        jar = getattr(context, '_p_jar', None)
-        oid = getattr(context, '_p_oid', None)
-        if jar is None or oid is None:
-            # object is not persistent or is not yet associated with a
-            # connection
-            cache = context._v_suds_client_cache = {}
-        else:
-            cache = getattr(jar, 'foreign_connections', None)
-            if cache is None:
-                cache = jar.foreign_connections = {}
-
-        cache_key = 'suds_%s' % wsdl_uri
-        client = cache.get(cache_key)
-        if client is None:
-            client = cache[cache_key] = Client(wsdl_uri)
-
-    return client
+def clone_suds_client(client):
+    '''Give a copy of the suds ``client`` that shares its parsed WSDL but has its own options and
+    transport, so both can make calls at once. suds's own ``Client.clone`` deep-copies the options, which
+    recurses without end on Python 3.
+    '''
+    clone = copy.copy(client)
+    clone.options = Options()
+    target, source = Unskin(clone.options), Unskin(client.options)
+    for name in source.modified:
+        if name != 'transport':  # A transport belongs to one set of options
+            target.set(name, source.get(name))
+    transport = client.options.transport
+    clone.options.transport = type(transport)()
+    target, source = Unskin(clone.options.transport.options), Unskin(transport.options)
+    for name in source.modified:
+        target.set(name, source.get(name))
+    clone.service = ServiceSelector(clone, client.wsdl.services)
+    clone.messages = dict(tx=None, rx=None)
+    return clone
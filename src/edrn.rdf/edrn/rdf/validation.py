@@ -0,0 +1,90 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Validation caches. The same site, person, and publication references turn up thousands of times in an
+update, and validating an email address can mean a trip to DNS. So the predicate handlers validate
+through bounded, least-recently-used caches shared across the whole process. Invalid values are cached
+too; ``check`` says whether it's the first time we've seen one so handlers can warn about it just once.
+But an email address can fail for want of a DNS answer or a mail server as well as for its syntax, and
+those can come back, so failed email addresses are only remembered for ``EMAIL_FAILURE_SECONDS``.
+'''
+
+from email_validator import validate_email, EmailNotValidError
+from rfc3986_validator import validate_rfc3986
+import collections, threading, time
+
+MAX_ENTRIES = 65536
+EMAIL_FAILURE_SECONDS = 600
+
+
+class ValidationCache(object):
+    '''Remembers the last ``maxEntries`` results of ``validate``, a function that takes a string and returns
+    its normalized form and None, or None and an error message. Failures are forgotten after
+    ``failureSeconds``, if given. Keeps count of ``hits`` and ``misses`` and the ``seconds`` spent on misses.
+    '''
+    def __init__(self, validate, maxEntries=MAX_ENTRIES, failureSeconds=None):
+        self.validate, self.maxEntries, self.failureSeconds = validate, maxEntries, failureSeconds
+        self._entries, self._lock = collections.OrderedDict(), threading.Lock()
+        self.hits = self.misses = 0
+        self.seconds = 0.0
+    def check(self, value):
+        '''Validate ``value``, giving its normalized form, an error message if it's invalid, and whether
+        this is the first time (as far as the cache remembers) we've checked it.
+        '''
+        with self._lock:
+            entry = self._entries.get(value)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or time.monotonic() < expires:
+                    self._entries.move_to_end(value)
+                    self.hits += 1
+                    return result + (False,)
+                del self._entries[value]
+        start = time.perf_counter()
+        result = self.validate(value)
+        elapsed = time.perf_counter() - start
+        failed = result[1] is not None and self.failureSeconds is not None
+        expires = time.monotonic() + self.failureSeconds if failed else None
+        with self._lock:
+            self.misses += 1
+            self.seconds += elapsed
+            self._entries[value] = result, expires
+            if len(self._entries) > self.maxEntries:
+                self._entries.popitem(last=False)
+        return result + (True,)
+    def stats(self):
+        '''Give the counts, plus an estimate of the seconds saved by the hits.'''
+        with self._lock:
+            saved = self.hits * self.seconds / self.misses if self.misses else 0.0
+            return dict(
+                entries=len(self._entries), hits=self.hits, misses=self.misses, seconds=self.seconds,
+                secondsSaved=saved
+            )
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self.seconds = 0.0
+
+
+def _validateURI(value):
+    if validate_rfc3986(value):
+        return value, None
+    return None, 'not a valid RFC 3986 URI'
+
+
+def _validateEmail(value):
+    try:
+        return validate_email(value).email, None
+    except EmailNotValidError as ex:
+        return None, str(ex)
+
+
+uris = ValidationCache(_validateURI)
+emailAddresses = ValidationCache(_validateEmail, failureSeconds=EMAIL_FAILURE_SECONDS)
+
+
+def validationStats():
+    '''Give the stats of every validation cache by name.'''
+    return dict(uris=uris.stats(), emailAddresses=emailAddresses.stats())
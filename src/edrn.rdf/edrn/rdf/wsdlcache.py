@@ -0,0 +1,174 @@
+# encoding: utf-8
+# Copyright 2026 California Institute of Technology. ALL RIGHTS
+# RESERVED. U.S. Government Sponsorship acknowledged.
+
+'''Process-wide cache of parsed WSDL. Parsing the DMCC's WSDL into suds's model of it takes far longer
+than any call we make with it, so we do it at most once per process rather than once per ZODB connection
+as before. The parsed model's also pickled to disk, keyed by the WSDL's URL and a hash of its content,
+so after a restart we fetch the WSDL document but don't parse it again unless it's changed. Since
+unpickling runs whatever the pickle says, pickles go in a directory only we can use—by default
+``edrn.rdf-wsdl`` in the Zope instance's ``var`` directory—and we neither read nor write them anywhere
+that isn't a real directory owned by us with mode 0700.
+
+``WSDL_CACHE.client(url)`` gives a shared suds client for a WSDL. Nobody should make calls with it
+directly; clone it with ``edrn.rdf.utils.clone_suds_client`` (which ``get_suds_client`` does for you)
+and each thread gets a client of its own that shares the parsed WSDL.
+
+Set ``EDRN_RDF_WSDL_CACHE`` in the environment to choose where pickles go, or to an empty string to
+keep the cache in memory only. Without a Zope instance (and without that variable) nothing goes to disk.
+'''
+
+from .metrics import counter
+from .soaptransport import PooledTransport
+from suds.cache import Cache
+from suds.client import Client
+from suds.store import DocumentStore
+from suds.transport import Request
+import hashlib, logging, os, pickle, stat, tempfile, threading
+
+_logger = logging.getLogger(__name__)
+_loads = counter('edrn_wsdl_loads_total', 'Suds clients wanted, by where their parsed WSDL came from', ('source',))
+
+# Stands for the ``edrn.rdf-wsdl`` directory in the Zope instance's var, which we find only when needed
+DEFAULT_LOCATION = object()
+
+
+def instanceLocation():
+    '''Give the directory for pickles of parsed WSDL in the Zope instance's var directory, or None if
+    there's no instance configured.'''
+    try:
+        from App.config import getConfiguration
+        clienthome = getattr(getConfiguration(), 'clienthome', None)
+    except ImportError:
+        return None
+    return os.path.join(clienthome, 'edrn.rdf-wsdl') if clienthome else None
+
+
+def _private(path, kind=stat.S_ISDIR, mode=0o700):
+    '''Tell if ``path`` is of the given ``kind`` without following symlinks, owned by us, and has the
+    given ``mode``; if ``mode`` is None, it's enough that nobody else can use it.'''
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    permissions = stat.S_IMODE(info.st_mode)
+    return kind(info.st_mode) and info.st_uid == os.getuid() and (
+        permissions & 0o077 == 0 if mode is None else permissions == mode
+    )
+
+
+class _Definitions(Cache):
+    '''A suds object cache that holds just the parsed WSDL for one client as it's made: handing it one
+    already parsed skips parsing, and otherwise it catches the one suds parses.'''
+    def __init__(self, definitions=None):
+        self.definitions = definitions
+    def get(self, id):
+        return self.definitions if id.endswith('-wsdl') else None
+    def put(self, id, object):
+        if id.endswith('-wsdl'):
+            self.definitions = object
+        return object
+    def purge(self, id):
+        pass
+    def clear(self):
+        self.definitions = None
+
+
+class _Prefetched(DocumentStore):
+    '''A suds document store that has the WSDL we've already fetched, so suds needn't fetch it again.'''
+    def __init__(self, url, content):
+        super(_Prefetched, self).__init__()
+        self.url, self.content = url, content
+    def open(self, url):
+        return self.content if url == self.url else super(_Prefetched, self).open(url)
+
+
+class WSDLCache(object):
+    '''Suds clients by WSDL URL, each made at most once per process. Pickles of parsed WSDL go in the
+    directory ``location``, which must be ours alone; if it's None, nothing goes to disk.'''
+    def __init__(self, location=DEFAULT_LOCATION):
+        self.location, self.lock, self.clients, self.locks = location, threading.Lock(), {}, {}
+    def client(self, url):
+        '''Give the shared suds client for the WSDL at ``url``.'''
+        client = self.clients.get(url)
+        if client is not None:
+            _loads.inc(source='memory')
+            return client
+        with self.lock:
+            lock = self.locks.setdefault(url, threading.Lock())
+        with lock:
+            # Another thread may have made it while we waited
+            client = self.clients.get(url)
+            if client is None:
+                client = self.clients[url] = self._make(url)
+            else:
+                _loads.inc(source='memory')
+        return client
+    def clear(self):
+        '''Forget every client made so far, though not the pickles on disk.'''
+        with self.lock:
+            self.clients.clear()
+    def _make(self, url):
+        transport = PooledTransport()
+        stream = transport.open(Request(url))
+        try:
+            content = stream.read()
+        finally:
+            stream.close()
+        path = self._path(url, content)
+        definitions = self._load(path) if path else None
+        _loads.inc(source='parsed' if definitions is None else 'disk')
+        cache = _Definitions(definitions)
+        client = Client(
+            url, cache=cache, cachingpolicy=1, documentStore=_Prefetched(url, content), transport=transport
+        )
+        if definitions is None and path:
+            self._save(path, cache.definitions)
+        return client
+    def _path(self, url, content):
+        location = instanceLocation() if self.location is DEFAULT_LOCATION else self.location
+        if not location: return None
+        return os.path.join(location, '%s-%s.pickle' % (
+            hashlib.sha256(url.encode('utf-8')).hexdigest()[:32], hashlib.sha256(content).hexdigest()[:32]
+        ))
+    def _load(self, path):
+        if not os.path.lexists(path):
+            return None
+        if not _private(os.path.dirname(path)) or not _private(path, stat.S_ISREG, None):
+            _logger.warning('Refusing parsed WSDL in %s; it or its directory is not ours alone', path)
+            return None
+        try:
+            with os.fdopen(os.open(path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0)), 'rb') as stream:
+                return pickle.load(stream)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            _logger.warning('Ignoring unreadable parsed WSDL in %s', path, exc_info=True)
+            return None
+    def _save(self, path, definitions):
+        directory, name = os.path.split(path)
+        try:
+            # Only we should be able to write what we'll later unpickle, so an existing directory
+            # that's someone else's, or that others can get into, won't do
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not _private(directory):
+                _logger.warning('Not saving parsed WSDL in %s; it is not a directory of ours alone', directory)
+                return
+            fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as stream:
+                    pickle.dump(definitions, stream, pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+            # Drop pickles of earlier content from the same URL
+            prefix = name.split('-')[0] + '-'
+            for other in os.listdir(directory):
+                if other.startswith(prefix) and other.endswith('.pickle') and other != name:
+                    os.unlink(os.path.join(directory, other))
+        except Exception:
+            _logger.warning('Cannot save parsed WSDL to %s', path, exc_info=True)
+
+
+WSDL_CACHE = WSDLCache(os.environ.get('EDRN_RDF_WSDL_CACHE', DEFAULT_LOCATION) or None)
@@ -32,15 +32,18 @@ _requirements = [
     'plone.behavior',
     'Products.CMFPlone',
     'rdflib==6.2.0',
+    'requests',
     'setuptools',
     'z3c.relationfield',
     'suds2',
+    'urllib3',
     'zope.app.intid',
     'email-validator~=1.3.1',
     'rfc3986-validator~=0.1.1',
 ]
 _extras = {
     'test': ['plone.app.testing', 'rdfextras'],
+    'brotli': ['Brotli'],
 }
 _classifiers = [
     'Development Status :: 4 - Beta',
@@ -9,7 +9,8 @@ from Acquisition import aq_inner
 from edrn.summarizer import _
 
 from .summarizergenerator import ISummarizerGenerator
-from rdflib.term import URIRef, Literal
+from edrn.rdf.biomuta import describeRows, predicatesFor  # Shared with edrn.rdf
+from rdflib.term import URIRef
 from .utils import validateAccessibleURL
 from .utils import splitBiomutaRows
 from urllib.request import urlopen
@@ -90,29 +91,11 @@ class BiomutaJsonGenerator(object):
         # @yuliujpl: why is this commented out?
         # jsondata = {}
         context = aq_inner(self.context)
+        predicates = predicatesFor(context, _biomarkerPredicates)
         with urlopen(context.webServiceURL) as f:
-            reader = csv.reader(codecs.iterdecode(f, 'utf-8'))
-            inputPredicates = None
-            for row in reader:
-                if inputPredicates is None:
-                    inputPredicates = row
-                else:
-                    geneName = row[0].strip()
-                    subjectURI = URIRef(context.uriPrefix + geneName)
-                    graph.add((subjectURI, rdflib.RDF.type, URIRef(context.typeURI)))
-                    # @yuliujpl: why is this commented out?
-                    # jsondata[subjectURI] = [URIRef(context.typeURI)]
-                    for idx in range(0, len(inputPredicates)):
-                        key = inputPredicates[idx]
-                        predicateURI = URIRef(getattr(context, _biomarkerPredicates[key]))
-                        try:
-                            # @yuliujpl: why is this commented out?
-                            # jsondata[subjectURI].append(Literal(row[idx].strip()))
-                            graph.add((subjectURI, predicateURI, Literal(row[idx].strip())))
-                        except Exception as e:
-                            # No, bad @yuliujpl! You don't hide exceptions! Sheesh.
-                            # print str(e)
-                            raise e
+            # Rows go from the response into the graph as they arrive
+            rows = csv.reader(codecs.iterdecode(f, 'utf-8'))
+            describeRows(rows, predicates, context.uriPrefix, URIRef(context.typeURI), graph)
 
         # C'est tout.
         # @yuliujpl: why is this commented out?
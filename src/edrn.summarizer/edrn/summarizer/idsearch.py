@@ -1,14 +1,17 @@
 # encoding: utf-8
 
 from .utils import csvToDict
+from edrn.rdf.metrics import counter, histogram
 from plone.rest import Service
 from ZODB import FileStorage, DB
 from zope.interface import implementer
 from zope.publisher.interfaces import IPublishTraverse
 import mygene, json
 import pickle, requests, os, urllib, re
-import transaction
+import transaction, time
 
+_lookups = counter('edrn_idsearch_lookups_total', 'Biomarker ID searches, by whether they were cached', ('result',))
+_myGeneSeconds = histogram('edrn_mygene_seconds', 'Time taken by MyGene queries', ('outcome',))
 
 @implementer(IPublishTraverse)
 class IDSearch(Service):
@@ -25,10 +28,13 @@ class IDSearch(Service):
         retries = 0
         while True:
             try:
+                start = time.perf_counter()
                 mg = mygene.MyGeneInfo()
                 results = mg.query(query, fields="symbol,ensembl.gene,pdb,pfam,summary,taxid,type_of_gene,reporter,generif.pubmed,uniprot.Swiss-Prot,uniprot.TrEMBL,entrezgene,refseq.rna,refseq.protein,pathway.kegg,HGNC", species="human", size="1")
+                _myGeneSeconds.observe(time.perf_counter() - start, outcome='ok')
                 break
             except requests.ConnectionError:
+                _myGeneSeconds.observe(time.perf_counter() - start, outcome='connectionError')
                 #connection not working, retry
                 retries += 1
                 if retries < 5:
@@ -284,6 +290,7 @@ class IDSearch(Service):
                 if id in self.biomarkerids:
                     if len(self.biomarkerids[id])> 0:
                         final_ids = self.biomarkerids[id]
+                _lookups.inc(result='hit' if final_ids else 'miss')
                 if not final_ids:
                     mygeneresults = self.queryMyGene(id)
                     tempids = self.packageMyGeneResp(mygeneresults)
@@ -2,35 +2,50 @@
 # Copyright 2012 California Institute of Technology. ALL RIGHTS
 # RESERVED. U.S. Government Sponsorship acknowledged.
 
+from edrn.rdf.interfaces import IJobRunner
+from edrn.rdf.jobs import enqueue, runJob
 from edrn.summarizer.interfaces import ISummarizerUpdater
 from edrn.summarizer.summarizersource import ISummarizerSource
 from plone.protect.interfaces import IDisableCSRFProtection
 from Products.CMFCore.utils import getToolByName
 from Products.Five import BrowserView
-from zope.interface import alsoProvides
-import logging
+from zope.interface import alsoProvides, implementer
+import logging, plone.api
 
 _logger = logging.getLogger('edrn.summarizer')
 
 
-class SiteSummarizerUpdater(BrowserView):
-    '''A "view" that instructs all Summarizer sources to generate fresh summaries.'''
-    def render(self):
-        return self.index()
-    def __call__(self):
-        alsoProvides(self.request, IDisableCSRFProtection)
-        self.request.set('disable_border', True)
-        catalog = getToolByName(self.context, 'portal_catalog')
-        results = catalog(object_provides=ISummarizerSource.__identifier__)
-        self.count, self.failures = 0, []
+@implementer(IJobRunner)
+class SummarizerJobRunner(object):
+    '''Runs jobs that update Summarizer sources.'''
+    def sources(self, site):
+        catalog = getToolByName(site, 'portal_catalog')
+        return catalog(object_provides=ISummarizerSource.__identifier__)
+    def run(self, site, results, force, progress):
         for i in results:
             source = i.getObject()
             updater = ISummarizerUpdater(source)
             try:
                 updater.updateSummary()
-                self.count += 1
+                progress.updated(i)
             except Exception as ex:
-                _logger.exception('Failure updating Summarizer for "%s"', i.getPath())
-                self.failures.append(dict(title=i.Title, url=source.absolute_url(), message=str(ex)))
+                progress.failed(i, source, ex)
+
+
+class SiteSummarizerUpdater(BrowserView):
+    '''A "view" that queues a job to have all Summarizer sources generate fresh summaries. With
+    ``?wait=1``, it runs the job right away and reports how it went.'''
+    def render(self):
+        return self.index()
+    def __call__(self):
+        alsoProvides(self.request, IDisableCSRFProtection)
+        self.request.set('disable_border', True)
+        site = plone.api.portal.get()
+        self.job = enqueue(site, 'summary')
+        self.finished = bool(self.request.form.get('wait'))
+        if self.finished:
+            runJob(site, self.job)
+        self.count, self.failures = self.job.count, list(self.job.failures)
         self.numFailed = len(self.failures)
+        self.request.response.setHeader('X-EDRN-Update-Job', self.job.jobID)
         return self.render()
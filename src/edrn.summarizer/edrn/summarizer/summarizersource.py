@@ -5,6 +5,7 @@
 '''Summarizer Source'''
 
 from Acquisition import aq_inner
+from edrn.rdf.delivery import serveFile
 from edrn.summarizer import _
 from Products.Five import BrowserView
 from plone.app.vocabularies.catalog import CatalogSource
@@ -44,6 +45,15 @@ class ISummarizerSource(model.Schema):
         required=False,
         default=False,
     )
+    updateInterval = schema.Int(
+        title=_('Update Interval'),
+        description=_(
+            'How often, in minutes, to regenerate the summary for this source in the background. Leave blank'
+            ' to update it only with the rest of the site.'
+        ),
+        required=False,
+        min=1,
+    )
 
 
 class View(BrowserView):
@@ -51,6 +61,7 @@ class View(BrowserView):
     def __call__(self):
         context = aq_inner(self.context)
         if context.approvedFile and context.approvedFile.to_object:
-            self.request.response.redirect(context.approvedFile.to_object.absolute_url())
+            current = context.approvedFile.to_object
+            return serveFile(self.request, current, current.file, view='summary')
         else:
             raise ValueError('The Summarizer Source at %s does not have an active Summarizer file to send' % '/'.join(context.getPhysicalPath()))
@@ -5,6 +5,10 @@
 from .exceptions import NoGeneratorError, NoUpdateRequired, SourceNotActive, UnknownGeneratorError
 from .interfaces import IJsonGenerator, IGraphGenerator
 from Acquisition import aq_inner
+from edrn.rdf.compression import compressFiles, setEncodings
+from edrn.rdf.delivery import setContentHashes
+from edrn.rdf.fingerprint import graphFingerprint, getFingerprint, setFingerprint
+from edrn.rdf.instrumentation import count, phase, recordRun
 from plone.dexterity.utils import createContentInContainer
 from plone.namedfile.file import NamedBlobFile
 from rdflib import Graph
@@ -14,7 +18,7 @@ from zope.app.intid.interfaces import IIntIds
 from zope.component import getUtility
 from zope.event import notify
 from zope.lifecycleevent import ObjectModifiedEvent
-import datetime, json, uuid
+import datetime, hashlib, json, uuid
 
 SUMMARIZER_XML_MIMETYPE = 'application/rdf+xml'
 SUMMARIZER_JSON_MIMETYPE = 'application/json'
@@ -34,49 +38,76 @@ class SummarizerUpdater(object):
             raise NoGeneratorError(context)
         generator = context.generator.to_object
         generatorPath = '/'.join(generator.getPhysicalPath())
+        with recordRun(context, (NoUpdateRequired,)):
+            self._updateSummary(context, generator, generatorPath)
+    def _updateSummary(self, context, generator, generatorPath):
         # Adapt the generator to a graph generator, and get the graph in XML form.
-        serialized = mimetype = None
+        serialized = mimetype = fingerprint = None
         if generator.datatype == 'json':
             adapter = IJsonGenerator(generator)
-            serialized = adapter.generateJson()
-            json_result = json.loads(serialized)
+            with phase('build'):
+                serialized = adapter.generateJson()
             mimetype = SUMMARIZER_JSON_MIMETYPE
 
             # Is there an active file?
             if context.approvedFile:
                 # Is it identical to what we just generated?
-                current = json.loads(context.approvedFile.to_object.file.data)
-                if sorted(json_result.items()) == sorted(current.items()):
-                    raise NoUpdateRequired(context)
+                with phase('compare'):
+                    json_result = json.loads(serialized)
+                    current = json.loads(context.approvedFile.to_object.file.data)
+                    if sorted(json_result.items()) == sorted(current.items()):
+                        raise NoUpdateRequired(context)
 
         elif generator.datatype == 'rdf':
             adapter = IGraphGenerator(generator)
-            rdf = adapter.generateGraph()
-            serialized = rdf.serialize()
+            with phase('build'):
+                rdf = adapter.generateGraph()
+            count('triples', len(rdf))
+            with phase('serialize'):
+                serialized = rdf.serialize()
             mimetype = SUMMARIZER_XML_MIMETYPE
 
-            # Is there an active file?
-            if context.approvedFile:
-                # Is it identical to what we just generated?
-                current = Graph().parse(data=context.approvedFile.to_object.file.data)
-                if isomorphic(rdf, current):
-                    raise NoUpdateRequired(context)
+            with phase('compare'):
+                fingerprint = graphFingerprint(rdf)
+
+                # Is there an active file?
+                if context.approvedFile:
+                    # Is it identical to what we just generated?
+                    current = context.approvedFile.to_object
+                    stored = getFingerprint(current)
+                    if fingerprint is not None and stored is not None:
+                        if fingerprint == stored:
+                            raise NoUpdateRequired(context)
+                    elif isomorphic(rdf, Graph().parse(data=current.file.data)):
+                        if fingerprint is not None:
+                            setFingerprint(current, fingerprint)
+                        raise NoUpdateRequired(context)
         else:
             raise UnknownGeneratorError(context)
 
         # Create a new file and set it active
         # TODO: Add validation steps here
-
+        with phase('store'):
+            self._store(context, generator, generatorPath, serialized, mimetype, fingerprint)
+    def _store(self, context, generator, generatorPath, serialized, mimetype, fingerprint):
         timestamp = datetime.datetime.utcnow().isoformat()
         fileID = str(uuid.uuid4())
+        summaryFile = NamedBlobFile(serialized, filename=fileID + '.' + generator.datatype, contentType=mimetype)
         newFile = createContentInContainer(
             context,
             'File',
             id=fileID,
             title='Summary {}'.format(timestamp),
             description='Generated at {} by {}'.format(timestamp, generatorPath),
-            file=NamedBlobFile(serialized, filename=fileID + '.' + generator.datatype, contentType=mimetype)
+            file=summaryFile
         )
+        if fingerprint is not None:
+            setFingerprint(newFile, fingerprint)
+        setContentHashes(newFile, {mimetype: hashlib.sha256(summaryFile.data).hexdigest()})
+        encodings = compressFiles({mimetype: summaryFile})
+        setEncodings(newFile, encodings)
+        count('storedBytes', summaryFile.getSize())
+        count('storedBytes', sum([i.getSize() for variants in encodings.values() for i in variants.values()]))
         newFile.reindexObject()
         intIDs = getUtility(IIntIds)
         newFileID = intIDs.getId(newFile)
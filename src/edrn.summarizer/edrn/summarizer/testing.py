@@ -6,7 +6,10 @@ from plone.app.testing import PloneSandboxLayer, IntegrationTesting, FunctionalT
 from plone.testing import z2
 from suds.transport.http import HttpTransport
 from suds.cache import ObjectCache
-import pkg_resources, urllib, http
+import pkg_resources, urllib, http, os
+
+# Update jobs run when tests ask for them, not in worker threads racing the tests
+os.environ['EDRN_RDF_JOB_THREADS'] = '0'
 
 
 class TestSchemeHandler(urllib.request.BaseHandler):
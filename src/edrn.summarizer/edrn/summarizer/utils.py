@@ -6,6 +6,7 @@
 EDRN Summarizer Service: utilities.
 '''
 
+from edrn.rdf.tokenizer import parseTokens  # Shared with edrn.rdf
 import urllib.parse, re
 
 # @yuliujpl: why is this even here?
@@ -76,24 +77,3 @@ def validateAccessibleURL(s):
     '''
     parts = urllib.parse.urlparse(s)
     return parts.scheme in ACCESSIBLE_SCHEMES
-
-
-# @yuliujpl: and this?
-START_TAG = re.compile(r'^<([-_A-Za-z0-9]+)>') # <Key>, saving "Key"
-
-
-# @yuliujpl: and this?
-def parseTokens(s):
-    '''Parse DMCC-style tokenized key-value pairs in the string ``s``.'''
-    if not isinstance(s, str): raise TypeError('Token parsing works on strings only')
-    s = s.strip()
-    while len(s) > 0:
-        match = START_TAG.match(s)
-        if not match: raise ValueError('Missing start element')
-        key = match.group(1)
-        s = s[match.end():]
-        match = re.match(r'^(.*)</' + key + '>', s, re.DOTALL)
-        if not match: raise ValueError('Unterminated <%s> element' % key)
-        value = match.group(1)
-        s = s[match.end():].lstrip()
-        yield key, value
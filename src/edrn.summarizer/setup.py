@@ -25,6 +25,7 @@ _entryPoints     = {
 }
 _requirements = [
     'collective.autopermission',
+    'edrn.rdf',
     'Pillow',
     'plone.app.dexterity [relations]',
     'z3c.relationfield',